@@ -0,0 +1,141 @@
+"""
+Benchmark: server cold start
+============================
+
+Measures how quickly a freshly started server can answer tools that need
+no embedding model:
+
+- import time of main.py from `python -X importtime`, with the slowest
+  top-level imports and whether torch / sentence_transformers were loaded
+- time from process spawn to a completed MCP initialize, and to the first
+  get_memory_stats and cookbook responses (stdio transport, empty store)
+- with --first-query: latency of the first search_memories call, sent
+  --think-ms after initialize (a user typing), with and without --preload,
+  and for --preload the time until get_memory_stats reports readiness.
+  Needs the embedding model weights.
+
+Usage:
+    python benchmarks/bench_cold_start.py
+    python benchmarks/bench_cold_start.py --runs 5 --top 10
+    python benchmarks/bench_cold_start.py --first-query --think-ms 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+ROOT = Path(__file__).parent.parent
+HEAVY_MODULES = ("torch", "sentence_transformers", "transformers")
+
+
+def import_profile(top: int) -> dict:
+    """Run `python -X importtime -c "import main"` and summarize it."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            modules.append((name.rstrip(), int(cumulative)))
+
+    total = next(us for name, us in modules if name.strip() == "main")
+    # Names are indented one space plus two per nesting level; keep the
+    # modules main imports directly
+    direct = sorted(
+        ((name.strip(), us) for name, us in modules if len(name) - len(name.lstrip()) == 3),
+        key=lambda item: -item[1]
+    )
+    loaded = {name.strip().split(".")[0] for name, _ in modules}
+    return {
+        "import_main_ms": round(total / 1000, 1),
+        "slowest_imports_ms": {name: round(us / 1000, 1) for name, us in direct[:top]},
+        "heavy_modules_loaded": sorted(loaded & set(HEAVY_MODULES)),
+    }
+
+
+async def first_responses() -> dict:
+    """Spawn the stdio server and time initialize and the first tool calls."""
+    with tempfile.TemporaryDirectory() as workdir:
+        params = StdioServerParameters(
+            command=sys.executable, args=[str(ROOT / "main.py"), "--working-dir", workdir], env=dict(os.environ)
+        )
+        start = time.perf_counter()
+        async with stdio_client(params) as (read_stream, write_stream):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                timings = {"initialize_ms": (time.perf_counter() - start) * 1000}
+                await session.call_tool("get_memory_stats", {})
+                timings["get_memory_stats_ms"] = (time.perf_counter() - start) * 1000
+                await session.call_tool("cookbook", {})
+                timings["cookbook_ms"] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+async def first_query(preload: bool, think_ms: float) -> dict:
+    """Time the first search after startup (and readiness with preload)."""
+    with tempfile.TemporaryDirectory() as workdir:
+        args = [str(ROOT / "main.py"), "--working-dir", workdir] + (["--preload"] if preload else [])
+        # Full environment: HF_HOME etc. decide where the model is cached
+        params = StdioServerParameters(command=sys.executable, args=args, env=dict(os.environ))
+        start = time.perf_counter()
+        async with stdio_client(params) as (read_stream, write_stream):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                await asyncio.sleep(think_ms / 1000)
+
+                call_start = time.perf_counter()
+                result = await session.call_tool("search_memories", {"query": "how did we fix the flaky test"})
+                timings = {
+                    "preload": preload,
+                    "first_search_ms": (time.perf_counter() - call_start) * 1000,
+                    "error": result.isError or '"success": false' in result.content[0].text,
+                }
+
+                stats = json.loads((await session.call_tool("get_memory_stats", {})).content[0].text)
+                if preload:
+                    # Model loaded by now; seconds each warm-up step took
+                    timings["preload_seconds"] = stats["readiness"].get("preload_seconds")
+                timings["total_ms"] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3, help="Server starts to take the median over")
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports to list")
+    parser.add_argument("--first-query", action="store_true", help="Also time the first search (loads the model)")
+    parser.add_argument("--think-ms", type=float, default=2000, help="Pause between initialize and first search")
+    args = parser.parse_args()
+
+    print(json.dumps(import_profile(args.top)))
+
+    runs = [asyncio.run(first_responses()) for _ in range(args.runs)]
+    print(json.dumps({
+        "runs": args.runs,
+        **{key: round(statistics.median(run[key] for run in runs), 1) for key in runs[0]},
+    }))
+
+    if args.first_query:
+        for preload in (False, True):
+            timings = asyncio.run(first_query(preload, args.think_ms))
+            print(json.dumps({"think_ms": args.think_ms, **{
+                key: round(value, 1) if isinstance(value, float) else value for key, value in timings.items()
+            }}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: encode micro-batching under concurrency
+==================================================
+
+Measures encode_single throughput with 1, 8 and 64 concurrent callers,
+with and without the EncodeBatcher.
+
+By default the real sentence-transformers model is loaded. Pass
+--simulate to use a stand-in whose forward pass costs a fixed per-call
+overhead plus a per-text cost (useful without model weights).
+
+Usage:
+    python benchmarks/bench_encode_batching.py
+    python benchmarks/bench_encode_batching.py --simulate --callers 1 8 64
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.embeddings import EmbeddingModel
+from src.models import Config
+
+
+class SimulatedTransformer:
+    """Forward pass cost = overhead_ms + per_text_ms * len(texts)."""
+
+    def __init__(self, overhead_ms: float = 8.0, per_text_ms: float = 0.4):
+        self.overhead_ms = overhead_ms
+        self.per_text_ms = per_text_ms
+        self._lock = threading.Lock()  # One forward pass at a time, like a busy CPU
+
+    def encode(self, texts, normalize_embeddings=True, convert_to_numpy=True):
+        with self._lock:
+            time.sleep((self.overhead_ms + self.per_text_ms * len(texts)) / 1000)
+        return np.zeros((len(texts), Config.EMBEDDING_DIM), dtype=np.float32)
+
+
+def make_model(batching: bool, simulate: bool, transformer=None) -> EmbeddingModel:
+    model = EmbeddingModel(batching=batching)
+    if simulate:
+        model.model = SimulatedTransformer()
+        model._embedding_dim = Config.EMBEDDING_DIM
+    elif transformer is not None:
+        model.model = transformer
+        model._embedding_dim = Config.EMBEDDING_DIM
+    else:
+        model._initialize_model()
+    return model
+
+
+def run(model: EmbeddingModel, callers: int, calls_per_caller: int) -> dict:
+    """Each caller thread encodes calls_per_caller distinct texts."""
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(worker_id: int) -> None:
+        for i in range(calls_per_caller):
+            start = time.perf_counter()
+            model.encode_single(f"caller {worker_id} query {i} about sqlite vector search")
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(callers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "texts_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2], 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1], 2),
+        "forward_passes": model.batcher.batches if model.batcher else len(latencies),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--callers", type=int, nargs="+", default=[1, 8, 64])
+    parser.add_argument("--calls", type=int, default=200, help="Total encode calls per run")
+    parser.add_argument("--simulate", action="store_true", help="Use a simulated model")
+    args = parser.parse_args()
+
+    # Load real weights once and share them between both configurations
+    transformer = None
+    if not args.simulate:
+        transformer = make_model(False, False).model
+
+    for callers in args.callers:
+        per_caller = max(1, args.calls // callers)
+        row = {"callers": callers, "calls": per_caller * callers}
+        for batching in (False, True):
+            model = make_model(batching, args.simulate, transformer)
+            row["batched" if batching else "unbatched"] = run(model, callers, per_caller)
+        row["speedup"] = round(row["batched"]["texts_per_s"] / row["unbatched"]["texts_per_s"], 2)
+        print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
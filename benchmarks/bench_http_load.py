@@ -0,0 +1,162 @@
+"""
+Benchmark: concurrent clients over HTTP transports
+==================================================
+
+Drives N simulated MCP clients, each with its own session, against one
+server and reports throughput and latency percentiles per client count.
+
+Without --url a server is started on a free port with a temporary
+working directory (main.py --transport streamable-http|sse). Calls cycle
+through --tools; search_memories and store_memory need the embedding
+model, get_memory_stats and list_recent_memories do not.
+
+Usage:
+    python benchmarks/bench_http_load.py
+    python benchmarks/bench_http_load.py --clients 1 8 32 --calls 50 --transport sse
+    python benchmarks/bench_http_load.py --seed 0 --tools get_memory_stats list_recent_memories
+    python benchmarks/bench_http_load.py --url http://127.0.0.1:8000/mcp --seed 0
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamablehttp_client
+
+MAIN = Path(__file__).parent.parent / "main.py"
+
+TOPICS = ["sqlite wal tuning", "asyncio event loop", "auth token refresh", "vector index recall", "docker build cache"]
+
+
+def tool_arguments(tool: str, client_id: int, call: int) -> dict:
+    topic = TOPICS[(client_id + call) % len(TOPICS)]
+    if tool == "search_memories":
+        return {"query": f"how did we fix {topic}", "limit": 5}
+    if tool == "store_memory":
+        return {"content": f"client {client_id} note {call}: notes on {topic}", "tags": ["load-test"]}
+    if tool == "list_recent_memories":
+        return {"limit": 10}
+    return {}
+
+
+@asynccontextmanager
+async def open_session(url: str, transport: str):
+    client = sse_client(url) if transport == "sse" else streamablehttp_client(url)
+    async with client as streams:
+        async with ClientSession(streams[0], streams[1]) as session:
+            await session.initialize()
+            yield session
+
+
+async def run_client(url: str, transport: str, client_id: int, calls: int, tools: list, latencies: list) -> int:
+    """Run calls sequentially in one session; returns the number of failed calls."""
+    errors = 0
+    async with open_session(url, transport) as session:
+        for call in range(calls):
+            tool = tools[call % len(tools)]
+            start = time.perf_counter()
+            result = await session.call_tool(tool, tool_arguments(tool, client_id, call))
+            latencies.append((time.perf_counter() - start) * 1000)
+            if result.isError or '"success": false' in result.content[0].text:
+                errors += 1
+    return errors
+
+
+async def run(url: str, transport: str, clients: int, calls: int, tools: list) -> dict:
+    latencies = []
+    start = time.perf_counter()
+    errors = await asyncio.gather(*(run_client(url, transport, c, calls, tools, latencies) for c in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "clients": clients,
+        "calls": len(latencies),
+        "calls_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2], 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1], 2),
+        "errors": sum(errors),
+    }
+
+
+async def seed_memories(url: str, transport: str, count: int) -> None:
+    memories = [
+        {"content": f"memory {i}: what we learned about {TOPICS[i % len(TOPICS)]}", "tags": ["seed"]}
+        for i in range(count)
+    ]
+    async with open_session(url, transport) as session:
+        for start in range(0, count, 500):
+            await session.call_tool("store_memories", {"memories": memories[start:start + 500]})
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_port(port: int, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Server exited during startup")
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("Server did not start listening")
+
+
+async def main_async(args) -> None:
+    process = None
+    url = args.url
+    workdir = tempfile.TemporaryDirectory()
+    try:
+        if url is None:
+            port = free_port()
+            process = subprocess.Popen(
+                [sys.executable, str(MAIN), "--working-dir", workdir.name,
+                 "--transport", args.transport, "--port", str(port), "--memory-limit", "1000000"],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            await wait_for_port(port, process)
+            url = f"http://127.0.0.1:{port}/{'sse' if args.transport == 'sse' else 'mcp'}"
+
+        if args.seed:
+            await seed_memories(url, args.transport, args.seed)
+        for clients in args.clients:
+            row = await run(url, args.transport, clients, args.calls, args.tools)
+            print(json.dumps({"transport": args.transport, **row}))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        workdir.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="Server endpoint (default: start a local server)")
+    parser.add_argument("--transport", choices=["streamable-http", "sse"], default="streamable-http")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--calls", type=int, default=50, help="Calls per client")
+    parser.add_argument("--tools", nargs="+", default=["search_memories", "get_memory_stats"])
+    parser.add_argument("--seed", type=int, default=1000, help="Memories stored before the runs")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Benchmark: hybrid (BM25 + vector) vs pure vector search
+=======================================================
+
+Stores N memories, each a short prose note mentioning one unique
+identifier (an error code, a function name or a ticket id), then
+searches for every identifier on its own and reports recall@k (the
+memory containing the identifier is among the top k) and latency
+percentiles for search_memories(mode="vector") and mode="hybrid".
+
+By default the real sentence-transformers model is loaded. Pass
+--simulate to use a hashing encoder that, like a subword model, maps
+every identifier onto a handful of shared fragments, so identifiers are
+barely distinguishable by embedding alone.
+
+Usage:
+    python benchmarks/bench_hybrid_search.py --simulate
+    python benchmarks/bench_hybrid_search.py --sizes 1000 5000 --k 5
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.embeddings import EmbeddingModel
+from src.memory_store import VectorMemoryStore
+from src.models import Config
+
+
+TOPICS = [
+    "connection pool exhausted under load in the api gateway",
+    "retry with exponential backoff when the upstream times out",
+    "cache invalidation after the schema migration",
+    "deadlock between the worker queue and the scheduler",
+    "memory leak in the websocket handler after reconnects",
+    "slow query on the orders table missing an index",
+    "token refresh race in the auth middleware",
+    "flaky integration test depending on wall clock time",
+]
+
+CATEGORIES = ["bug-fix", "debugging", "performance", "security", "code-solution"]
+
+
+class SimulatedEncoder:
+    """
+    Bag-of-words hashing encoder. Plain words get their own dimension;
+    identifiers (tokens with digits, underscores or inner capitals) are
+    reduced to their character class pattern, so ERR_AB12 and ERR_XY34
+    share a vector component.
+    """
+
+    def __init__(self):
+        self.model_name = "simulated-hashing"
+
+    @staticmethod
+    def _token_key(token: str) -> str:
+        is_identifier = (
+            any(ch.isdigit() for ch in token) or "_" in token or token[1:] != token[1:].lower()
+        )
+        if not is_identifier:
+            return token.lower()
+        return "".join("9" if ch.isdigit() else "a" if ch.isalpha() else ch for ch in token)[:4]
+
+    def encode(self, texts, normalize=True):
+        rows = np.zeros((len(texts), Config.EMBEDDING_DIM), dtype=np.float32)
+        for row, text in zip(rows, texts):
+            for token in text.split():
+                digest = hashlib.sha256(self._token_key(token).encode("utf-8")).digest()
+                row[int.from_bytes(digest[:4], "little") % Config.EMBEDDING_DIM] += 1.0
+            row /= max(np.linalg.norm(row), 1e-9)
+        return rows
+
+    def encode_single(self, text, normalize=True):
+        return self.encode([text])[0].tolist()
+
+
+def identifier(rng: random.Random, i: int) -> str:
+    """Unique identifier in one of three styles."""
+    suffix = "".join(rng.choice(string.ascii_uppercase) for _ in range(4))
+    style = i % 3
+    if style == 0:
+        return f"ERR_{suffix}_{i}"
+    if style == 1:
+        return f"handle{suffix.title()}Request{i}"
+    return f"OPS-{10000 + i}"
+
+
+def build_corpus(size: int, seed: int = 0) -> list:
+    """(identifier, content, category) for every memory."""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(size):
+        ident = identifier(rng, i)
+        topic = TOPICS[i % len(TOPICS)]
+        corpus.append((ident, f"Seen {ident} while investigating {topic}", CATEGORIES[i % len(CATEGORIES)]))
+    return corpus
+
+
+def percentiles(latencies: list) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "p50_ms": round(latencies[len(latencies) // 2], 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95)], 2),
+    }
+
+
+def run_mode(store: VectorMemoryStore, model, corpus: list, ids: list, mode: str, k: int) -> dict:
+    """Search every identifier; return recall@k and latency."""
+    hits, latencies = 0, []
+    for (ident, _, _), memory_id in zip(corpus, ids):
+        start = time.perf_counter()
+        results, _ = store.search_memories(ident, limit=k, embedding_model=model, mode=mode)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += any(r.memory.id == memory_id for r in results)
+    return {"recall_at_k": round(hits / len(corpus), 3), **percentiles(latencies)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 5_000])
+    parser.add_argument("--k", type=int, default=5, help="Results per search (recall@k)")
+    parser.add_argument("--queries", type=int, default=200, help="Identifier searches per size")
+    parser.add_argument("--simulate", action="store_true", help="Use a simulated encoder")
+    args = parser.parse_args()
+
+    model = SimulatedEncoder() if args.simulate else EmbeddingModel()
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "memory" / "vector_memory.db"
+            db_path.parent.mkdir(parents=True)
+            store = VectorMemoryStore(db_path, memory_limit=size + 1, access_tracking="deferred")
+
+            corpus = build_corpus(size)
+            ids = []
+            for start in range(0, size, Config.MAX_MEMORIES_PER_BATCH):
+                chunk = corpus[start:start + Config.MAX_MEMORIES_PER_BATCH]
+                result = store.store_memories(
+                    [{"content": content, "category": category} for _, content, category in chunk],
+                    embedding_model=model
+                )
+                ids.extend(item["memory_id"] for item in result["results"])
+
+            sample = random.Random(1).sample(range(size), min(args.queries, size))
+            probe = [corpus[i] for i in sample]
+            probe_ids = [ids[i] for i in sample]
+
+            row = {"memories": size, "queries": len(probe), "k": args.k}
+            for mode in Config.SEARCH_MODES:
+                row[mode] = run_mode(store, model, probe, probe_ids, mode, args.k)
+
+            store.close()
+            print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark: vec0 KNN search vs exact distance scan
+=================================================
+
+Populates a temporary store with random unit vectors and compares the
+latency of VectorMemoryStore._search_knn (MATCH ... AND k = ?) with
+VectorMemoryStore._search_exact (vec_distance_cosine over every row).
+
+Also times a KNN search restricted to a small category (~1% of rows),
+which only scans that category's vec0 partition.
+
+Usage:
+    python benchmarks/bench_knn_search.py
+    python benchmarks/bench_knn_search.py --sizes 10000 100000 1000000 --queries 50
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import sqlite_vec
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.memory_store import VectorMemoryStore
+from src.models import Config
+
+
+SMALL_CATEGORY = "security"
+
+
+def category_for(i: int) -> str:
+    """Every 100th row goes to SMALL_CATEGORY, the rest cycle the others."""
+    if i % 100 == 0:
+        return SMALL_CATEGORY
+    others = [c for c in Config.MEMORY_CATEGORIES if c != SMALL_CATEGORY]
+    return others[i % len(others)]
+
+
+def populate(store: VectorMemoryStore, rows: int, seed: int = 0, batch: int = 10_000) -> None:
+    """Insert `rows` random memories directly (bypasses the embedding model)."""
+    rng = np.random.default_rng(seed)
+    now = "2026-01-01T00:00:00+00:00"
+
+    conn = store._get_connection()
+    try:
+        for start in range(0, rows, batch):
+            count = min(batch, rows - start)
+            vectors = rng.standard_normal((count, Config.EMBEDDING_DIM)).astype(np.float32)
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+            ids = range(start + 1, start + count + 1)
+            conn.executemany(
+                "INSERT INTO memory_metadata (id, content_hash, content, category, tags, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (i, f"h{i}", f"memory {i}", category_for(i), json.dumps([f"t{i % 50}"]), now, now)
+                    for i in ids
+                ]
+            )
+            conn.executemany(
+                "INSERT INTO memory_vectors (rowid, category, embedding) VALUES (?, ?, ?)",
+                [(i, category_for(i), sqlite_vec.serialize_float32(v)) for i, v in zip(ids, vectors)]
+            )
+            conn.commit()
+    finally:
+        conn.close()
+
+
+def time_path(fn, conn, queries, limit: int, **filters) -> dict:
+    """Run fn for every query blob and return latency percentiles in ms."""
+    latencies = []
+    for blob in queries:
+        start = time.perf_counter()
+        fn(conn, blob, limit, 0, **filters)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return {
+        "p50_ms": round(latencies[len(latencies) // 2], 2),
+        "p99_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 2),
+        "mean_ms": round(sum(latencies) / len(latencies), 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = VectorMemoryStore(Path(tmp) / "bench.db", memory_limit=10_000_000)
+            store._ensure_db_initialized_sync()
+
+            start = time.perf_counter()
+            populate(store, size)
+            load_s = time.perf_counter() - start
+
+            queries = []
+            for _ in range(args.queries):
+                q = rng.standard_normal(Config.EMBEDDING_DIM).astype(np.float32)
+                queries.append(sqlite_vec.serialize_float32(q / np.linalg.norm(q)))
+
+            conn = store._get_connection()
+            try:
+                knn = time_path(store._search_knn, conn, queries, args.limit)
+                knn_small = time_path(
+                    store._search_knn, conn, queries, args.limit, category=SMALL_CATEGORY
+                )
+                exact = time_path(store._search_exact, conn, queries, args.limit)
+            finally:
+                conn.close()
+
+            print(json.dumps({
+                "rows": size,
+                "load_s": round(load_s, 1),
+                "knn": knn,
+                "knn_small_category": knn_small,
+                "exact_scan": exact,
+                "speedup_p50": round(exact["p50_ms"] / max(knn["p50_ms"], 1e-6), 1),
+            }))
+
+
+if __name__ == "__main__":
+    main()
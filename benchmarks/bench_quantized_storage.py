@@ -0,0 +1,130 @@
+"""
+Benchmark: float vs int8 vs bit vector storage
+==============================================
+
+Populates one temporary store per storage mode with the same clustered
+unit vectors (memories on a topic sit close together, like real
+embeddings) and reports, per mode:
+
+- recall@k of VectorMemoryStore._search_knn against exact float32
+  nearest neighbours computed with numpy
+- search latency percentiles
+- bytes used by the vec0 index (scanned on every KNN search) and by the
+  float32 rerank table memory_vectors_float (only read for candidates)
+
+Usage:
+    python benchmarks/bench_quantized_storage.py
+    python benchmarks/bench_quantized_storage.py --sizes 100000 1000000 --queries 50
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import sqlite_vec
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.memory_store import VectorMemoryStore
+from src.models import Config
+
+
+def clustered_vectors(rows: int, centres: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Unit vectors scattered around random topic centres."""
+    vectors = centres[rng.integers(0, len(centres), rows)]
+    vectors = vectors + 0.6 * rng.standard_normal(vectors.shape).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def populate(store: VectorMemoryStore, vectors: np.ndarray, batch: int = 10_000) -> None:
+    """Insert memories directly (bypasses the embedding model)."""
+    now = "2026-01-01T00:00:00+00:00"
+    conn = store._get_connection()
+    try:
+        for start in range(0, len(vectors), batch):
+            ids = range(start + 1, min(start + batch, len(vectors)) + 1)
+            conn.executemany(
+                "INSERT INTO memory_metadata (id, content_hash, content, category, tags, created_at, updated_at) "
+                "VALUES (?, ?, ?, 'other', '[]', ?, ?)",
+                [(i, f"h{i}", f"memory {i}", now, now) for i in ids]
+            )
+            store._insert_vectors(conn, [(i, "other", vectors[i - 1]) for i in ids])
+            conn.commit()
+    finally:
+        conn.close()
+
+
+def table_bytes(store: VectorMemoryStore) -> dict:
+    """Bytes per logical table (vec0 shadow tables summed under memory_vectors)."""
+    conn = store._get_connection()
+    try:
+        rows = conn.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name").fetchall()
+    finally:
+        conn.close()
+    sizes = {"memory_vectors": 0, "memory_vectors_float": 0}
+    for name, size in rows:
+        if name.startswith("memory_vectors_float"):
+            sizes["memory_vectors_float"] += size
+        elif name.startswith("memory_vectors"):
+            sizes["memory_vectors"] += size
+    return {name: round(size / 1024 / 1024, 1) for name, size in sizes.items()}
+
+
+def run_mode(storage: str, vectors: np.ndarray, queries: np.ndarray, k: int) -> dict:
+    truth = np.argsort(-(queries @ vectors.T), axis=1)[:, :k] + 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "memory" / "vector_memory.db"
+        db_path.parent.mkdir(parents=True)
+        store = VectorMemoryStore(db_path, memory_limit=len(vectors) + 1, vector_storage=storage)
+        store._ensure_db_initialized_sync()
+        populate(store, vectors)
+
+        conn = store._get_connection()
+        latencies, hits = [], 0
+        try:
+            for query, expected in zip(queries, truth):
+                blob = sqlite_vec.serialize_float32(query)
+                start = time.perf_counter()
+                rows = store._search_knn(conn, blob, k, 0)
+                latencies.append((time.perf_counter() - start) * 1000)
+                hits += len({row[0] for row in rows} & set(expected.tolist()))
+        finally:
+            conn.close()
+
+        result = {
+            f"recall_at_{k}": round(hits / truth.size, 3),
+            "p50_ms": round(sorted(latencies)[len(latencies) // 2], 2),
+            "p95_ms": round(sorted(latencies)[int(len(latencies) * 0.95)], 2),
+            "mb": table_bytes(store),
+        }
+        store.close()
+        return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        rng = np.random.default_rng(0)
+        centres = rng.standard_normal((max(size // 20, 1), Config.EMBEDDING_DIM)).astype(np.float32)
+        vectors = clustered_vectors(size, centres, rng)
+        # Queries are new points on existing topics
+        queries = clustered_vectors(args.queries, centres, rng)
+
+        row = {"memories": size, "k": args.k}
+        for storage in Config.VECTOR_STORAGE_MODES:
+            row[storage] = run_mode(storage, vectors, queries, args.k)
+        print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
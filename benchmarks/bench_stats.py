@@ -0,0 +1,119 @@
+"""
+Benchmark: get_memory_stats latency
+===================================
+
+Populates a temporary store with metadata rows (no vectors, no model) and
+times VectorMemoryStore.get_stats:
+
+- cold: the TTL cache is empty, so the recent-week count and top accessed
+  memories are queried as well
+- cached: repeated calls within Config.STATS_CACHE_TTL, which read only
+  memory_counts
+- scan: the COUNT(*) and GROUP BY category queries the totals replaced
+
+Usage:
+    python benchmarks/bench_stats.py
+    python benchmarks/bench_stats.py --sizes 10000 100000 1000000 --calls 200
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.memory_store import VectorMemoryStore
+from src.models import Config
+
+
+def populate(store: VectorMemoryStore, rows: int, seed: int = 0, batch: int = 50_000) -> None:
+    """Insert `rows` memories spread over the last 60 days with random access counts."""
+    rng = np.random.default_rng(seed)
+    now = time.time()
+    categories = list(Config.MEMORY_CATEGORIES)
+
+    conn = store._get_connection()
+    try:
+        for start in range(0, rows, batch):
+            count = min(batch, rows - start)
+            ages = rng.uniform(0, 60 * 86400, count)
+            accesses = rng.poisson(3, count)
+            conn.executemany(
+                "INSERT INTO memory_metadata (content_hash, content, category, tags, created_at, updated_at, access_count) "
+                "VALUES (?, ?, ?, '[]', ?, ?, ?)",
+                [
+                    (
+                        f"h{start + i}", f"memory {start + i}", categories[(start + i) % len(categories)],
+                        time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(now - age)),
+                        time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(now - age)),
+                        int(access)
+                    )
+                    for i, (age, access) in enumerate(zip(ages, accesses))
+                ]
+            )
+            conn.commit()
+    finally:
+        conn.close()
+
+
+def time_calls(store: VectorMemoryStore, calls: int, cold: bool) -> dict:
+    latencies = []
+    for _ in range(calls):
+        if cold:
+            store._stats_cache = None
+        start = time.perf_counter()
+        store.get_stats()
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return {
+        "p50_ms": round(latencies[len(latencies) // 2], 3),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 3),
+    }
+
+
+def time_scans(store: VectorMemoryStore, calls: int) -> dict:
+    """Full-table count and category breakdown, for comparison."""
+    conn = store._get_connection()
+    try:
+        latencies = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            conn.execute("SELECT COUNT(*) FROM memory_metadata").fetchone()
+            conn.execute("SELECT category, COUNT(*) FROM memory_metadata GROUP BY category").fetchall()
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        conn.close()
+    latencies.sort()
+    return {"p50_ms": round(latencies[len(latencies) // 2], 3)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--calls", type=int, default=100, help="get_stats calls per measurement")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as workdir:
+            db_path = Path(workdir) / "memory" / Config.DB_NAME
+            db_path.parent.mkdir()
+            store = VectorMemoryStore(db_path, memory_limit=size * 2, vector_index="")
+            store._ensure_db_initialized_sync()
+            populate(store, size)
+
+            print(json.dumps({
+                "memories": size,
+                "cold": time_calls(store, max(1, args.calls // 10), cold=True),
+                "cached": time_calls(store, args.calls, cold=False),
+                "scan": time_scans(store, max(1, args.calls // 10)),
+            }))
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
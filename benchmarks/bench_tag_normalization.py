@@ -0,0 +1,207 @@
+"""
+Benchmark: tag normalization preview engine
+===========================================
+
+Populates a temporary store with N canonical tags and N non-canonical
+tag variants (half of them close to a canonical tag) and times
+VectorMemoryStore._compute_tag_normalization, which encodes all
+candidates once and scores them as (N x M) matrix products.
+
+With --legacy the previous per-tag engine (batch_similarity over the
+whole canonical list for every candidate) is timed as well; it re-encodes
+N x M strings, so keep N small for it.
+
+By default the real sentence-transformers model is loaded. Pass
+--simulate to use a deterministic hashing encoder instead.
+
+Usage:
+    python benchmarks/bench_tag_normalization.py --simulate
+    python benchmarks/bench_tag_normalization.py --sizes 1000 10000 --legacy --legacy-max 1000
+"""
+
+import argparse
+import hashlib
+import json
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import sqlite_vec
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.embeddings import EmbeddingModel
+from src.memory_store import VectorMemoryStore, _can_merge_tags, _normalize_tag_for_embedding
+from src.models import Config
+
+
+class SimulatedEncoder:
+    """
+    Hashing encoder: a text's vector is dominated by its first word, so
+    "alpha" and "alpha extra" score ~0.97 while unrelated words score ~0.
+    """
+
+    def __init__(self):
+        self.texts_encoded = 0
+
+    @staticmethod
+    def _seeded(text: str) -> np.ndarray:
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        vec = np.random.default_rng(seed).standard_normal(Config.EMBEDDING_DIM).astype(np.float32)
+        return vec / np.linalg.norm(vec)
+
+    def encode(self, texts, normalize=True):
+        self.texts_encoded += len(texts)
+        rows = []
+        for text in texts:
+            vec = self._seeded(text.split()[0])
+            if " " in text:
+                vec = 0.97 * vec + 0.24 * self._seeded(text)
+            rows.append(vec / np.linalg.norm(vec))
+        return np.stack(rows)
+
+    def batch_similarity(self, query, texts):
+        embeddings = self.encode([query] + texts)
+        return [float(x) for x in embeddings[1:] @ embeddings[0]]
+
+
+class CountingModel:
+    """Wraps EmbeddingModel to count encoded texts."""
+
+    def __init__(self, model: EmbeddingModel):
+        self.model = model
+        self.texts_encoded = 0
+
+    def encode(self, texts, normalize=True):
+        self.texts_encoded += len(texts)
+        return self.model.encode(texts, normalize=normalize)
+
+    def batch_similarity(self, query, texts):
+        self.texts_encoded += len(texts) + 1
+        return self.model.batch_similarity(query, texts)
+
+
+def word(i: int) -> str:
+    """Digit-free tag name (numbers would trigger the number guard)."""
+    letters = []
+    i += 26 * 26
+    while i:
+        i, r = divmod(i, 26)
+        letters.append(string.ascii_lowercase[r])
+    return "".join(reversed(letters))
+
+
+def populate(store: VectorMemoryStore, model, tags: int) -> None:
+    """Insert `tags` canonical tags and `tags` memories carrying variants."""
+    canonical = [word(i) for i in range(tags)]
+    embeddings = model.encode(canonical)
+    now = "2026-01-01T00:00:00+00:00"
+
+    conn = store._get_connection()
+    try:
+        conn.executemany(
+            "INSERT INTO canonical_tags (tag, embedding, frequency, created_at) VALUES (?, ?, 1, ?)",
+            [(tag, sqlite_vec.serialize_float32(emb.tolist()), now) for tag, emb in zip(canonical, embeddings)]
+        )
+        # Even rows: variant of a canonical tag; odd rows: unrelated tag
+        conn.executemany(
+            "INSERT INTO memory_metadata (content_hash, content, category, tags, created_at, updated_at) "
+            "VALUES (?, ?, 'other', ?, ?, ?)",
+            [
+                (f"h{i}", f"memory {i}",
+                 json.dumps([f"{canonical[i]}-extra" if i % 2 == 0 else f"{word(tags + i)}-misc"]),
+                 now, now)
+                for i in range(tags)
+            ]
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def legacy_mapping(store: VectorMemoryStore, model, threshold: float) -> dict:
+    """Previous engine: batch_similarity against the full canonical list per tag."""
+    conn = store._get_connection()
+    try:
+        canonical_list = [row[0] for row in conn.execute("SELECT tag FROM canonical_tags")]
+        rows = conn.execute("SELECT tags FROM memory_metadata").fetchall()
+    finally:
+        conn.close()
+
+    canonical_set = set(canonical_list)
+    mapping = {}
+    for tag in sorted({t for row in rows for t in json.loads(row[0])}):
+        if tag in canonical_set:
+            continue
+        tag_normalized = _normalize_tag_for_embedding(tag)
+        similarities = model.batch_similarity(tag_normalized, canonical_list)
+        best_match, best_sim = None, 0.0
+        for can_tag, sim in zip(canonical_list, similarities):
+            if sim >= threshold and _can_merge_tags(tag_normalized, _normalize_tag_for_embedding(can_tag), sim):
+                if sim > best_sim:
+                    best_match, best_sim = can_tag, sim
+        if best_match and best_match != tag:
+            mapping[tag] = best_match
+    return mapping
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--threshold", type=float, default=0.90)
+    parser.add_argument("--simulate", action="store_true", help="Use a simulated encoder")
+    parser.add_argument("--legacy", action="store_true", help="Also time the per-tag engine")
+    parser.add_argument("--legacy-max", type=int, default=1_000, help="Largest size for --legacy")
+    args = parser.parse_args()
+
+    base_model = None if args.simulate else EmbeddingModel()
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "memory" / "vector_memory.db"
+            db_path.parent.mkdir(parents=True)
+            store = VectorMemoryStore(db_path, memory_limit=size + 1)
+            store._ensure_db_initialized_sync()
+
+            model = SimulatedEncoder() if args.simulate else CountingModel(base_model)
+            populate(store, model, size)
+            model.texts_encoded = 0
+
+            conn = store._get_connection()
+            try:
+                start = time.perf_counter()
+                result = store._compute_tag_normalization(args.threshold, size, model, conn)
+                elapsed = time.perf_counter() - start
+            finally:
+                conn.close()
+
+            row = {
+                "tags": size,
+                "matrix": {
+                    "seconds": round(elapsed, 3),
+                    "texts_encoded": model.texts_encoded,
+                    "mappings": len(result["mapping"]),
+                },
+            }
+
+            if args.legacy and size <= args.legacy_max:
+                model.texts_encoded = 0
+                start = time.perf_counter()
+                mapping = legacy_mapping(store, model, args.threshold)
+                row["legacy"] = {
+                    "seconds": round(time.perf_counter() - start, 3),
+                    "texts_encoded": model.texts_encoded,
+                    "mappings": len(mapping),
+                    "same_mapping": mapping == result["mapping"],
+                }
+                row["speedup"] = round(row["legacy"]["seconds"] / row["matrix"]["seconds"], 1)
+
+            store.close()
+            print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
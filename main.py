@@ -20,10 +20,14 @@ Stores and retrieves coding memories, experiences, and knowledge using
 
 Usage:
     python main.py --working-dir /path/to/project
+    python main.py --working-dir /path/to/project --connect  # share one daemon
+    python main.py --working-dir /path/to/project --transport streamable-http --port 8000
 
 Memory files stored in: {working_dir}/memory/vector_memory.db
 """
 
+import asyncio
+import atexit
 import sys
 import re
 from pathlib import Path
@@ -37,8 +41,10 @@ from mcp.server.fastmcp import FastMCP
 
 # Import our modules
 from src.models import Config
+from src.sessions import SessionLimitedFastMCP, session_call_limit
 from src.security import validate_working_dir, SecurityError
 from src.memory_store import VectorMemoryStore
+from src.executors import ToolExecutors
 
 
 def get_working_dir() -> Path:
@@ -72,6 +78,85 @@ def get_memory_limit() -> int:
     return Config.MAX_TOTAL_MEMORIES
 
 
+def get_vector_storage() -> str | None:
+    """Get vector storage mode from command line arguments (None keeps the database's mode)"""
+    if "--vector-storage" in sys.argv:
+        idx = sys.argv.index("--vector-storage")
+        if idx + 1 < len(sys.argv):
+            storage = sys.argv[idx + 1]
+            if storage in Config.VECTOR_STORAGE_MODES:
+                return storage
+            print(
+                f"Warning: invalid vector-storage value {storage!r}, "
+                f"expected one of {', '.join(Config.VECTOR_STORAGE_MODES)}",
+                file=sys.stderr
+            )
+    return None
+
+
+def get_vector_index() -> str | None:
+    """Get vector index engine from command line arguments (None uses Config.VECTOR_INDEX_ENGINE)"""
+    if "--vector-index" in sys.argv:
+        idx = sys.argv.index("--vector-index")
+        if idx + 1 < len(sys.argv):
+            engine = sys.argv[idx + 1]
+            if engine in ("hnsw", "flat", "mmap", "none"):
+                return "" if engine == "none" else engine
+            print(
+                f"Warning: invalid vector-index value {engine!r}, expected one of hnsw, flat, mmap, none",
+                file=sys.stderr
+            )
+    return None
+
+
+def get_socket_path() -> Path:
+    """Get daemon socket path from command line arguments (default next to the database)"""
+    if "--socket" in sys.argv:
+        idx = sys.argv.index("--socket")
+        if idx + 1 < len(sys.argv):
+            return Path(sys.argv[idx + 1]).expanduser().resolve()
+    return get_working_dir() / Config.DAEMON_SOCKET_NAME
+
+
+def get_transport() -> str:
+    """Get MCP transport from command line arguments (default stdio)"""
+    if "--transport" in sys.argv:
+        idx = sys.argv.index("--transport")
+        if idx + 1 < len(sys.argv):
+            transport = sys.argv[idx + 1]
+            if transport in ("stdio", "sse", "streamable-http"):
+                return transport
+            print(
+                f"Warning: invalid transport value {transport!r}, expected one of stdio, sse, streamable-http",
+                file=sys.stderr
+            )
+    return "stdio"
+
+
+def get_host() -> str:
+    """Get HTTP bind address from command line arguments"""
+    if "--host" in sys.argv:
+        idx = sys.argv.index("--host")
+        if idx + 1 < len(sys.argv):
+            return sys.argv[idx + 1]
+    return Config.HTTP_HOST
+
+
+def get_port() -> int:
+    """Get HTTP port from command line arguments"""
+    if "--port" in sys.argv:
+        idx = sys.argv.index("--port")
+        if idx + 1 < len(sys.argv):
+            try:
+                port = int(sys.argv[idx + 1])
+                if 0 < port < 65536:
+                    return port
+            except ValueError:
+                pass
+            print(f"Warning: invalid port value, using default {Config.HTTP_PORT}", file=sys.stderr)
+    return Config.HTTP_PORT
+
+
 def create_server() -> FastMCP:
     """Create and configure the MCP server"""
 
@@ -80,15 +165,32 @@ def create_server() -> FastMCP:
         memory_dir = get_working_dir()
         memory_limit = get_memory_limit()
         db_path = memory_dir / Config.DB_NAME
-        memory_store = VectorMemoryStore(db_path, memory_limit=memory_limit)
+        memory_store = VectorMemoryStore(
+            db_path, memory_limit=memory_limit, vector_storage=get_vector_storage(),
+            vector_index=get_vector_index()
+        )
+        # Blocking store calls run in dedicated pools, off the event loop
+        executors = ToolExecutors()
+        if "--preload" in sys.argv or Config.PRELOAD:
+            # Database, model and category embeddings load in the background
+            memory_store.preload()
+            print("Preloading database and embedding model in the background", file=sys.stderr)
+        # Close pooled database connections and workers on server exit
+        atexit.register(memory_store.close)
+        atexit.register(executors.shutdown)
         print(f"Memory database path: {db_path} (lazy initialization)", file=sys.stderr)
         print(f"Memory limit: {memory_limit:,} entries", file=sys.stderr)
     except Exception as e:
         print(f"Failed to initialize memory store: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # Create FastMCP server
-    mcp = FastMCP(Config.SERVER_NAME)
+    # Create FastMCP server (HTTP settings are used only by network transports;
+    # every client session shares memory_store and executors, so only shared
+    # servers cap each session below the executor capacity)
+    mcp = SessionLimitedFastMCP(
+        Config.SERVER_NAME, host=get_host(), port=get_port(),
+        max_concurrent_calls=session_call_limit(get_transport(), "--daemon" in sys.argv, executors.max_workers)
+    )
     
     # ===============================================================================
     # MCP TOOLS IMPLEMENTATION
@@ -98,7 +200,9 @@ def create_server() -> FastMCP:
     async def store_memory(
         content: str,
         category: str = "other",
-        tags: list[str] = None
+        tags: list[str] = None,
+        dedupe_threshold: float = None,
+        dedupe_action: str = "merge"
     ) -> dict[str, Any]:
         """
         Store coding memory with vector embedding for semantic search.
@@ -107,6 +211,8 @@ def create_server() -> FastMCP:
             content: Memory content (max 10K chars)
             category: code-solution, bug-fix, architecture, learning, tool-usage, debugging, performance, security, other
             tags: Tags for organization (max 10)
+            dedupe_threshold: Optional similarity (e.g. 0.92) above which the nearest stored memory counts as a duplicate
+            dedupe_action: "merge" (add tags to the existing memory, default) or "reject"
         """
         try:
             if tags is None:
@@ -115,10 +221,12 @@ def create_server() -> FastMCP:
             # Ensure database is initialized (lazy loading)
             await memory_store._ensure_db_initialized_async()
 
-            # Get embedding model asynchronously (lazy loading)
-            model = await memory_store.get_embedding_model_async()
-
-            result = memory_store.store_memory(content, category, tags, embedding_model=model)
+            # The model is loaded by the store only if the memory is new:
+            # duplicates are answered by a hash lookup
+            result = await executors.encode.run(
+                memory_store.store_memory, content, category, tags,
+                dedupe_threshold=dedupe_threshold, dedupe_action=dedupe_action
+            )
             return result
 
         except SecurityError as e:
@@ -133,6 +241,43 @@ def create_server() -> FastMCP:
                 "error": "Storage failed",
                 "message": str(e)
             }
+
+    @mcp.tool()
+    async def store_memories(
+        memories: list[dict[str, Any]],
+        dedupe_threshold: float = None,
+        dedupe_action: str = "merge"
+    ) -> dict[str, Any]:
+        """
+        Store many memories at once (bulk import, one embedding batch and transaction).
+
+        Args:
+            memories: List of {"content": str, "category": str, "tags": list[str]} (max 1000)
+            dedupe_threshold: Optional similarity above which a stored memory or earlier item counts as a duplicate
+            dedupe_action: "merge" (default) or "reject"
+        """
+        try:
+            # Ensure database is initialized (lazy loading)
+            await memory_store._ensure_db_initialized_async()
+
+            # The store loads the model only if something new is stored
+            return await executors.encode.run(
+                memory_store.store_memories, memories,
+                dedupe_threshold=dedupe_threshold, dedupe_action=dedupe_action
+            )
+
+        except SecurityError as e:
+            return {
+                "success": False,
+                "error": "Security validation failed",
+                "message": str(e)
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": "Storage failed",
+                "message": str(e)
+            }
     
     @mcp.tool()
     async def search_memories(
@@ -140,17 +285,24 @@ def create_server() -> FastMCP:
         limit: int = 10,
         category: str = None,
         offset: int = 0,
-        tags: list[str] = None
+        tags: list[str] = None,
+        include_total: bool = False,
+        mode: str = "vector"
     ) -> dict[str, Any]:
         """
         Search memories using semantic similarity (vector search).
 
+        Use mode="hybrid" when the query contains exact identifiers (error codes,
+        function names, ticket ids): keyword (BM25) and vector rankings are fused.
+
         Args:
             query: Search query
             limit: Max results (1-50, default 10)
             category: Optional category filter
             offset: Starting position for results (pagination, 0-based index, default 0)
             tags: Optional list of tags to filter by (matches memories containing ANY of the specified tags)
+            include_total: Count all matches when filtering by tags (slower; otherwise total is null)
+            mode: "vector" (default) or "hybrid" (keyword + vector)
         """
         try:
             # Ensure database is initialized (lazy loading)
@@ -159,7 +311,10 @@ def create_server() -> FastMCP:
             # Get embedding model asynchronously (lazy loading)
             model = await memory_store.get_embedding_model_async()
 
-            search_results, total = memory_store.search_memories(query, limit, category, offset, tags, embedding_model=model)
+            search_results, total = await executors.encode.run(
+                memory_store.search_memories, query, limit, category, offset, tags,
+                embedding_model=model, include_total=include_total, mode=mode
+            )
 
             if not search_results:
                 return {
@@ -179,7 +334,77 @@ def create_server() -> FastMCP:
                 "results": results,
                 "total": total,
                 "count": len(results),
-                "message": f"Show {len(results)} of {total} total memories matching filters"
+                "message": (
+                    f"Show {len(results)} of {total} total memories matching filters"
+                    if total is not None else
+                    f"Show {len(results)} memories matching filters (pass include_total for the total)"
+                )
+            }
+
+        except SecurityError as e:
+            return {
+                "success": False,
+                "error": "Security validation failed",
+                "message": str(e)
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": "Search failed",
+                "message": str(e)
+            }
+
+    @mcp.tool()
+    async def search_memories_batch(
+        queries: list[str],
+        limit: int = 10,
+        category: str = None,
+        tags: list[str] = None,
+        dedupe: bool = False,
+        include_total: bool = False
+    ) -> dict[str, Any]:
+        """
+        Run several semantic searches in one call (multi-probe search).
+
+        Args:
+            queries: Search queries (max 20)
+            limit: Max results per query (1-50, default 10)
+            category: Optional category filter (applies to every query)
+            tags: Optional list of tags to filter by (applies to every query)
+            dedupe: Skip memories already returned for an earlier query (default false)
+            include_total: Count all matches when filtering by tags (slower; otherwise total is null)
+        """
+        try:
+            # Ensure database is initialized (lazy loading)
+            await memory_store._ensure_db_initialized_async()
+
+            # Get embedding model asynchronously (lazy loading)
+            model = await memory_store.get_embedding_model_async()
+
+            per_query, total = await executors.encode.run(
+                memory_store.search_many, queries, limit, category, tags, dedupe,
+                embedding_model=model, include_total=include_total
+            )
+
+            batches = [
+                {
+                    "query": query,
+                    "results": [result.to_dict() for result in search_results],
+                    "count": len(search_results)
+                }
+                for query, search_results in zip(queries, per_query)
+            ]
+
+            return {
+                "success": True,
+                "queries": batches,
+                "total": total,
+                "count": sum(batch["count"] for batch in batches),
+                "message": (
+                    f"Ran {len(batches)} queries over {total} memories matching filters"
+                    if total is not None else
+                    f"Ran {len(batches)} queries"
+                )
             }
 
         except SecurityError as e:
@@ -208,7 +433,7 @@ def create_server() -> FastMCP:
             await memory_store._ensure_db_initialized_async()
 
             limit = min(max(1, limit), Config.MAX_MEMORIES_PER_SEARCH)
-            memories = memory_store.get_recent_memories(limit)
+            memories = await executors.db.run(memory_store.get_recent_memories, limit)
 
             # Convert MemoryEntry objects to dictionaries
             memory_dicts = [memory.to_dict() for memory in memories]
@@ -234,8 +459,13 @@ def create_server() -> FastMCP:
             # Ensure database is initialized (lazy loading)
             await memory_store._ensure_db_initialized_async()
 
-            stats = memory_store.get_stats()
+            stats = await executors.db.run(memory_store.get_stats)
             result = stats.to_dict()
+            result["executors"] = executors.metrics()
+            result["connection_pool"] = memory_store.get_pool_stats()
+            result["embedding_cache"] = memory_store.get_embedding_cache_stats()
+            result["sessions"] = mcp.session_limiter.stats()
+            result["readiness"] = memory_store.get_readiness()
             result["success"] = True
             return result
 
@@ -269,7 +499,7 @@ def create_server() -> FastMCP:
             # Ensure database is initialized (lazy loading)
             await memory_store._ensure_db_initialized_async()
 
-            result = memory_store.clear_old_memories(days_old, max_to_keep)
+            result = await executors.db.run(memory_store.clear_old_memories, days_old, max_to_keep)
             return result
 
         except SecurityError as e:
@@ -285,6 +515,41 @@ def create_server() -> FastMCP:
                 "message": str(e)
             }
 
+    @mcp.tool()
+    async def find_duplicates(
+        threshold: float = 0.95,
+        category: str = None,
+        max_clusters: int = 20
+    ) -> dict[str, Any]:
+        """
+        Find clusters of near-duplicate memories (read-only, no changes made).
+
+        Members of each cluster are ordered by access count; review and remove
+        the others with delete_by_memory_id.
+
+        Args:
+            threshold: Min cosine similarity between duplicates (0-1, default 0.95)
+            category: Optional category to scan
+            max_clusters: Max clusters to return, largest first (default 20, max 100)
+        """
+        try:
+            await memory_store._ensure_db_initialized_async()
+
+            return await executors.db.run(memory_store.find_duplicates, threshold, category, max_clusters)
+
+        except SecurityError as e:
+            return {
+                "success": False,
+                "error": "Security validation failed",
+                "message": str(e)
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": "Duplicate scan failed",
+                "message": str(e)
+            }
+
     @mcp.tool()
     async def get_by_memory_id(memory_id: int) -> dict[str, Any]:
         """
@@ -304,7 +569,7 @@ def create_server() -> FastMCP:
             # Ensure database is initialized (lazy loading)
             await memory_store._ensure_db_initialized_async()
 
-            memory = memory_store.get_memory_by_id(memory_id)
+            memory = await executors.db.run(memory_store.get_memory_by_id, memory_id)
 
             if memory is None:
                 return {
@@ -345,7 +610,7 @@ def create_server() -> FastMCP:
             # Ensure database is initialized (lazy loading)
             await memory_store._ensure_db_initialized_async()
 
-            deleted = memory_store.delete_memory(memory_id)
+            deleted = await executors.db.run(memory_store.delete_memory, memory_id)
 
             if not deleted:
                 return {
@@ -374,7 +639,7 @@ def create_server() -> FastMCP:
             # Ensure database is initialized (lazy loading)
             await memory_store._ensure_db_initialized_async()
 
-            tags = memory_store.get_unique_tags()
+            tags = await executors.db.run(memory_store.get_unique_tags)
 
             return {
                 "success": True,
@@ -402,7 +667,7 @@ def create_server() -> FastMCP:
             # Ensure database is initialized (lazy loading)
             await memory_store._ensure_db_initialized_async()
 
-            tags = memory_store.get_canonical_tags()
+            tags = await executors.db.run(memory_store.get_canonical_tags)
 
             return {
                 "success": True,
@@ -429,7 +694,7 @@ def create_server() -> FastMCP:
         try:
             await memory_store._ensure_db_initialized_async()
 
-            frequencies = memory_store.get_tag_frequencies()
+            frequencies = await executors.db.run(memory_store.get_tag_frequencies)
 
             # Sort by frequency descending
             sorted_freq = sorted(frequencies.items(), key=lambda x: -x[1])
@@ -462,7 +727,7 @@ def create_server() -> FastMCP:
         try:
             await memory_store._ensure_db_initialized_async()
 
-            weights = memory_store.get_tag_weights()
+            weights = await executors.db.run(memory_store.get_tag_weights)
 
             # Sort by weight descending (rarest first)
             sorted_weights = sorted(weights.items(), key=lambda x: -x[1])
@@ -502,7 +767,9 @@ def create_server() -> FastMCP:
         try:
             await memory_store._ensure_db_initialized_async()
             model = await memory_store.get_embedding_model_async()
-            result = memory_store.tag_normalize_preview(threshold, max_changes, embedding_model=model)
+            result = await executors.encode.run(
+                memory_store.tag_normalize_preview, threshold, max_changes, embedding_model=model
+            )
             return result
         except Exception as e:
             return {
@@ -537,7 +804,8 @@ def create_server() -> FastMCP:
         try:
             await memory_store._ensure_db_initialized_async()
             model = await memory_store.get_embedding_model_async()
-            result = memory_store.tag_normalize_apply(
+            result = await executors.encode.run(
+                memory_store.tag_normalize_apply,
                 preview_id, snapshot_id, threshold, max_changes, embedding_model=model
             )
             return result
@@ -565,7 +833,7 @@ def create_server() -> FastMCP:
         """
         try:
             await memory_store._ensure_db_initialized_async()
-            result = memory_store.snapshot_create(description)
+            result = await executors.db.run(memory_store.snapshot_create, description)
             return result
         except Exception as e:
             return {
@@ -589,7 +857,7 @@ def create_server() -> FastMCP:
         """
         try:
             await memory_store._ensure_db_initialized_async()
-            result = memory_store.snapshot_restore(snapshot_id)
+            result = await executors.db.run(memory_store.snapshot_restore, snapshot_id)
             return result
         except Exception as e:
             return {
@@ -1161,10 +1429,35 @@ def main():
         print(f"Embedding model: {Config.EMBEDDING_MODEL}", file=sys.stderr)
         print("=" * 50, file=sys.stderr)
         
+        if "--connect" in sys.argv:
+            # Thin stdio proxy to the shared daemon (started if not running)
+            from src.daemon import DaemonClient, run_proxy
+
+            spawn_command = [sys.executable, str(Path(__file__).resolve())]
+            spawn_command += [arg for arg in sys.argv[1:] if arg != "--connect"] + ["--daemon"]
+            client = DaemonClient(get_socket_path(), spawn_command, memory_dir / Config.DAEMON_LOG_NAME)
+            print(f"Proxying to daemon at {client.socket_path}", file=sys.stderr)
+            asyncio.run(run_proxy(client))
+            return
+
         # Create and run server
         server = create_server()
-        print("Server ready for connections...", file=sys.stderr)
-        server.run()
+        if "--daemon" in sys.argv:
+            from src.daemon import DaemonServer
+
+            asyncio.run(DaemonServer(server, get_socket_path()).serve())
+            return
+
+        transport = get_transport()
+        if transport == "stdio":
+            print("Server ready for connections...", file=sys.stderr)
+        else:
+            path = server.settings.sse_path if transport == "sse" else server.settings.streamable_http_path
+            print(
+                f"Server ready for connections on http://{server.settings.host}:{server.settings.port}{path}",
+                file=sys.stderr
+            )
+        server.run(transport=transport)
         
     except KeyboardInterrupt:
         print("\nServer stopped by user", file=sys.stderr)
@@ -9,7 +9,15 @@ Modules:
     models: Data models and type definitions
     security: Security utilities and validation
     embeddings: Sentence transformer wrapper (requires sentence-transformers)
+    embedding_cache: LRU + on-disk cache of text embeddings
     memory_store: SQLite-vec operations and storage (requires sqlite-vec)
+    connection_pool: Pooled SQLite connections (requires sqlite-vec)
+    tag_index: In-process canonical tag embedding matrix
+    vector_index: In-process vector index engines (HNSW requires hnswlib)
+    access_tracker: Write-behind access-count accumulator
+    executors: Worker pools for running store calls off the event loop
+    daemon: Shared Unix-socket daemon and stdio proxy (Unix only)
+    sessions: Per-client-session concurrency limits for shared servers
 """
 
 __version__ = "1.0.0"
@@ -0,0 +1,150 @@
+"""
+Access Tracker
+==============
+
+Write-behind accumulator for memory access counts. Searches record which
+memories they returned; the increments are aggregated in memory and
+written in one transaction every few seconds, when enough distinct
+memories are pending, or on shutdown. Read-heavy workloads no longer turn
+every search into a write transaction.
+"""
+
+import sys
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Optional
+
+from .models import Config
+
+
+class AccessTracker:
+    """
+    Aggregates access-count increments and flushes them in batches.
+    """
+
+    def __init__(
+        self,
+        flush_fn: Callable[[Dict[int, int], str], None],
+        interval: float = None,
+        max_pending: int = None
+    ):
+        """
+        Initialize tracker.
+
+        Args:
+            flush_fn: Callable(increments, updated_at) writing increments to the database
+            interval: Seconds between background flushes (default from Config)
+            max_pending: Distinct pending memories that wake the flush thread
+                early (default from Config)
+        """
+        self._flush_fn = flush_fn
+        self.interval = interval or Config.ACCESS_FLUSH_INTERVAL
+        self.max_pending = max_pending or Config.ACCESS_FLUSH_THRESHOLD
+
+        self._pending: Counter = Counter()
+        self._inflight: Counter = Counter()  # Batch being written by flush()
+        self._last_access: Optional[str] = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self.flushes = 0
+
+    def _ensure_worker(self) -> None:
+        """Start the periodic flush thread on first use."""
+        if self._worker is None and not self._stop.is_set():
+            self._worker = threading.Thread(
+                target=self._run, name="vector-memory-access-flush", daemon=True
+            )
+            self._worker.start()
+
+    def record(self, accesses: Dict[int, int]) -> None:
+        """
+        Add access increments.
+
+        Never writes in the caller's thread (the caller may hold a pooled
+        connection); a full buffer wakes the flush thread instead.
+
+        Args:
+            accesses: Memory ID → number of accesses
+        """
+        if not accesses:
+            return
+
+        with self._lock:
+            self._pending.update(accesses)
+            self._last_access = datetime.now(timezone.utc).isoformat()
+            self._ensure_worker()
+            if len(self._pending) >= self.max_pending:
+                self._wake.set()
+
+    def pending(self, memory_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        Get unflushed increments for memory IDs.
+
+        Includes the batch a flush is writing until its commit returns, so
+        counts never dip while it is in flight.
+
+        Args:
+            memory_ids: IDs to look up
+
+        Returns:
+            Dict of memory ID → pending increment (IDs without pending accesses omitted)
+        """
+        with self._lock:
+            return {
+                i: self._pending[i] + self._inflight[i]
+                for i in memory_ids if i in self._pending or i in self._inflight
+            }
+
+    def flush(self) -> int:
+        """
+        Write all pending increments in one batch.
+
+        On failure the increments are put back and retried on the next flush.
+
+        Returns:
+            Number of memories written
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                pending = self._inflight = self._pending
+                self._pending = Counter()
+                updated_at = self._last_access
+
+            try:
+                self._flush_fn(dict(pending), updated_at)
+            except Exception:
+                with self._lock:
+                    self._pending.update(pending)
+                    self._inflight = Counter()
+                raise
+
+            with self._lock:
+                self._inflight = Counter()
+            self.flushes += 1
+            return len(pending)
+
+    def _run(self) -> None:
+        """Flush loop; errors are reported and retried next interval."""
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Failed to flush access counts: {e}", file=sys.stderr)
+
+    def close(self) -> None:
+        """Stop the flush thread and write everything still pending."""
+        self._stop.set()
+        self._wake.set()
+        if self._worker is not None:
+            self._worker.join(timeout=self.interval + 1)
+        self.flush()
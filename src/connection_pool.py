@@ -0,0 +1,207 @@
+"""
+Connection Pool
+===============
+
+Bounded, thread-safe pool of SQLite connections with sqlite-vec preloaded.
+Connections are configured once (PRAGMAs, extension loading, prepared
+statement cache) and reused across store operations.
+"""
+
+import queue
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import sqlite_vec
+
+from .models import Config
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    SQLite connection owned by a ConnectionPool.
+
+    close() hands the connection back to its pool instead of closing it,
+    so existing `try: ... finally: conn.close()` call sites work unchanged.
+    """
+
+    _pool: Optional["ConnectionPool"] = None
+
+    def close(self) -> None:
+        """Return connection to its pool (or close it if unpooled)."""
+        if self._pool is not None:
+            self._pool.release(self)
+        else:
+            super().close()
+
+    def close_physical(self) -> None:
+        """Close the underlying SQLite handle."""
+        self._pool = None
+        super().close()
+
+
+class ConnectionPool:
+    """
+    Bounded pool of PooledConnection objects for one database file.
+
+    Connections are created lazily up to max_size. When all are checked
+    out, acquire() blocks until one is released or the timeout expires.
+    Connections are opened with check_same_thread=False so any worker
+    thread may use them, one thread at a time.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_size: int = None,
+        timeout: float = None,
+        pragmas: Dict[str, Any] = None,
+        cached_statements: int = None
+    ):
+        """
+        Initialize connection pool.
+
+        Args:
+            db_path: Path to SQLite database file
+            max_size: Maximum number of open connections (default from Config)
+            timeout: Seconds to wait for a free connection (default from Config)
+            pragmas: PRAGMA name → value applied to every new connection
+            cached_statements: Prepared statements cached per connection
+        """
+        self.db_path = Path(db_path)
+        self.max_size = max_size or Config.DB_POOL_SIZE
+        self.timeout = timeout or Config.DB_POOL_TIMEOUT
+        self.pragmas = dict(Config.DB_PRAGMAS if pragmas is None else pragmas)
+        self.cached_statements = cached_statements or Config.DB_STATEMENT_CACHE_SIZE
+
+        self._idle: "queue.LifoQueue[PooledConnection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self._closed = False
+
+    def _create_connection(self) -> PooledConnection:
+        """Open and configure a new connection."""
+        conn = sqlite3.connect(
+            str(self.db_path),
+            factory=PooledConnection,
+            check_same_thread=False,
+            cached_statements=self.cached_statements
+        )
+        try:
+            conn.enable_load_extension(True)
+            sqlite_vec.load(conn)
+            conn.enable_load_extension(False)
+
+            for name, value in self.pragmas.items():
+                conn.execute(f"PRAGMA {name} = {value}")
+        except Exception:
+            conn.close_physical()
+            raise
+
+        conn._pool = self
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        """
+        Check out a connection.
+
+        Returns:
+            PooledConnection (call close() to return it)
+
+        Raises:
+            RuntimeError: If the pool is closed or no connection frees up in time
+        """
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+
+        if conn is None:
+            with self._lock:
+                can_create = self._created < self.max_size
+                if can_create:
+                    self._created += 1
+
+            if can_create:
+                try:
+                    conn = self._create_connection()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise RuntimeError(
+                        f"Timed out waiting for a database connection "
+                        f"(pool size {self.max_size})"
+                    )
+
+        with self._lock:
+            self._in_use += 1
+        return conn
+
+    def release(self, conn: PooledConnection) -> None:
+        """
+        Return a connection to the pool.
+
+        Any transaction left open by the caller is rolled back so the next
+        user starts from a clean state.
+
+        Args:
+            conn: Connection obtained from acquire()
+        """
+        with self._lock:
+            self._in_use -= 1
+
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+
+        if self._closed:
+            self._discard(conn)
+        else:
+            self._idle.put(conn)
+
+    def _discard(self, conn: PooledConnection) -> None:
+        """Close a connection and free its slot."""
+        with self._lock:
+            self._created -= 1
+        try:
+            conn.close_physical()
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        """Close all idle connections; checked-out ones close on release."""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool usage counters.
+
+        Returns:
+            Dict with max_size, open, in_use and idle connection counts
+        """
+        with self._lock:
+            return {
+                "max_size": self.max_size,
+                "open": self._created,
+                "in_use": self._in_use,
+                "idle": self._idle.qsize(),
+            }
@@ -0,0 +1,321 @@
+"""
+Shared Server Daemon
+====================
+
+Lets several MCP clients share one server process. The daemon owns the
+memory store and embedding model and serves tool calls on a Unix socket;
+the stdio process each client launches becomes a thin proxy that
+forwards tool requests to it, starting the daemon if none is running.
+
+Protocol: newline-delimited JSON over the socket. Requests are
+{"id": int, "method": "list_tools" | "call_tool", "params": {...}} and
+responses {"id": int, "result": ...} or {"id": int, "error": str}.
+Requests on one connection are handled concurrently and may be answered
+out of order.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import signal
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import mcp.types as types
+from mcp.server.lowlevel import Server
+from mcp.server.stdio import stdio_server
+
+from .models import Config
+from .sessions import current_session
+
+try:
+    import fcntl
+except ImportError:  # Windows: no Unix sockets, daemon mode unavailable
+    fcntl = None
+
+# Largest request or response line (search results can be large)
+_LINE_LIMIT = 64 * 1024 * 1024
+
+
+def _check_supported() -> None:
+    if fcntl is None or not hasattr(asyncio, "start_unix_server"):
+        raise RuntimeError("Daemon mode requires Unix domain sockets (not available on this platform)")
+
+
+class DaemonServer:
+    """Serves the tools of a FastMCP server on a Unix socket."""
+
+    def __init__(self, mcp, socket_path: Path, idle_timeout: float = None):
+        """
+        Initialize daemon.
+
+        Args:
+            mcp: FastMCP server whose tools are served
+            socket_path: Unix socket path
+            idle_timeout: Seconds without clients before exiting
+                          (default Config.DAEMON_IDLE_TIMEOUT, 0 = never)
+        """
+        _check_supported()
+        self.mcp = mcp
+        self.socket_path = Path(socket_path)
+        self.idle_timeout = Config.DAEMON_IDLE_TIMEOUT if idle_timeout is None else idle_timeout
+        self._clients = 0
+        self._requests = 0
+        self._idle_handle: Optional[asyncio.TimerHandle] = None
+        self._stopped = asyncio.Event()
+        self._lock_file = None
+
+    def _acquire_lock(self) -> bool:
+        """Take the per-socket lock file (False if another daemon holds it)."""
+        lock_file = open(self.socket_path.with_name(self.socket_path.name + ".lock"), "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Connected clients and requests served."""
+        return {"socket": str(self.socket_path), "clients": self._clients, "requests": self._requests}
+
+    async def serve(self) -> bool:
+        """
+        Listen until stopped (SIGTERM/SIGINT or idle timeout).
+
+        Returns:
+            False if another daemon already serves this socket
+        """
+        if not self._acquire_lock():
+            print(f"Daemon already running on {self.socket_path}", file=sys.stderr)
+            return False
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self._stopped.set)
+
+        try:
+            # Left behind by a daemon that did not shut down cleanly
+            self.socket_path.unlink(missing_ok=True)
+            # Bound under a restrictive umask so other users can never
+            # connect, even before the chmod (kept as a second safeguard)
+            old_umask = os.umask(0o177)
+            try:
+                server = await asyncio.start_unix_server(
+                    self._handle_client, path=str(self.socket_path), limit=_LINE_LIMIT
+                )
+            finally:
+                os.umask(old_umask)
+            os.chmod(self.socket_path, 0o600)
+            print(f"Daemon listening on {self.socket_path}", file=sys.stderr)
+            self._schedule_idle_stop()
+            async with server:
+                await self._stopped.wait()
+        finally:
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                loop.remove_signal_handler(sig)
+            self.socket_path.unlink(missing_ok=True)
+            self._lock_file.close()
+        return True
+
+    def stop(self) -> None:
+        """Stop serving (call from the daemon's event loop)."""
+        self._stopped.set()
+
+    def _schedule_idle_stop(self) -> None:
+        if self.idle_timeout and self._clients == 0:
+            self._idle_handle = asyncio.get_running_loop().call_later(self.idle_timeout, self.stop)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._clients += 1
+        # Per-session limits apply per connection
+        current_session.set(writer)
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        async def respond(request: Dict[str, Any]) -> None:
+            response = await self._dispatch(request)
+            async with write_lock:
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    continue
+                task = asyncio.create_task(respond(request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            writer.close()
+            self._clients -= 1
+            self._schedule_idle_stop()
+
+    async def _dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one request and build its response."""
+        request_id = request.get("id")
+        method = request.get("method")
+        params = request.get("params") or {}
+        self._requests += 1
+        try:
+            if method == "list_tools":
+                tools = await self.mcp.list_tools()
+                result = [tool.model_dump(mode="json", by_alias=True, exclude_none=True) for tool in tools]
+            elif method == "call_tool":
+                # Same handler as the stdio transport: input validation and
+                # result conversion are identical
+                handler = self.mcp._mcp_server.request_handlers[types.CallToolRequest]
+                response = await handler(types.CallToolRequest(
+                    params=types.CallToolRequestParams(name=params["name"], arguments=params.get("arguments") or {})
+                ))
+                result = response.root.model_dump(mode="json", by_alias=True, exclude_none=True)
+            else:
+                return {"id": request_id, "error": f"Unknown method: {method}"}
+            return {"id": request_id, "result": result}
+        except Exception as e:
+            return {"id": request_id, "error": str(e)}
+
+
+class DaemonClient:
+    """Client for a DaemonServer; concurrent requests share one connection."""
+
+    def __init__(self, socket_path: Path, spawn_command: List[str] = None, log_path: Path = None):
+        """
+        Initialize client (connects on first request).
+
+        Args:
+            socket_path: Unix socket path
+            spawn_command: Command starting the daemon when none is listening
+            log_path: File receiving the spawned daemon's stderr
+        """
+        _check_supported()
+        self.socket_path = Path(socket_path)
+        self.spawn_command = spawn_command
+        self.log_path = log_path
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._connect_lock = asyncio.Lock()
+
+    async def _open(self) -> bool:
+        try:
+            reader, self._writer = await asyncio.open_unix_connection(str(self.socket_path), limit=_LINE_LIMIT)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return False
+        self._reader_task = asyncio.create_task(self._read_responses(reader))
+        return True
+
+    def _spawn(self) -> None:
+        log = open(self.log_path, "ab") if self.log_path else subprocess.DEVNULL
+        try:
+            subprocess.Popen(
+                self.spawn_command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                stderr=log, start_new_session=True
+            )
+        finally:
+            if self.log_path:
+                log.close()
+
+    async def connect(self) -> None:
+        """Connect, starting the daemon first if needed."""
+        async with self._connect_lock:
+            if self._writer is not None:
+                return
+            if await self._open():
+                return
+            if not self.spawn_command:
+                raise ConnectionError(f"No daemon listening on {self.socket_path}")
+
+            self._spawn()
+            deadline = asyncio.get_running_loop().time() + Config.DAEMON_CONNECT_TIMEOUT
+            while not await self._open():
+                if asyncio.get_running_loop().time() > deadline:
+                    raise ConnectionError(f"Daemon did not start listening on {self.socket_path}")
+                await asyncio.sleep(0.1)
+
+    async def _read_responses(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while line := await reader.readline():
+                response = json.loads(line)
+                future = self._pending.pop(response.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if "error" in response:
+                    future.set_exception(RuntimeError(response["error"]))
+                else:
+                    future.set_result(response.get("result"))
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            # Daemon gone: fail in-flight requests, reconnect on the next one
+            self._writer = None
+            pending, self._pending = self._pending, {}
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Daemon connection closed"))
+
+    async def request(self, method: str, params: Dict[str, Any] = None) -> Any:
+        """
+        Send a request and wait for its result.
+
+        Raises:
+            RuntimeError: The daemon reported an error
+            ConnectionError: The daemon is unreachable or went away
+        """
+        await self.connect()
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        writer = self._writer
+        writer.write(json.dumps({"id": request_id, "method": method, "params": params or {}}).encode("utf-8") + b"\n")
+        await writer.drain()
+        return await future
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        if self._reader_task is not None:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+
+
+def create_proxy_server(client: DaemonClient) -> Server:
+    """MCP server whose tools are those of the daemon behind client."""
+    server = Server(Config.SERVER_NAME, version=Config.SERVER_VERSION)
+
+    @server.list_tools()
+    async def list_tools() -> List[types.Tool]:
+        return [types.Tool.model_validate(tool) for tool in await client.request("list_tools")]
+
+    # The daemon validates arguments against the real tool schemas
+    @server.call_tool(validate_input=False)
+    async def call_tool(name: str, arguments: Dict[str, Any]) -> types.CallToolResult:
+        result = await client.request("call_tool", {"name": name, "arguments": arguments})
+        return types.CallToolResult.model_validate(result)
+
+    return server
+
+
+async def run_proxy(client: DaemonClient) -> None:
+    """Serve MCP over stdio, forwarding tool requests to the daemon."""
+    server = create_proxy_server(client)
+    await client.connect()
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, server.create_initialization_options())
+    finally:
+        await client.close()
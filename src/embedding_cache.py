@@ -0,0 +1,282 @@
+"""
+Embedding Cache
+===============
+
+Two-tier cache for text embeddings: a bounded in-memory LRU in front of
+a bounded persistent SQLite table. Entries are keyed by (model_name, hash
+of the whitespace-normalized text) and lookups only match the current
+model, so changing EMBEDDING_MODEL invalidates the cache automatically
+(processes using other models may share the file). The table records
+when each row was last read or written and drops the least recently used
+rows, of any model, beyond its size limit on write.
+
+Only the in-memory tier is guarded by the cache-wide lock. Disk reads
+never write: the recency of disk hits is recorded in memory and written
+with the next store() (or on close), in the same transaction as the new
+rows.
+"""
+
+import hashlib
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .models import Config
+
+
+class EmbeddingCache:
+    """
+    LRU + on-disk cache of normalized embeddings.
+    """
+
+    # Keys per statement, well below SQLite's bound-parameter limit
+    _CHUNK = 500
+
+    def __init__(
+        self,
+        model_name: str,
+        db_path: Optional[Path] = None,
+        max_entries: int = None,
+        max_disk_rows: int = None
+    ):
+        """
+        Initialize embedding cache.
+
+        Args:
+            model_name: Embedding model the cached vectors belong to
+            db_path: SQLite file for the persistent tier (None = memory only)
+            max_entries: Maximum in-memory LRU entries (default from Config)
+            max_disk_rows: Maximum rows in the persistent tier (default from Config)
+        """
+        self.model_name = model_name
+        self.db_path = Path(db_path) if db_path else None
+        self.max_entries = max_entries or Config.EMBEDDING_CACHE_SIZE
+        self.max_disk_rows = max_disk_rows or Config.EMBEDDING_CACHE_DISK_ROWS
+
+        self._lru: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_lock = threading.Lock()  # Serializes use of _conn
+        self._touched: Dict[str, float] = {}  # Disk hits whose last_used is not yet written
+        self._disk_rows = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_evictions = 0
+
+        if self.db_path is not None:
+            self._open_disk_tier()
+
+    def _open_disk_tier(self) -> None:
+        """Open the persistent tier and trim it."""
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                model_name TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                last_used REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (model_name, text_hash)
+            ) WITHOUT ROWID
+        """)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(embedding_cache)")}
+        if "last_used" not in columns:
+            # Caches written before the size limit: existing rows count as oldest
+            conn.execute("ALTER TABLE embedding_cache ADD COLUMN last_used REAL NOT NULL DEFAULT 0")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_used ON embedding_cache(last_used)")
+        self._disk_rows = conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+        self._conn = conn
+        self._trim_disk_tier()
+        conn.commit()
+
+    @staticmethod
+    def text_key(text: str) -> str:
+        """
+        Cache key for a text: SHA-256 of the whitespace-normalized text.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Hex digest string
+        """
+        normalized = " ".join(text.split())
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def lookup(self, texts: List[str]) -> Tuple[Dict[int, np.ndarray], List[int]]:
+        """
+        Look up embeddings for texts.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            Tuple of (index → cached embedding, indices of missing texts)
+
+        Raises:
+            sqlite3.Error: If the persistent tier cannot be read
+        """
+        keys = [self.text_key(t) for t in texts]
+        found: Dict[int, np.ndarray] = {}
+        disk_keys: Dict[str, List[int]] = {}
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._lru.get(key)
+                if vector is not None:
+                    self._lru.move_to_end(key)
+                    found[i] = vector
+                    self.memory_hits += 1
+                else:
+                    disk_keys.setdefault(key, []).append(i)
+
+        rows = self._read_disk_tier(list(disk_keys)) if disk_keys else []
+
+        with self._lock:
+            now = time.time()
+            for key, blob in rows:
+                vector = np.frombuffer(blob, dtype=np.float32)
+                self._remember(key, vector)
+                # Recency for eviction (memory-tier hits are not recorded)
+                self._touched[key] = now
+                for i in disk_keys.pop(key):
+                    found[i] = vector
+                    self.disk_hits += 1
+
+            missing = sorted(i for indices in disk_keys.values() for i in indices)
+            self.misses += len(missing)
+
+        return found, missing
+
+    def _read_disk_tier(self, keys: List[str]) -> List[Tuple[str, bytes]]:
+        """Fetch (text_hash, embedding) rows of this model for keys (read-only)."""
+        rows = []
+        with self._disk_lock:
+            if self._conn is None:
+                return rows
+            for start in range(0, len(keys), self._CHUNK):
+                chunk = keys[start:start + self._CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows.extend(self._conn.execute(
+                    f"SELECT text_hash, embedding FROM embedding_cache "
+                    f"WHERE model_name = ? AND text_hash IN ({placeholders})",
+                    [self.model_name, *chunk]
+                ).fetchall())
+        return rows
+
+    def store(self, texts: List[str], embeddings: np.ndarray) -> None:
+        """
+        Add embeddings to both tiers.
+
+        Args:
+            texts: Texts that were encoded
+            embeddings: Array of shape (len(texts), dim)
+
+        Raises:
+            sqlite3.Error: If the persistent tier cannot be written
+        """
+        rows = []
+        now = time.time()
+        with self._lock:
+            for text, vector in zip(texts, embeddings):
+                key = self.text_key(text)
+                vector = np.array(vector, dtype=np.float32)
+                self._remember(key, vector)
+                rows.append((self.model_name, key, vector.tobytes(), now))
+
+        if rows:
+            self._write_disk_tier(rows)
+
+    def _write_disk_tier(self, rows: List[Tuple[str, str, bytes, float]]) -> None:
+        """Write pending disk-hit recency and new rows in one transaction, then trim."""
+        with self._lock:
+            touched, self._touched = self._touched, {}
+
+        with self._disk_lock:
+            if self._conn is None:
+                return
+            try:
+                if touched:
+                    self._conn.executemany(
+                        "UPDATE embedding_cache SET last_used = ? WHERE model_name = ? AND text_hash = ?",
+                        [(used, self.model_name, key) for key, used in touched.items()]
+                    )
+                if rows:
+                    cursor = self._conn.executemany(
+                        "INSERT OR IGNORE INTO embedding_cache (model_name, text_hash, embedding, last_used) "
+                        "VALUES (?, ?, ?, ?)",
+                        rows
+                    )
+                    self._disk_rows += max(cursor.rowcount, 0)
+                self._trim_disk_tier()
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+
+    def _trim_disk_tier(self) -> None:
+        """Delete the least recently used rows beyond max_disk_rows (caller commits)."""
+        excess = self._disk_rows - self.max_disk_rows
+        if excess <= 0:
+            return
+        # Rows of other models are never touched, so they go first
+        deleted = self._conn.execute("""
+            DELETE FROM embedding_cache
+            WHERE (model_name, text_hash) IN (
+                SELECT model_name, text_hash FROM embedding_cache ORDER BY last_used LIMIT ?
+            )
+        """, (excess,)).rowcount
+        self._disk_rows -= deleted
+        self.disk_evictions += deleted
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        """Insert into the LRU tier, evicting the oldest entry if full."""
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters.
+
+        Returns:
+            Dict with tier hits, misses, hit rate and LRU occupancy
+        """
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "model_name": self.model_name,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._lru),
+                "max_memory_entries": self.max_entries,
+                "persistent": self._conn is not None,
+                "disk_entries": self._disk_rows,
+                "max_disk_entries": self.max_disk_rows,
+                "disk_evictions": self.disk_evictions,
+            }
+
+    def close(self) -> None:
+        """Write pending disk-hit recency and close the persistent tier."""
+        if self._conn is None:
+            return
+        try:
+            self._write_disk_tier([])
+        except sqlite3.Error as e:
+            print(f"Failed to write embedding cache recency: {e}", file=sys.stderr)
+        with self._disk_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -4,44 +4,238 @@ Embeddings Module
 
 Provides text embedding generation using sentence-transformers.
 Handles model initialization, caching, and vector operations.
+
+sentence-transformers (and torch) are imported only when the model is
+first loaded, so importing this module stays cheap.
 """
 
+import asyncio
 import os
+import queue
+import sqlite3
 import sys
-from typing import List, Optional
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from typing import TYPE_CHECKING, List, Optional, Tuple
 import numpy as np
-from sentence_transformers import SentenceTransformer
 
+from .embedding_cache import EmbeddingCache
 from .models import Config
 from .security import SecurityError
 
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+
+class EncodeBatcher:
+    """
+    Micro-batching scheduler for concurrent encode requests.
+
+    Callers submit texts from any thread (or await from the event loop).
+    A single worker thread takes the first pending request, keeps
+    collecting requests for up to max_latency_ms or until max_batch_size
+    texts are gathered, runs one forward pass for all of them and fans
+    the embeddings back out to each caller's future.
+
+    The latency budget is only spent while traffic is concurrent (the
+    previous batch merged several requests); a lone caller is encoded
+    immediately.
+    """
+
+    def __init__(self, encode_fn, max_batch_size: int = None, max_latency_ms: float = None):
+        """
+        Initialize batcher.
+
+        Args:
+            encode_fn: Callable(texts) -> np.ndarray running the actual forward pass
+            max_batch_size: Maximum texts per forward pass (default from Config)
+            max_latency_ms: Maximum time to wait for more requests (default from Config)
+        """
+        self._encode_fn = encode_fn
+        self.max_batch_size = max_batch_size or Config.ENCODE_BATCH_SIZE
+        self.max_latency_ms = (
+            Config.ENCODE_BATCH_LATENCY_MS if max_latency_ms is None else max_latency_ms
+        )
+        # None is the stop sentinel queued by close()
+        self._queue: "queue.Queue[Optional[Tuple[List[str], Future]]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._last_batch_requests = 1
+        self.batches = 0
+        self.texts = 0
+
+    def _ensure_worker(self) -> None:
+        """Start the worker thread on first use, or again if it has exited (call with _lock held)."""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._run, name="vector-memory-encode-batcher", daemon=True
+            )
+            self._worker.start()
+
+    def submit(self, texts: List[str]) -> Future:
+        """
+        Queue texts for encoding.
+
+        Args:
+            texts: Texts to encode
+
+        Returns:
+            Future resolving to np.ndarray of shape (len(texts), dim)
+        """
+        future: Future = Future()
+        with self._lock:
+            self._ensure_worker()
+            self._queue.put((texts, future))
+        return future
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts, blocking until their batch completes."""
+        return self.submit(texts).result()
+
+    async def encode_async(self, texts: List[str]) -> np.ndarray:
+        """Encode texts without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(texts))
+
+    def close(self, timeout: float = None) -> None:
+        """
+        Stop the worker thread after the requests already queued.
+
+        A later submit() starts a new worker.
+
+        Args:
+            timeout: Seconds to wait for the worker to exit (None waits for the queue to drain)
+        """
+        with self._lock:
+            worker, self._worker = self._worker, None
+            if worker is None or not worker.is_alive():
+                return
+            self._queue.put(None)
+            # Joined under the lock so no request lands behind the sentinel
+            worker.join(timeout)
+
+    def _collect(self) -> Tuple[List[Tuple[List[str], Future]], bool]:
+        """
+        Block for the first request, then gather more until full or deadline.
+
+        Requests whose caller already cancelled are dropped; the rest are
+        marked running so they can no longer be cancelled.
+
+        Returns:
+            Tuple of (requests to encode together, whether close() queued the stop sentinel)
+        """
+        batch: List[Tuple[List[str], Future]] = []
+        size = 0
+        deadline = None
+
+        while size < self.max_batch_size:
+            if deadline is None:
+                item = self._queue.get()
+            else:
+                timeout = deadline - time.monotonic()
+                try:
+                    # Requests already queued are taken even after the deadline
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if item is None:
+                return batch, True
+
+            request_texts, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            batch.append(item)
+            size += len(request_texts)
+
+            if deadline is None:
+                wait_ms = self.max_latency_ms if self._last_batch_requests > 1 else 0
+                deadline = time.monotonic() + wait_ms / 1000
+
+        self._last_batch_requests = len(batch)
+        return batch, False
+
+    def _run(self) -> None:
+        """Worker loop: collect, encode once, fan out."""
+        stop = False
+        while not stop:
+            batch, stop = self._collect()
+            if not batch:
+                continue
+            texts = [text for request_texts, _ in batch for text in request_texts]
+
+            try:
+                embeddings = self._encode_fn(texts)
+            except Exception as e:
+                for _, future in batch:
+                    self._resolve(future, exception=e)
+                continue
+
+            self.batches += 1
+            self.texts += len(texts)
+
+            start = 0
+            for request_texts, future in batch:
+                end = start + len(request_texts)
+                self._resolve(future, result=embeddings[start:end])
+                start = end
+
+    @staticmethod
+    def _resolve(future: Future, result=None, exception: Exception = None) -> None:
+        """Complete one caller's future; a future in a bad state never ends the worker loop."""
+        try:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        except InvalidStateError as e:
+            print(f"Dropped encode result for a finished request: {e}", file=sys.stderr)
+
 
 class EmbeddingModel:
     """
     Wrapper for sentence-transformers model with caching and validation.
     """
     
-    def __init__(self, model_name: str = None, cache_dir: str = None):
+    def __init__(self, model_name: str = None, cache_dir: str = None, batching: bool = None):
         """
         Initialize embedding model.
         
         Args:
             model_name: Name of the sentence-transformers model
             cache_dir: Directory to cache the model
+            batching: Route concurrent encode calls through an EncodeBatcher
+                (default Config.ENCODE_BATCHING)
         """
         self.model_name = model_name or Config.EMBEDDING_MODEL
         self.cache_dir = cache_dir
-        self.model: Optional[SentenceTransformer] = None
+        self.model: Optional["SentenceTransformer"] = None
         self._embedding_dim: Optional[int] = None
+        self._init_lock = threading.Lock()
+        self.cache: Optional[EmbeddingCache] = None
+
+        if batching is None:
+            batching = Config.ENCODE_BATCHING
+        self.batcher: Optional[EncodeBatcher] = (
+            EncodeBatcher(self._encode_batch) if batching else None
+        )
         
     def _initialize_model(self) -> None:
         """Initialize the sentence transformer model."""
+        with self._init_lock:
+            if self.model is None:
+                self._load_model()
+
+    def _load_model(self) -> None:
+        """Load the sentence transformer and verify its dimensions."""
         try:
             # Set cache directory if provided
             if self.cache_dir:
                 os.environ['SENTENCE_TRANSFORMERS_HOME'] = self.cache_dir
             
             print(f"Loading embedding model: {self.model_name}", file=sys.stderr)
+            # Deferred: importing torch takes seconds
+            from sentence_transformers import SentenceTransformer
             self.model = SentenceTransformer(self.model_name)
             
             # Verify model dimensions
@@ -68,20 +262,15 @@ class EmbeddingModel:
             return self._embedding_dim
         return self._embedding_dim
     
-    def encode(self, texts: List[str], normalize: bool = True) -> np.ndarray:
+    def _validate_texts(self, texts: List[str]) -> None:
         """
-        Generate embeddings for a list of texts.
-        
+        Validate encode input.
+
         Args:
             texts: List of text strings to encode
-            normalize: Whether to normalize embeddings to unit length
-            
-        Returns:
-            np.ndarray: Array of embeddings with shape (len(texts), embedding_dim)
-            
+
         Raises:
             SecurityError: If input validation fails
-            RuntimeError: If encoding fails
         """
         if not isinstance(texts, list):
             raise SecurityError("Input must be a list of strings")
@@ -95,11 +284,93 @@ class EmbeddingModel:
                 raise SecurityError(f"Text at index {i} must be a string")
             if not text.strip():
                 raise SecurityError(f"Text at index {i} cannot be empty")
+
+    def encode(self, texts: List[str], normalize: bool = True) -> np.ndarray:
+        """
+        Generate embeddings for a list of texts.
+        
+        Args:
+            texts: List of text strings to encode
+            normalize: Whether to normalize embeddings to unit length
+            
+        Returns:
+            np.ndarray: Array of embeddings with shape (len(texts), embedding_dim)
+            
+        Raises:
+            SecurityError: If input validation fails
+            RuntimeError: If encoding fails
+        """
+        self._validate_texts(texts)
         
         # Initialize model if needed
         if self.model is None:
             self._initialize_model()
-        
+
+        if self.cache is None or not normalize:
+            return self._encode_uncached(texts, normalize)
+
+        # Only texts missing from the cache reach the model; the cache is an
+        # optimization, so a failing disk tier only costs the lookup
+        try:
+            cached, missing = self.cache.lookup(texts)
+        except sqlite3.Error as e:
+            print(f"Embedding cache lookup failed, encoding without it: {e}", file=sys.stderr)
+            return self._encode_uncached(texts, normalize)
+        if not missing:
+            return np.stack([cached[i] for i in range(len(texts))])
+
+        missing_texts = [texts[i] for i in missing]
+        encoded = self._encode_uncached(missing_texts, normalize)
+        try:
+            self.cache.store(missing_texts, encoded)
+        except sqlite3.Error as e:
+            print(f"Failed to write embedding cache: {e}", file=sys.stderr)
+
+        embeddings = np.empty((len(texts), encoded.shape[1]), dtype=np.float32)
+        embeddings[missing] = encoded
+        for i, vector in cached.items():
+            embeddings[i] = vector
+        return embeddings
+
+    def _encode_uncached(self, texts: List[str], normalize: bool = True) -> np.ndarray:
+        """Encode texts with the model, sharing forward passes when batching."""
+        # Concurrent callers share forward passes through the batcher
+        if self.batcher is not None and normalize:
+            return self.batcher.encode(texts)
+
+        return self._encode_batch(texts, normalize)
+
+    def attach_cache(self, cache: Optional[EmbeddingCache]) -> None:
+        """
+        Put an embedding cache in front of normalized encode calls.
+
+        Args:
+            cache: EmbeddingCache for this model (None to detach)
+        """
+        if cache is not None and cache.model_name != self.model_name:
+            raise ValueError(
+                f"Embedding cache belongs to model {cache.model_name}, not {self.model_name}"
+            )
+        self.cache = cache
+
+    async def encode_async(self, texts: List[str], normalize: bool = True) -> np.ndarray:
+        """
+        Generate embeddings from async code without blocking the event loop.
+
+        Args:
+            texts: List of text strings to encode
+            normalize: Whether to normalize embeddings to unit length
+
+        Returns:
+            np.ndarray: Array of embeddings with shape (len(texts), embedding_dim)
+        """
+        if self.batcher is not None and normalize and self.model is not None and self.cache is None:
+            self._validate_texts(texts)
+            return await self.batcher.encode_async(texts)
+        return await asyncio.to_thread(self.encode, texts, normalize)
+
+    def _encode_batch(self, texts: List[str], normalize: bool = True) -> np.ndarray:
+        """Run one forward pass over texts (no validation, no batching)."""
         try:
             embeddings = self.model.encode(
                 texts,
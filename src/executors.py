@@ -0,0 +1,157 @@
+"""
+Tool Executors
+==============
+
+Dedicated thread pools for running blocking store operations off the
+asyncio event loop. Encoding (CPU-bound model inference) and database
+work (I/O-bound SQLite calls) get separate pools so a slow embedding
+job cannot starve cheap lookups.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from .models import Config
+
+
+class ToolExecutor:
+    """
+    Named thread pool with a concurrency limit and queue-depth metrics.
+
+    At most max_workers calls run at once; up to max_pending more wait in
+    the queue. Calls beyond that are rejected instead of piling up.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_pending: int = None):
+        """
+        Initialize executor.
+
+        Args:
+            name: Pool name (used for thread names and metrics)
+            max_workers: Maximum concurrently running calls
+            max_pending: Maximum queued calls (default Config.EXECUTOR_MAX_PENDING)
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending or Config.EXECUTOR_MAX_PENDING
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=f"vector-memory-{name}"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._max_queue_depth = 0
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking callable in the pool and await its result.
+
+        Args:
+            fn: Callable to run
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Return value of fn
+
+        Raises:
+            RuntimeError: If the pending queue is full
+        """
+        with self._lock:
+            if self._queued >= self.max_pending:
+                self._rejected += 1
+                raise RuntimeError(
+                    f"Server busy: {self.name} queue is full ({self.max_pending} pending calls)"
+                )
+            self._queued += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queued)
+
+        state = {"started": False}
+
+        def task() -> Any:
+            with self._lock:
+                state["started"] = True
+                self._queued -= 1
+                self._active += 1
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException:
+                with self._lock:
+                    self._failed += 1
+                raise
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+            return result
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, task)
+        finally:
+            # Call cancelled before a worker picked it up
+            with self._lock:
+                if not state["started"]:
+                    state["started"] = True
+                    self._queued -= 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get executor counters.
+
+        Returns:
+            Dict with limits, current queue depth and lifetime counters
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "active": self._active,
+                "queue_depth": self._queued,
+                "max_queue_depth": self._max_queue_depth,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work and release worker threads."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+class ToolExecutors:
+    """Pair of executors used by the MCP tools: encode (CPU) and db (I/O)."""
+
+    def __init__(self, encode_workers: int = None, db_workers: int = None):
+        """
+        Initialize executors.
+
+        Args:
+            encode_workers: Workers for model inference calls (default from Config)
+            db_workers: Workers for database-only calls (default from Config)
+        """
+        self.encode = ToolExecutor("encode", encode_workers or Config.ENCODE_WORKERS)
+        self.db = ToolExecutor("db", db_workers or Config.DB_WORKERS)
+
+    @property
+    def max_workers(self) -> int:
+        """Workers across both executors."""
+        return self.encode.max_workers + self.db.max_workers
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Get metrics for both executors."""
+        return {
+            "encode": self.encode.metrics(),
+            "db": self.db.metrics(),
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Shut down both executors."""
+        self.encode.shutdown(wait=wait)
+        self.db.shutdown(wait=wait)
@@ -13,7 +13,11 @@ import sqlite_vec
 import json
 import os
 import re
+import sys
+import threading
+import time
 import numpy as np
+from collections import Counter
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Tuple, Set
@@ -21,10 +25,15 @@ from typing import List, Optional, Dict, Any, Tuple, Set
 from .models import MemoryEntry, MemoryCategory, SearchResult, MemoryStats, Config
 from .security import (
     SecurityError, sanitize_input, validate_tags, validate_category,
-    validate_search_params, validate_cleanup_params, generate_content_hash,
-    check_resource_limits, validate_file_path
+    validate_search_params, validate_cleanup_params, validate_similarity_threshold,
+    generate_content_hash, check_resource_limits, validate_file_path
 )
 from .embeddings import get_embedding_model, EmbeddingModel
+from .embedding_cache import EmbeddingCache
+from .tag_index import CanonicalTagIndex
+from .connection_pool import ConnectionPool
+from .access_tracker import AccessTracker
+from .vector_index import VectorIndex, VECTOR_INDEX_ENGINES
 
 
 def _normalize_tag_for_embedding(tag: str) -> str:
@@ -189,15 +198,54 @@ def _can_merge_tags(tag1: str, tag2: str, similarity: float) -> bool:
     return True
 
 
+class _StageTimer:
+    """Milliseconds spent in each stage of a pipeline."""
+
+    def __init__(self):
+        self._start = self._last = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    def lap(self, stage: str) -> None:
+        """Close the current stage under the given name."""
+        now = time.perf_counter()
+        self.stages[stage] = round((now - self._last) * 1000, 3)
+        self._last = now
+
+    def result(self) -> Dict[str, float]:
+        """Stage timings plus the total."""
+        return {**self.stages, "total": round((time.perf_counter() - self._start) * 1000, 3)}
+
+
+# Descriptive labels embedded for each canonical category
+CATEGORY_LABELS = {
+    'code-solution': 'code solution implementation',
+    'bug-fix': 'bug fix error correction',
+    'architecture': 'architecture design structure',
+    'learning': 'learning knowledge discovery',
+    'tool-usage': 'tool usage utility',
+    'debugging': 'debugging troubleshooting diagnosis',
+    'performance': 'performance optimization speed',
+    'security': 'security vulnerability protection',
+    'other': 'other miscellaneous general'
+}
+
+
 class VectorMemoryStore:
     """
     Thread-safe vector memory storage using sqlite-vec.
     """
     
-    # Pre-computed canonical category embeddings (set on first use)
-    _canonical_categories_embeddings: Optional[Dict[str, List[float]]] = None
-    
-    def __init__(self, db_path: Path, embedding_model_name: str = None, memory_limit: int = None):
+    def __init__(
+        self,
+        db_path: Path,
+        embedding_model_name: str = None,
+        memory_limit: int = None,
+        pool_size: int = None,
+        pragmas: Dict[str, Any] = None,
+        access_tracking: str = None,
+        vector_storage: str = None,
+        vector_index: str = None
+    ):
         """
         Initialize vector memory store.
 
@@ -205,6 +253,14 @@ class VectorMemoryStore:
             db_path: Path to SQLite database file
             embedding_model_name: Name of embedding model to use
             memory_limit: Maximum number of memories to store (default from Config)
+            pool_size: Maximum pooled connections (default Config.DB_POOL_SIZE)
+            pragmas: PRAGMA overrides for pooled connections (default Config.DB_PRAGMAS)
+            access_tracking: "deferred" or "strict" (default Config.ACCESS_TRACKING_MODE)
+            vector_storage: "float", "int8" or "bit"; migrates the database if it
+                differs from the stored mode (default: keep the stored mode,
+                Config.VECTOR_STORAGE for new databases)
+            vector_index: In-process index engine for unfiltered searches, "hnsw"
+                or "flat" (default Config.VECTOR_INDEX_ENGINE; "" disables)
         """
         self.db_path = Path(db_path)
         self.embedding_model_name = embedding_model_name or Config.EMBEDDING_MODEL
@@ -213,13 +269,67 @@ class VectorMemoryStore:
         # Validate database path
         validate_file_path(self.db_path)
 
+        # Persistent connections (opened lazily, sqlite-vec preloaded)
+        self._pool = ConnectionPool(
+            self.db_path,
+            max_size=pool_size,
+            pragmas={**Config.DB_PRAGMAS, **(pragmas or {})}
+        )
+
         # Lazy-loaded embedding model (async initialization)
         self._embedding_model: EmbeddingModel | None = None
         self._model_loading_task: asyncio.Task | None = None
+        self._model_lock = threading.RLock()
+
+        # Canonical tag embeddings as one matrix (loaded on first store)
+        self._tag_index = CanonicalTagIndex()
+
+        # Canonical category embeddings: (model name, categories, matrix),
+        # read from category_embeddings on first use
+        self._category_embeddings: Optional[Tuple[str, List[str], np.ndarray]] = None
+
+        # get_stats: (expiry on time.monotonic(), recent-week count, top accessed);
+        # reset by every write that changes memories, not by search accesses
+        self._stats_cache: Optional[Tuple[float, int, List[Dict[str, Any]]]] = None
+
+        # Search access counts: batched write-behind unless strict
+        access_tracking = access_tracking or Config.ACCESS_TRACKING_MODE
+        if access_tracking not in ("deferred", "strict"):
+            raise ValueError(f"access_tracking must be 'deferred' or 'strict', got {access_tracking!r}")
+        self._access_tracker: Optional[AccessTracker] = (
+            AccessTracker(self._flush_access_counts) if access_tracking == "deferred" else None
+        )
+
+        # Vector storage mode (resolved against the database on init)
+        if vector_storage is not None and vector_storage not in Config.VECTOR_STORAGE_MODES:
+            raise ValueError(
+                f"vector_storage must be one of {', '.join(Config.VECTOR_STORAGE_MODES)}, got {vector_storage!r}"
+            )
+        self.vector_storage: Optional[str] = vector_storage
+
+        # Optional in-process vector index (built or loaded on database init)
+        if vector_index is None:
+            vector_index = Config.VECTOR_INDEX_ENGINE
+        if vector_index and vector_index not in VECTOR_INDEX_ENGINES:
+            raise ValueError(
+                f"vector_index must be one of {', '.join(VECTOR_INDEX_ENGINES)}, got {vector_index!r}"
+            )
+        self._vector_index_engine: Optional[str] = vector_index or None
+        self._vector_index: Optional[VectorIndex] = None
+        self._vector_index_path = self.db_path.parent / Config.VECTOR_INDEX_FILE
+        self._vector_index_saved_version: Optional[Tuple[int, int]] = None
+        self._vector_index_sync_lock = threading.Lock()
 
         # Lazy-loaded database initialization (async)
         self._db_initialized: bool = False
         self._db_init_task: asyncio.Task | None = None
+        self._db_init_lock = threading.Lock()
+
+        # Background warm-up (preload): step -> state, seconds, error
+        self._preload_thread: Optional[threading.Thread] = None
+        self._preload_state: Dict[str, str] = {}
+        self._preload_seconds: Dict[str, float] = {}
+        self._preload_errors: Dict[str, str] = {}
 
     async def _ensure_db_initialized_async(self) -> None:
         """
@@ -233,7 +343,7 @@ class VectorMemoryStore:
 
         if self._db_init_task is None:
             self._db_init_task = asyncio.create_task(
-                asyncio.to_thread(self._init_database)
+                asyncio.to_thread(self._ensure_db_initialized_sync)
             )
 
         await self._db_init_task
@@ -244,10 +354,14 @@ class VectorMemoryStore:
         Ensure database is initialized with synchronous loading (fallback for non-async contexts).
 
         Blocks if database not yet initialized (synchronous fallback).
+        Safe to call from several threads (e.g. preload and a tool call).
         """
-        if not self._db_initialized:
-            self._init_database()
-            self._db_initialized = True
+        if self._db_initialized:
+            return
+        with self._db_init_lock:
+            if not self._db_initialized:
+                self._init_database()
+                self._db_initialized = True
 
     async def get_embedding_model_async(self) -> EmbeddingModel:
         """
@@ -268,7 +382,8 @@ class VectorMemoryStore:
                 asyncio.to_thread(get_embedding_model, self.embedding_model_name)
             )
 
-        self._embedding_model = await self._model_loading_task
+        model = await self._model_loading_task
+        self._embedding_model = self._attach_embedding_cache(model)
         return self._embedding_model
 
     def _get_embedding_model_sync(self) -> EmbeddingModel:
@@ -282,9 +397,95 @@ class VectorMemoryStore:
             EmbeddingModel instance
         """
         if self._embedding_model is None:
-            self._embedding_model = get_embedding_model(self.embedding_model_name)
+            with self._model_lock:
+                if self._embedding_model is None:
+                    model = get_embedding_model(self.embedding_model_name)
+                    self._embedding_model = self._attach_embedding_cache(model)
         return self._embedding_model
 
+    def _attach_embedding_cache(self, model: EmbeddingModel) -> EmbeddingModel:
+        """
+        Give the model a persistent embedding cache stored next to the database.
+
+        The cache is keyed by model name, so switching EMBEDDING_MODEL
+        starts from an empty cache instead of returning stale vectors.
+        """
+        with self._model_lock:
+            if Config.EMBEDDING_CACHE_ENABLED and model.cache is None:
+                cache_path = self.db_path.parent / Config.EMBEDDING_CACHE_DB_NAME
+                model.attach_cache(EmbeddingCache(model.model_name, cache_path))
+        return model
+
+    def preload(self) -> threading.Thread:
+        """
+        Warm up in a background thread: initialize the database and load
+        the canonical tag matrix, load the embedding model, then embed the
+        canonical categories.
+
+        Tool calls arriving meanwhile wait for the step they need instead
+        of starting it again. Progress is reported by get_readiness().
+
+        Returns:
+            The warm-up thread
+        """
+        if self._preload_thread is not None:
+            return self._preload_thread
+
+        def load_database():
+            self._ensure_db_initialized_sync()
+            conn = self._get_connection()
+            try:
+                self._tag_index.sync(conn)
+            finally:
+                conn.close()
+
+        steps = (
+            ("database", load_database),
+            ("model", lambda: self._get_embedding_model_sync()._initialize_model()),
+            ("categories", lambda: self._get_canonical_categories_embeddings(self._get_embedding_model_sync())),
+        )
+
+        def run():
+            for name, step in steps:
+                self._preload_state[name] = "loading"
+                start = time.perf_counter()
+                try:
+                    step()
+                except Exception as e:
+                    self._preload_state[name] = "failed"
+                    self._preload_errors[name] = str(e)
+                    print(f"Preload of {name} failed: {e}", file=sys.stderr)
+                    continue
+                self._preload_seconds[name] = round(time.perf_counter() - start, 3)
+                self._preload_state[name] = "ready"
+
+        self._preload_thread = threading.Thread(target=run, name="vector-memory-preload", daemon=True)
+        self._preload_thread.start()
+        return self._preload_thread
+
+    def get_readiness(self) -> Dict[str, Any]:
+        """
+        Report which startup steps are done.
+
+        Returns:
+            Dict with ready (all steps done), preload, a state per step
+            (pending, loading, ready or failed), preload timings and errors
+        """
+        model = self._embedding_model
+        done = {
+            "database": self._db_initialized,
+            "model": getattr(model, "model", None) is not None,
+            "categories": self._category_embeddings is not None,
+        }
+        readiness: Dict[str, Any] = {"ready": all(done.values()), "preload": self._preload_thread is not None}
+        for name, is_done in done.items():
+            readiness[name] = "ready" if is_done else self._preload_state.get(name, "pending")
+        if self._preload_seconds:
+            readiness["preload_seconds"] = dict(self._preload_seconds)
+        if self._preload_errors:
+            readiness["errors"] = dict(self._preload_errors)
+        return readiness
+
     @property
     def embedding_model(self) -> EmbeddingModel:
         """
@@ -320,12 +521,8 @@ class VectorMemoryStore:
                 )
             """)
             
-            # Create vector table using vec0
-            conn.execute(f"""
-                CREATE VIRTUAL TABLE IF NOT EXISTS memory_vectors USING vec0(
-                    embedding float[{Config.EMBEDDING_DIM}]
-                );
-            """)
+            # Create vector table using vec0 (cosine metric enables native KNN)
+            conn.execute(self._vector_table_ddl(if_not_exists=True))
             
             # Create canonical tags table for semantic normalization
             conn.execute("""
@@ -337,6 +534,17 @@ class VectorMemoryStore:
                 )
             """)
 
+            # Embedded canonical category labels, per model
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS category_embeddings (
+                    model TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    label TEXT NOT NULL,
+                    embedding BLOB NOT NULL,
+                    PRIMARY KEY (model, category)
+                )
+            """)
+
             # Create tag snapshots table for rollback safety
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS tag_snapshots (
@@ -355,6 +563,29 @@ class VectorMemoryStore:
             except sqlite3.OperationalError:
                 pass  # Column already exists
 
+            # Migration: rebuild legacy vector table (L2 metric) with cosine distance
+            self._migrate_vector_table(conn)
+
+            # Settings table and float side table for quantized storage
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS store_settings (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS memory_vectors_float (
+                    id INTEGER PRIMARY KEY,
+                    embedding BLOB NOT NULL  -- float32, used for reranking
+                )
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS memory_vectors_float_delete AFTER DELETE ON memory_metadata
+                BEGIN
+                    DELETE FROM memory_vectors_float WHERE id = OLD.id;
+                END
+            """)
+
             # Create indexes for performance
             conn.execute("CREATE INDEX IF NOT EXISTS idx_category ON memory_metadata(category)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_created_at ON memory_metadata(created_at)")
@@ -362,6 +593,21 @@ class VectorMemoryStore:
             conn.execute("CREATE INDEX IF NOT EXISTS idx_access_count ON memory_metadata(access_count)")
             
             conn.commit()
+
+            # Float or quantized vectors (per-database setting)
+            self._init_vector_storage(conn)
+
+            # Trigger-maintained total/per-category counters
+            self._init_memory_counts(conn)
+
+            # Trigger-maintained memory_id/tag index
+            self._init_memory_tags(conn)
+
+            # Trigger-maintained full-text index for hybrid search
+            self._init_memory_fts(conn)
+
+            # In-process vector index (optional)
+            self._init_vector_index(conn)
             
         except Exception as e:
             conn.rollback()
@@ -369,36 +615,675 @@ class VectorMemoryStore:
         finally:
             conn.close()
     
-    def _get_connection(self) -> sqlite3.Connection:
-        """Get SQLite connection with sqlite-vec loaded."""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.enable_load_extension(True)
-        sqlite_vec.load(conn)
-        conn.enable_load_extension(False)
-        return conn
+    def _vector_table_ddl(self, if_not_exists: bool = False, storage: str = "float") -> str:
+        """
+        Build the CREATE statement for the memory_vectors vec0 table.
+
+        Args:
+            if_not_exists: Add IF NOT EXISTS clause
+            storage: Vector storage mode ("float", "int8" or "bit")
+
+        Returns:
+            SQL statement string
+        """
+        clause = "IF NOT EXISTS " if if_not_exists else ""
+        column = {
+            "float": f"float[{Config.EMBEDDING_DIM}] distance_metric=cosine",
+            "int8": f"int8[{Config.EMBEDDING_DIM}] distance_metric=cosine",
+            "bit": f"bit[{Config.EMBEDDING_DIM}]",  # hamming distance
+        }[storage]
+        return f"""
+            CREATE VIRTUAL TABLE {clause}memory_vectors USING vec0(
+                category text partition key,
+                embedding {column}
+            )
+        """
+
+    @staticmethod
+    def _quantize_sql(storage: str, expr: str) -> str:
+        """
+        Wrap a float32 vector SQL expression in the quantizer for a storage mode.
+
+        Args:
+            storage: Vector storage mode
+            expr: SQL expression yielding a float32 vector (e.g. "?")
 
-    def _get_canonical_tags(self, conn: sqlite3.Connection) -> Dict[str, List[float]]:
+        Returns:
+            SQL expression matching the memory_vectors column type
+        """
+        if storage == "int8":
+            return f"vec_quantize_int8({expr}, 'unit')"
+        if storage == "bit":
+            return f"vec_quantize_binary({expr})"
+        return expr
+
+    def _migrate_vector_table(self, conn: sqlite3.Connection) -> None:
         """
-        Load all canonical tags with their embeddings.
+        Rebuild memory_vectors if its schema predates the current definition
+        (cosine distance metric, category partition key).
+
+        vec0 tables cannot be altered or renamed, so vectors are copied into
+        a temp table, the virtual table is recreated and the data reinserted
+        in a single transaction.
 
         Args:
             conn: Database connection
+        """
+        row = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'memory_vectors'"
+        ).fetchone()
+        if row is None or (
+            ("distance_metric=cosine" in row[0] or "bit[" in row[0]) and "partition key" in row[0]
+        ):
+            return
+
+        conn.execute("BEGIN")
+        conn.execute("""
+            CREATE TEMP TABLE memory_vectors_migration AS
+            SELECT rowid AS id, embedding FROM memory_vectors
+        """)
+        conn.execute("DROP TABLE memory_vectors")
+        conn.execute(self._vector_table_ddl())
+        conn.execute("""
+            INSERT INTO memory_vectors (rowid, category, embedding)
+            SELECT t.id, m.category, t.embedding
+            FROM temp.memory_vectors_migration t
+            LEFT JOIN memory_metadata m ON m.id = t.id
+        """)
+        conn.execute("DROP TABLE temp.memory_vectors_migration")
+        conn.commit()
+
+    def _init_vector_storage(self, conn: sqlite3.Connection) -> None:
+        """
+        Resolve the vector storage mode and migrate memory_vectors if needed.
+
+        The mode is stored in store_settings. Databases without the setting
+        hold float vectors. An explicit vector_storage that differs from the
+        stored mode rebuilds memory_vectors; otherwise the stored mode is kept.
+
+        Args:
+            conn: Database connection
+        """
+        row = conn.execute(
+            "SELECT value FROM store_settings WHERE key = 'vector_storage'"
+        ).fetchone()
+        current = row[0] if row else "float"
+        target = self.vector_storage or (row[0] if row else Config.VECTOR_STORAGE)
+
+        if target != current:
+            self._migrate_vector_storage(conn, current, target)
+        elif row is None:
+            conn.execute(
+                "INSERT INTO store_settings (key, value) VALUES ('vector_storage', ?)", (target,)
+            )
+            conn.commit()
+
+        self.vector_storage = target
+
+    def _migrate_vector_storage(self, conn: sqlite3.Connection, current: str, target: str) -> None:
+        """
+        Rebuild memory_vectors with another storage mode in one transaction.
+
+        Float vectors are read from memory_vectors (float mode) or
+        memory_vectors_float (quantized modes), the vec0 table is recreated
+        with the new column type and refilled; quantized modes also keep
+        the float copies in memory_vectors_float.
+
+        Args:
+            conn: Database connection
+            current: Storage mode of the existing table
+            target: Storage mode to migrate to
+        """
+        source = "memory_vectors" if current == "float" else "memory_vectors_float"
+
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(f"""
+            CREATE TEMP TABLE memory_vectors_migration AS
+            SELECT v.rowid AS id, m.category AS category, v.embedding AS embedding
+            FROM {source} v
+            JOIN memory_metadata m ON m.id = v.rowid
+        """)
+        conn.execute("DROP TABLE memory_vectors")
+        conn.execute(self._vector_table_ddl(storage=target))
+        conn.execute(f"""
+            INSERT INTO memory_vectors (rowid, category, embedding)
+            SELECT id, category, {self._quantize_sql(target, 'embedding')}
+            FROM temp.memory_vectors_migration
+        """)
+        conn.execute("DELETE FROM memory_vectors_float")
+        if target != "float":
+            conn.execute("""
+                INSERT INTO memory_vectors_float (id, embedding)
+                SELECT id, embedding FROM temp.memory_vectors_migration
+            """)
+        conn.execute("DROP TABLE temp.memory_vectors_migration")
+        conn.execute(
+            "INSERT OR REPLACE INTO store_settings (key, value) VALUES ('vector_storage', ?)", (target,)
+        )
+        conn.commit()
+
+    @property
+    def _float_vectors_table(self) -> str:
+        """Table holding float32 embeddings (rowid = memory ID) for exact distances."""
+        return "memory_vectors" if self.vector_storage == "float" else "memory_vectors_float"
+
+    def _vector_index_version(self, conn: sqlite3.Connection) -> Tuple[int, int]:
+        """
+        (AUTOINCREMENT sequence, row count) of memory_metadata.
+
+        The sequence never decreases and the count changes on delete, so
+        every insert or delete yields a new version.
+        """
+        row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'memory_metadata'").fetchone()
+        return (row[0] if row else 0, self._count_memories(conn))
+
+    def _init_vector_index(self, conn: sqlite3.Connection) -> None:
+        """
+        Load the vector index sidecar, or build it from the stored vectors
+        when it is missing or does not match the database. Persistent
+        engines (mmap) are written through on every change and shared by
+        all processes using the database, so a stale one is synced rather
+        than rebuilt.
+
+        An unavailable engine (hnswlib not installed) disables the index
+        with a warning; searches keep using sqlite-vec.
+
+        Args:
+            conn: Database connection
+        """
+        if not self._vector_index_engine or self._vector_index is not None:
+            return
+
+        engine = VECTOR_INDEX_ENGINES[self._vector_index_engine]
+        try:
+            index = engine.load(self._vector_index_path)
+            version = self._vector_index_version(conn)
+            if index is None or (index.version != version and not index.persistent):
+                index = engine.create(self._vector_index_path)
+            if index.version != version:
+                # Persistent engines catch up incrementally instead of rebuilding
+                self._sync_vector_index(conn, index)
+                index.save(self._vector_index_path)
+        except ImportError as e:
+            print(f"Vector index disabled: {e}", file=sys.stderr)
+            self._vector_index_engine = None
+            return
+
+        self._vector_index_saved_version = index.version
+        self._vector_index = index
+
+    def _sync_vector_index(self, conn: sqlite3.Connection, index: VectorIndex) -> Dict[str, int]:
+        """
+        Add missing and drop deleted vectors so the index matches the database.
+
+        Args:
+            conn: Database connection
+            index: Index to update
+
+        Returns:
+            Dict with added and removed counts
+        """
+        version = self._vector_index_version(conn)
+        table = self._float_vectors_table
+
+        if len(index) == 0:
+            # Initial build: stream every vector
+            added = 0
+            cursor = conn.execute(f"SELECT rowid, embedding FROM {table}")
+            while True:
+                rows = cursor.fetchmany(10_000)
+                if not rows:
+                    break
+                index.add(
+                    [row[0] for row in rows],
+                    np.stack([np.frombuffer(row[1], dtype=np.float32) for row in rows])
+                )
+                added += len(rows)
+            index.version = version
+            return {"added": added, "removed": 0}
+
+        db_ids = np.fromiter((row[0] for row in conn.execute(f"SELECT rowid FROM {table}")), dtype=np.int64)
+        index_ids = index.ids()
+        removed = np.setdiff1d(index_ids, db_ids).tolist()
+        added = np.setdiff1d(db_ids, index_ids).tolist()
+
+        index.remove(removed)
+        for start in range(0, len(added), 500):
+            chunk = added[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT rowid, embedding FROM {table} WHERE rowid IN ({placeholders})", chunk
+            ).fetchall()
+            if rows:
+                index.add(
+                    [row[0] for row in rows],
+                    np.stack([np.frombuffer(row[1], dtype=np.float32) for row in rows])
+                )
+
+        index.version = version
+        return {"added": len(added), "removed": len(removed)}
+
+    def sync_vector_index(self) -> Dict[str, Any]:
+        """
+        Bring the in-process vector index up to date with the database.
+
+        Needed only after changes made by other processes; this process
+        updates the index on every store and delete.
 
         Returns:
-            Dict mapping tag string to embedding vector
+            Dict with engine, size and added/removed counts
+        """
+        self._ensure_db_initialized_sync()
+        index = self._vector_index
+        if index is None:
+            return {"enabled": False}
+
+        with self._vector_index_sync_lock:
+            conn = self._get_connection()
+            try:
+                changes = self._sync_vector_index(conn, index)
+            finally:
+                conn.close()
+        return {"enabled": True, "engine": index.engine, "size": len(index), **changes}
+
+    def _schedule_vector_index_sync(self) -> None:
+        """Run sync_vector_index in a background thread unless one is running."""
+        if self._vector_index_sync_lock.locked():
+            return
+
+        def run():
+            try:
+                self.sync_vector_index()
+            except Exception as e:
+                print(f"Failed to sync vector index: {e}", file=sys.stderr)
+
+        threading.Thread(target=run, name="vector-memory-index-sync", daemon=True).start()
+
+    def _vector_index_current(self, conn: sqlite3.Connection) -> bool:
+        """
+        Check that the vector index reflects the database.
+
+        A stale index is not used; a background sync is started instead.
+        """
+        index = self._vector_index
+        if index is None:
+            return False
+        if index.version == self._vector_index_version(conn):
+            return True
+        self._schedule_vector_index_sync()
+        return False
+
+    def _update_vector_index(
+        self,
+        conn: sqlite3.Connection,
+        added: List[Tuple[int, Any]] = (),
+        removed: List[int] = ()
+    ) -> None:
         """
-        results = conn.execute("SELECT tag, embedding FROM canonical_tags").fetchall()
+        Mirror a committed write into the vector index.
+
+        The index stays current only if the database moved exactly by this
+        write; interleaved writes from elsewhere leave it stale until the
+        next sync.
+
+        Args:
+            conn: Database connection (after commit)
+            added: (memory ID, embedding) pairs inserted
+            removed: Memory IDs deleted
+        """
+        index = self._vector_index
+        if index is None:
+            return
+
+        try:
+            expected = None
+            if index.version is not None:
+                seq, count = index.version
+                if added:
+                    seq = max(seq, max(memory_id for memory_id, _ in added))
+                expected = (seq, count + len(added) - len(removed))
+
+            if added:
+                index.add([memory_id for memory_id, _ in added], [embedding for _, embedding in added])
+            if removed:
+                index.remove(removed)
+
+            if self._vector_index_version(conn) == expected:
+                index.version = expected
+        except Exception as e:
+            print(f"Failed to update vector index: {e}", file=sys.stderr)
+            index.version = None
+
+    def _init_memory_counts(self, conn: sqlite3.Connection) -> None:
+        """
+        Create memory_counts (total and per-category row counts) with the
+        triggers that keep it in sync with memory_metadata, and backfill it
+        for existing databases.
+
+        Args:
+            conn: Database connection
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'memory_counts'"
+        ).fetchone()
+        if exists:
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS memory_counts (
+                scope TEXT NOT NULL,  -- 'total' or 'category'
+                key TEXT NOT NULL,    -- '' for total, category name otherwise
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (scope, key)
+            ) WITHOUT ROWID
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS memory_counts_insert AFTER INSERT ON memory_metadata
+            BEGIN
+                INSERT INTO memory_counts (scope, key, count) VALUES ('total', '', 1), ('category', NEW.category, 1)
+                ON CONFLICT (scope, key) DO UPDATE SET count = count + 1;
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS memory_counts_delete AFTER DELETE ON memory_metadata
+            BEGIN
+                UPDATE memory_counts SET count = count - 1
+                WHERE (scope = 'total' AND key = '') OR (scope = 'category' AND key = OLD.category);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS memory_counts_update AFTER UPDATE OF category ON memory_metadata
+            WHEN OLD.category IS NOT NEW.category
+            BEGIN
+                UPDATE memory_counts SET count = count - 1 WHERE scope = 'category' AND key = OLD.category;
+                INSERT INTO memory_counts (scope, key, count) VALUES ('category', NEW.category, 1)
+                ON CONFLICT (scope, key) DO UPDATE SET count = count + 1;
+            END
+        """)
+        conn.execute("DELETE FROM memory_counts")
+        conn.execute("""
+            INSERT INTO memory_counts (scope, key, count)
+            SELECT 'total', '', COUNT(*) FROM memory_metadata
+            UNION ALL
+            SELECT 'category', category, COUNT(*) FROM memory_metadata GROUP BY category
+        """)
+        conn.commit()
+
+    def _init_memory_tags(self, conn: sqlite3.Connection) -> None:
+        """
+        Create memory_tags (one row per memory/tag pair, indexed both ways)
+        with the triggers that mirror memory_metadata.tags into it, and
+        backfill it for existing databases.
+
+        memory_metadata.tags stays the source of truth (it keeps tag order);
+        memory_tags serves tag filters, listings and usage counts.
+
+        Args:
+            conn: Database connection
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'memory_tags'"
+        ).fetchone()
+        if exists:
+            return
+
+        # Malformed JSON is treated as no tags instead of failing the write
+        tags_json = "CASE WHEN json_valid({0}) THEN {0} ELSE '[]' END"
+
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS memory_tags (
+                memory_id INTEGER NOT NULL,
+                tag TEXT NOT NULL,
+                PRIMARY KEY (memory_id, tag)
+            ) WITHOUT ROWID
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_memory_tags_tag ON memory_tags(tag, memory_id)")
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS memory_tags_insert AFTER INSERT ON memory_metadata
+            BEGIN
+                INSERT OR IGNORE INTO memory_tags (memory_id, tag)
+                SELECT NEW.id, value FROM json_each({tags_json.format('NEW.tags')});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS memory_tags_update AFTER UPDATE OF tags ON memory_metadata
+            BEGIN
+                DELETE FROM memory_tags WHERE memory_id = OLD.id;
+                INSERT OR IGNORE INTO memory_tags (memory_id, tag)
+                SELECT NEW.id, value FROM json_each({tags_json.format('NEW.tags')});
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS memory_tags_delete AFTER DELETE ON memory_metadata
+            BEGIN
+                DELETE FROM memory_tags WHERE memory_id = OLD.id;
+            END
+        """)
+        conn.execute(f"""
+            INSERT OR IGNORE INTO memory_tags (memory_id, tag)
+            SELECT m.id, j.value
+            FROM memory_metadata m, json_each({tags_json.format('m.tags')}) j
+        """)
+        conn.commit()
+
+    def _init_memory_fts(self, conn: sqlite3.Connection) -> None:
+        """
+        Create the memory_fts FTS5 index over memory_metadata.content with
+        the triggers that keep it in sync, and build it for existing databases.
+
+        memory_fts is an external-content table: it stores only the inverted
+        index and reads content from memory_metadata.
+
+        Args:
+            conn: Database connection
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'memory_fts'"
+        ).fetchone()
+        if exists:
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS memory_fts USING fts5(
+                content,
+                content = 'memory_metadata',
+                content_rowid = 'id',
+                tokenize = 'unicode61 remove_diacritics 2'
+            )
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS memory_fts_insert AFTER INSERT ON memory_metadata
+            BEGIN
+                INSERT INTO memory_fts (rowid, content) VALUES (NEW.id, NEW.content);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS memory_fts_update AFTER UPDATE OF content ON memory_metadata
+            BEGIN
+                INSERT INTO memory_fts (memory_fts, rowid, content) VALUES ('delete', OLD.id, OLD.content);
+                INSERT INTO memory_fts (rowid, content) VALUES (NEW.id, NEW.content);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS memory_fts_delete AFTER DELETE ON memory_metadata
+            BEGIN
+                INSERT INTO memory_fts (memory_fts, rowid, content) VALUES ('delete', OLD.id, OLD.content);
+            END
+        """)
+        conn.execute("INSERT INTO memory_fts (memory_fts) VALUES ('rebuild')")
+        conn.commit()
+
+    def _memory_ids_with_tags(self, conn: sqlite3.Connection, tags: List[str]) -> List[int]:
+        """
+        IDs of memories carrying any of the tags (memory_tags index lookup).
+
+        Args:
+            conn: Database connection
+            tags: Tags to look up
+
+        Returns:
+            Sorted distinct memory IDs
+        """
+        memory_ids = set()
+        for start in range(0, len(tags), 500):
+            chunk = tags[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            memory_ids.update(row[0] for row in conn.execute(
+                f"SELECT memory_id FROM memory_tags WHERE tag IN ({placeholders})", chunk
+            ))
+        return sorted(memory_ids)
+
+    def _count_memories(self, conn: sqlite3.Connection, category: Optional[str] = None) -> int:
+        """
+        Read the maintained memory count (no table scan).
+
+        Args:
+            conn: Database connection
+            category: Count one category instead of all memories
+
+        Returns:
+            Number of memories
+        """
+        scope, key = ("category", category) if category else ("total", "")
+        row = conn.execute(
+            "SELECT count FROM memory_counts WHERE scope = ? AND key = ?", (scope, key)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _search_total(
+        self,
+        conn: sqlite3.Connection,
+        category: Optional[str],
+        tags: Optional[List[str]],
+        include_total: bool
+    ) -> Optional[int]:
+        """
+        Total number of memories matching the search filters.
+
+        Category-only filters are answered from memory_counts. Tag filters
+        need a count over memory_tags, which only runs when include_total
+        is set; otherwise the total is unknown (None).
+
+        Args:
+            conn: Database connection
+            category: Optional category filter
+            tags: Optional tags filter
+            include_total: Compute the exact total for tag filters
+
+        Returns:
+            Total count, or None if not computed
+        """
+        if not tags:
+            return self._count_memories(conn, category)
+        if not include_total:
+            return None
+
+        filter_sql, filter_params = self._build_search_filters(category, tags)
+        return conn.execute(
+            f"SELECT COUNT(*) FROM memory_metadata m WHERE {filter_sql}", filter_params
+        ).fetchone()[0]
+
+    def _insert_vector(
+        self, conn: sqlite3.Connection, memory_id: int, category: str, embedding: List[float]
+    ) -> None:
+        """
+        Insert a memory embedding into the vector index.
+
+        Args:
+            conn: Database connection
+            memory_id: Memory ID (used as vec0 rowid)
+            category: Memory category (vec0 partition key)
+            embedding: Embedding vector
+        """
+        self._insert_vectors(conn, [(memory_id, category, embedding)])
+
+    def _insert_vectors(
+        self, conn: sqlite3.Connection, rows: List[Tuple[int, str, Any]]
+    ) -> None:
+        """
+        Insert memory embeddings into the vector index (quantized if configured).
+
+        Args:
+            conn: Database connection
+            rows: (memory ID, category, embedding) tuples
+        """
+        rows = [
+            (memory_id, category, sqlite_vec.serialize_float32(embedding))
+            for memory_id, category, embedding in rows
+        ]
+        conn.executemany(
+            "INSERT INTO memory_vectors (rowid, category, embedding) "
+            f"VALUES (?, ?, {self._quantize_sql(self.vector_storage, '?')})",
+            rows
+        )
+        if self.vector_storage != "float":
+            conn.executemany(
+                "INSERT OR REPLACE INTO memory_vectors_float (id, embedding) VALUES (?, ?)",
+                [(memory_id, blob) for memory_id, _, blob in rows]
+            )
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """
+        Get pooled SQLite connection with sqlite-vec loaded.
+
+        Calling close() on the returned connection returns it to the pool.
+        """
+        return self._pool.acquire()
+
+    def close(self) -> None:
+        """Flush pending access counts and close pooled connections (call on server shutdown)."""
+        index = self._vector_index
+        if index is not None and index.version is not None and index.version != self._vector_index_saved_version:
+            try:
+                index.save(self._vector_index_path)
+                self._vector_index_saved_version = index.version
+            except Exception as e:
+                print(f"Failed to save vector index: {e}", file=sys.stderr)
+
+        try:
+            if self._access_tracker is not None:
+                self._access_tracker.close()
+        finally:
+            self._pool.close()
+        cache = self._embedding_model.cache if self._embedding_model is not None else None
+        if cache is not None:
+            cache.close()
+        batcher = self._embedding_model.batcher if self._embedding_model is not None else None
+        if batcher is not None:
+            batcher.close(timeout=5)
+
+    def _vector_index_stats(self, conn: sqlite3.Connection) -> Optional[Dict[str, Any]]:
+        """Engine, size and freshness of the vector index (None when disabled)."""
+        index = self._vector_index
+        if index is None:
+            return None
         return {
-            row[0]: np.frombuffer(row[1], dtype=np.float32).tolist()
-            for row in results
+            "engine": index.engine,
+            "size": len(index),
+            "current": index.version == self._vector_index_version(conn),
         }
 
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool usage counters."""
+        return self._pool.stats()
+
+    def get_embedding_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Get embedding cache hit/miss counters (None until the model is loaded)."""
+        cache = self._embedding_model.cache if self._embedding_model is not None else None
+        return cache.stats() if cache is not None else None
+
     def _add_canonical_tag(
         self, conn: sqlite3.Connection, tag: str, embedding: List[float]
     ) -> None:
         """
         Add a new canonical tag with frequency=1.
 
+        The shared tag index is not updated here: the caller adds the
+        transaction's new tags with self._tag_index.add() after commit.
+
         Args:
             conn: Database connection
             tag: Canonical tag string
@@ -442,7 +1327,8 @@ class VectorMemoryStore:
         return {row[0]: 1.0 / np.log(1 + row[1]) for row in results}
 
     def _normalize_tags_semantic(
-        self, tags: List[str], model: EmbeddingModel, conn: sqlite3.Connection
+        self, tags: List[str], model: EmbeddingModel, conn: sqlite3.Connection,
+        new_tags: CanonicalTagIndex
     ) -> List[str]:
         """
         Normalize tags using semantic similarity to canonical tags with guards.
@@ -461,6 +1347,8 @@ class VectorMemoryStore:
             tags: List of tags to normalize
             model: Embedding model
             conn: Database connection
+            new_tags: Canonical tags inserted by the current transaction;
+                new tags are appended here and matched like committed ones
 
         Returns:
             List of normalized canonical tags
@@ -468,11 +1356,18 @@ class VectorMemoryStore:
         if not tags:
             return []
 
-        # Load existing canonical tags from DB
-        canonical_tags = self._get_canonical_tags(conn)
+        # Bring the canonical-tag matrix up to date (no-op unless the table changed)
+        canonical_tags = self._tag_index
+        canonical_tags.sync(conn)
         normalized = []
         incremented = set()  # Track which tags were incremented in this batch
 
+        # Lowest similarity _can_merge_tags could accept (related threshold minus boost)
+        min_similarity = (
+            min(Config.TAG_SIMILARITY_THRESHOLD, Config.TAG_RELATED_THRESHOLD)
+            - Config.TAG_SUBSTRING_BOOST
+        )
+
         for tag in tags:
             if not tag or not tag.strip():
                 continue
@@ -480,7 +1375,7 @@ class VectorMemoryStore:
             tag_lower = tag.strip().lower()
 
             # Exact match in canonical tags
-            if tag_lower in canonical_tags:
+            if tag_lower in canonical_tags or tag_lower in new_tags:
                 if tag_lower not in normalized:
                     normalized.append(tag_lower)
                     # Increment frequency once per unique tag in this memory
@@ -493,20 +1388,19 @@ class VectorMemoryStore:
             tag_normalized = _normalize_tag_for_embedding(tag_lower)
             tag_embedding = model.encode_single(tag_normalized)
 
-            # Find best matching canonical tag (with guards)
+            # Find best matching canonical tag (with guards): one matrix-vector
+            # product, guards only for candidates, best similarity first
             best_match = None
-            best_similarity = 0.0
-
-            if canonical_tags:
-                canonical_tag_list = list(canonical_tags.keys())
-                similarities = model.batch_similarity(tag_normalized, canonical_tag_list)
 
-                for i, sim in enumerate(similarities):
-                    canonical_tag = canonical_tag_list[i]
-                    if _can_merge_tags(tag_normalized, _normalize_tag_for_embedding(canonical_tag), sim):
-                        if sim > best_similarity:
-                            best_similarity = sim
-                            best_match = canonical_tag
+            candidates = sorted(
+                canonical_tags.candidates(tag_embedding, min_similarity)
+                + new_tags.candidates(tag_embedding, min_similarity),
+                key=lambda candidate: -candidate[1]
+            )
+            for canonical_tag, sim in candidates:
+                if _can_merge_tags(tag_normalized, _normalize_tag_for_embedding(canonical_tag), sim):
+                    best_match = canonical_tag
+                    break
 
             if best_match:
                 # Found a mergeable match
@@ -517,54 +1411,79 @@ class VectorMemoryStore:
                         self._increment_tag_frequency(conn, best_match)
                         incremented.add(best_match)
             else:
-                # No match found -> add as new canonical tag (frequency=1 by default)
+                # No match found -> add as new canonical tag (frequency=1 by default);
+                # later tags in this transaction match it through new_tags
                 self._add_canonical_tag(conn, tag_lower, tag_embedding)
-                # Update in-memory cache for subsequent tags in this batch
-                canonical_tags[tag_lower] = tag_embedding
+                new_tags.append(tag_lower, tag_embedding)
                 if tag_lower not in normalized:
                     normalized.append(tag_lower)
 
         return normalized
 
-    def _get_canonical_categories_embeddings(self, model: EmbeddingModel) -> Dict[str, List[float]]:
+    def _get_canonical_categories_embeddings(
+        self, model: EmbeddingModel, conn: Optional[sqlite3.Connection] = None
+    ) -> Tuple[List[str], np.ndarray]:
         """
-        Get pre-computed embeddings for all canonical categories.
-        
-        Computes once and caches for subsequent calls.
-        
+        Get embeddings of all canonical categories as one matrix.
+
+        Loaded from the category_embeddings table, keyed by model name and
+        label; missing or relabelled categories are embedded in one batch
+        and stored, so later processes only read the table.
+
         Args:
             model: Embedding model
-            
+            conn: Connection the caller already holds; new rows are written
+                in its transaction and committed by the caller. Without it a
+                pooled connection is taken (and committed) here.
+
         Returns:
-            Dict mapping canonical category to embedding
+            (categories, matrix) with one normalized row per category
         """
-        if VectorMemoryStore._canonical_categories_embeddings is None:
-            categories = Config.MEMORY_CATEGORIES
-            embeddings = {}
-            
-            # Create human-readable forms for better embedding
-            category_labels = {
-                'code-solution': 'code solution implementation',
-                'bug-fix': 'bug fix error correction',
-                'architecture': 'architecture design structure',
-                'learning': 'learning knowledge discovery',
-                'tool-usage': 'tool usage utility',
-                'debugging': 'debugging troubleshooting diagnosis',
-                'performance': 'performance optimization speed',
-                'security': 'security vulnerability protection',
-                'other': 'other miscellaneous general'
+        model_name = getattr(model, "model_name", None) or self.embedding_model_name
+        cached = self._category_embeddings
+        if cached is not None and cached[0] == model_name:
+            return cached[1], cached[2]
+
+        categories = list(Config.MEMORY_CATEGORIES)
+        labels = [CATEGORY_LABELS.get(cat, cat.replace('-', ' ')) for cat in categories]
+
+        owned = conn is None
+        if owned:
+            conn = self._get_connection()
+        try:
+            stored = {
+                category: (label, embedding)
+                for category, label, embedding in conn.execute(
+                    "SELECT category, label, embedding FROM category_embeddings WHERE model = ?", (model_name,)
+                )
             }
-            
-            for cat in categories:
-                label = category_labels.get(cat, cat.replace('-', ' '))
-                embeddings[cat] = model.encode_single(label)
-            
-            VectorMemoryStore._canonical_categories_embeddings = embeddings
-        
-        return VectorMemoryStore._canonical_categories_embeddings
+            missing = [
+                i for i, (cat, label) in enumerate(zip(categories, labels))
+                if stored.get(cat, (None,))[0] != label
+            ]
+            if missing:
+                embeddings = np.asarray(model.encode([labels[i] for i in missing]), dtype=np.float32)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO category_embeddings (model, category, label, embedding) VALUES (?, ?, ?, ?)",
+                    [
+                        (model_name, categories[i], labels[i], embedding.tobytes())
+                        for i, embedding in zip(missing, embeddings)
+                    ]
+                )
+                if owned:
+                    conn.commit()
+                for i, embedding in zip(missing, embeddings):
+                    stored[categories[i]] = (labels[i], embedding.tobytes())
+        finally:
+            if owned:
+                conn.close()
+
+        matrix = np.stack([np.frombuffer(stored[cat][1], dtype=np.float32) for cat in categories])
+        self._category_embeddings = (model_name, categories, matrix)
+        return categories, matrix
 
     def _normalize_category_semantic(
-        self, category: str, model: EmbeddingModel
+        self, category: str, model: EmbeddingModel, conn: Optional[sqlite3.Connection] = None
     ) -> str:
         """
         Normalize category using semantic similarity to canonical categories.
@@ -577,6 +1496,7 @@ class VectorMemoryStore:
         Args:
             category: Input category string
             model: Embedding model
+            conn: Optional connection the caller already holds
             
         Returns:
             Canonical category string
@@ -613,15 +1533,10 @@ class VectorMemoryStore:
         if len(category_lower) < 5 and category_lower in SHORT_CATEGORY_ALIASES:
             return SHORT_CATEGORY_ALIASES[category_lower]
         
-        # Get canonical category embeddings
-        canonical_embeddings = self._get_canonical_categories_embeddings(model)
-        
-        # Compute similarity with all canonical categories
-        category_embedding = model.encode_single(category_lower)
-        
-        similarities = {}
-        for canonical_cat, canonical_emb in canonical_embeddings.items():
-            similarities[canonical_cat] = float(np.dot(category_embedding, canonical_emb))
+        # Similarity with all canonical categories: one matrix-vector product
+        categories, matrix = self._get_canonical_categories_embeddings(model, conn)
+        category_embedding = np.asarray(model.encode_single(category_lower), dtype=np.float32)
+        similarities = dict(zip(categories, (matrix @ category_embedding).tolist()))
         
         # Find best match (excluding "other")
         best_match = None
@@ -647,32 +1562,42 @@ class VectorMemoryStore:
         content: str,
         category: str,
         tags: List[str],
-        embedding_model: Optional[EmbeddingModel] = None
+        embedding_model: Optional[EmbeddingModel] = None,
+        dedupe_threshold: Optional[float] = None,
+        dedupe_action: str = "merge"
     ) -> Dict[str, Any]:
         """
         Store a new memory with vector embedding.
 
+        Cheap checks run first: a duplicate costs one indexed hash lookup
+        and a full store one counter read, before any model inference
+        (category, tags, content) happens.
+
+        With dedupe_threshold, the nearest stored memory (KNN, k = 1) is
+        looked up after encoding; if it is at least that similar, the new
+        memory is not stored and is either merged into it (tags unioned,
+        access_count bumped) or rejected.
+
         Args:
             content: Memory content
             category: Memory category
             tags: List of tags
-            embedding_model: Optional pre-loaded embedding model (for async contexts)
+            embedding_model: Optional pre-loaded embedding model (loaded
+                lazily, only for new memories, when omitted)
+            dedupe_threshold: Optional cosine similarity for near-duplicates
+            dedupe_action: "merge" (default) or "reject"
 
         Returns:
-            Dict with operation result and metadata
+            Dict with operation result, metadata and per-stage timings_ms
         """
         # Input validation
         content = sanitize_input(content)
         tags = validate_tags(tags)
+        if dedupe_threshold is not None:
+            dedupe_threshold = self._validate_dedupe(dedupe_threshold, dedupe_action)
 
         self._ensure_db_initialized_sync()
-        # Use provided model or fall back to sync loading
-        model = embedding_model or self._get_embedding_model_sync()
-        
-        # Semantic category normalization
-        category = self._normalize_category_semantic(category, model)
-
-        # Check for duplicates
+        timer = _StageTimer()
         content_hash = generate_content_hash(content)
         
         try:
@@ -686,31 +1611,59 @@ class VectorMemoryStore:
                 "SELECT id FROM memory_metadata WHERE content_hash = ?",
                 (content_hash,)
             ).fetchone()
+            timer.lap("hash_check")
             
             if existing:
                 return {
                     "success": False,
                     "message": "Memory already exists",
-                    "memory_id": existing[0]
+                    "memory_id": existing[0],
+                    "timings_ms": timer.result()
                 }
             
             # Check memory limit
-            count = conn.execute("SELECT COUNT(*) FROM memory_metadata").fetchone()[0]
+            count = self._count_memories(conn)
+            timer.lap("limit_check")
             if count >= self.memory_limit:
                 return {
                     "success": False,
                     "message": f"Memory limit reached ({count}/{self.memory_limit}). Use clear_old_memories to free space.",
-                    "memory_id": None
+                    "memory_id": None,
+                    "timings_ms": timer.result()
                 }
 
-            # Semantic tag normalization (after validation, before storage)
-            tags = self._normalize_tags_semantic(tags, model, conn)
+            # Use provided model or fall back to sync loading
+            model = embedding_model or self._get_embedding_model_sync()
+
+            # Semantic category and tag normalization
+            category = self._normalize_category_semantic(category, model, conn)
+            timer.lap("category")
+            new_tags = CanonicalTagIndex()  # Added to the shared index after commit
+            tags = self._normalize_tags_semantic(tags, model, conn, new_tags)
+            timer.lap("tags")
             
             # Generate embedding
             embedding = model.encode_single(content)
-            
-            # Store metadata
+            timer.lap("encode")
+
             now = datetime.now(timezone.utc).isoformat()
+            if dedupe_threshold is not None:
+                nearest = self._nearest_memory(conn, embedding)
+                timer.lap("dedupe")
+                if nearest is not None and nearest[2] >= dedupe_threshold:
+                    result = self._near_duplicate(conn, *nearest, tags, dedupe_action, now)
+                    if dedupe_action == "merge":
+                        conn.commit()
+                        self._tag_index.add(zip(new_tags.tags, new_tags.matrix), conn)
+                        self._stats_cache = None
+                    else:
+                        # Drop canonical tags registered for the rejected memory
+                        conn.rollback()
+                    timer.lap("write")
+                    result["timings_ms"] = timer.result()
+                    return result
+
+            # Store metadata
             cursor = conn.execute("""
                 INSERT INTO memory_metadata (content_hash, content, category, tags, created_at, updated_at)
                 VALUES (?, ?, ?, ?, ?, ?)
@@ -718,32 +1671,531 @@ class VectorMemoryStore:
             
             memory_id = cursor.lastrowid
             
-            # Store vector using sqlite-vec serialization
-            embedding_blob = sqlite_vec.serialize_float32(embedding)
-            conn.execute(
-                "INSERT INTO memory_vectors (rowid, embedding) VALUES (?, ?)",
-                (memory_id, embedding_blob)
-            )
+            # Store vector in the category partition
+            self._insert_vector(conn, memory_id, category, embedding)
             
             conn.commit()
+            self._tag_index.add(zip(new_tags.tags, new_tags.matrix), conn)
+            self._stats_cache = None
+            self._update_vector_index(conn, added=[(memory_id, embedding)])
+            timer.lap("write")
             
             return {
                 "success": True,
-                "memory_id": memory_id,
-                "content_preview": content[:100] + "..." if len(content) > 100 else content,
-                "category": category,
-                "tags": tags,
-                "created_at": now
+                "memory_id": memory_id,
+                "content_preview": content[:100] + "..." if len(content) > 100 else content,
+                "category": category,
+                "tags": tags,
+                "created_at": now,
+                "timings_ms": timer.result()
+            }
+            
+        except SecurityError as e:
+            conn.rollback()
+            raise e
+        except Exception as e:
+            conn.rollback()
+            raise RuntimeError(f"Failed to store memory: {e}")
+        finally:
+            conn.close()
+
+    def store_memories(
+        self,
+        items: List[Dict[str, Any]],
+        embedding_model: Optional[EmbeddingModel] = None,
+        dedupe_threshold: Optional[float] = None,
+        dedupe_action: str = "merge"
+    ) -> Dict[str, Any]:
+        """
+        Store many memories with one batched encode and one transaction.
+
+        Every item is validated up front; invalid items, duplicates (of
+        stored memories or of earlier items in the batch) and items over
+        the memory limit are reported individually and skipped. These
+        checks run before any model inference, so a batch of duplicates
+        never loads or runs the model. With dedupe_threshold, near-duplicates
+        are handled as in store_memory (see _dedupe_batch).
+
+        Args:
+            items: List of dicts with "content" and optional "category" and "tags"
+            embedding_model: Optional pre-loaded embedding model (loaded
+                lazily, only if something is stored, when omitted)
+            dedupe_threshold: Optional cosine similarity for near-duplicates
+            dedupe_action: "merge" (default) or "reject"
+
+        Returns:
+            Dict with counts, per-item results (in input order) and
+            per-stage timings_ms
+
+        Raises:
+            SecurityError: If items is not a list or exceeds MAX_MEMORIES_PER_BATCH
+        """
+        if not isinstance(items, list):
+            raise SecurityError("Items must be a list")
+        if len(items) > Config.MAX_MEMORIES_PER_BATCH:
+            raise SecurityError(
+                f"Too many items ({len(items)}). Maximum per batch: {Config.MAX_MEMORIES_PER_BATCH}"
+            )
+
+        if dedupe_threshold is not None:
+            dedupe_threshold = self._validate_dedupe(dedupe_threshold, dedupe_action)
+
+        self._ensure_db_initialized_sync()
+        timer = _StageTimer()
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        pending = []  # (index, content, content_hash, raw category, tags)
+        batch_hashes: Dict[str, int] = {}
+
+        # Validation and in-batch dedup
+        for i, item in enumerate(items):
+            try:
+                if not isinstance(item, dict):
+                    raise SecurityError("Item must be an object with a content field")
+                content = sanitize_input(item.get("content"))
+                tags = validate_tags(item.get("tags") or [])
+            except SecurityError as e:
+                results[i] = {
+                    "index": i,
+                    "success": False,
+                    "error": "Security validation failed",
+                    "message": str(e)
+                }
+                continue
+
+            content_hash = generate_content_hash(content)
+            if content_hash in batch_hashes:
+                results[i] = {
+                    "index": i,
+                    "success": False,
+                    "message": f"Duplicate of item {batch_hashes[content_hash]} in this batch",
+                    "memory_id": None
+                }
+                continue
+            batch_hashes[content_hash] = i
+            pending.append((i, content, content_hash, item.get("category", "other"), tags))
+        timer.lap("validate")
+
+        try:
+            conn = self._get_connection()
+        except Exception as e:
+            raise RuntimeError(f"Failed to store memories: {e}")
+
+        try:
+            new_tags = CanonicalTagIndex()  # Added to the shared index after commit
+
+            # Duplicate check for the whole batch
+            existing = self._find_existing_hashes(conn, [p[2] for p in pending])
+            to_store = []
+            for entry in pending:
+                if entry[2] in existing:
+                    results[entry[0]] = {
+                        "index": entry[0],
+                        "success": False,
+                        "message": "Memory already exists",
+                        "memory_id": existing[entry[2]]
+                    }
+                else:
+                    to_store.append(entry)
+            timer.lap("hash_check")
+
+            # Memory limit: store what fits, report the rest
+            count = self._count_memories(conn)
+            capacity = max(0, self.memory_limit - count)
+            for entry in to_store[capacity:]:
+                results[entry[0]] = {
+                    "index": entry[0],
+                    "success": False,
+                    "message": f"Memory limit reached ({self.memory_limit}). Use clear_old_memories to free space.",
+                    "memory_id": None
+                }
+            to_store = to_store[:capacity]
+            timer.lap("limit_check")
+
+            if to_store:
+                model = embedding_model or self._get_embedding_model_sync()
+
+                # Semantic category normalization (once per distinct input)
+                categories: Dict[Any, str] = {}
+                for entry in to_store:
+                    key = entry[3] if isinstance(entry[3], str) else None
+                    if key not in categories:
+                        categories[key] = self._normalize_category_semantic(entry[3], model, conn)
+                timer.lap("category")
+
+                # Semantic tag normalization (shares the canonical-tag matrix)
+                to_store = [
+                    (
+                        i, content, content_hash,
+                        categories[category if isinstance(category, str) else None],
+                        self._normalize_tags_semantic(tags, model, conn, new_tags)
+                    )
+                    for i, content, content_hash, category, tags in to_store
+                ]
+                timer.lap("tags")
+
+                # One encode call for every content
+                embeddings = model.encode([entry[1] for entry in to_store], normalize=True)
+                timer.lap("encode")
+
+                now = datetime.now(timezone.utc).isoformat()
+                batch_duplicates: Dict[int, int] = {}
+                if dedupe_threshold is not None:
+                    to_store, embeddings, batch_duplicates = self._dedupe_batch(
+                        conn, to_store, embeddings, dedupe_threshold, dedupe_action, results, now
+                    )
+                    timer.lap("dedupe")
+
+                conn.executemany("""
+                    INSERT INTO memory_metadata (content_hash, content, category, tags, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, [
+                    (content_hash, content, category, json.dumps(tags), now, now)
+                    for _, content, content_hash, category, tags in to_store
+                ])
+
+                ids = self._find_existing_hashes(conn, [entry[2] for entry in to_store])
+                vector_rows = [
+                    (ids[content_hash], category, embedding)
+                    for (_, _, content_hash, category, _), embedding in zip(to_store, embeddings)
+                ]
+                self._insert_vectors(conn, vector_rows)
+
+                for i, content, content_hash, category, tags in to_store:
+                    results[i] = {
+                        "index": i,
+                        "success": True,
+                        "memory_id": ids[content_hash],
+                        "content_preview": content[:100] + "..." if len(content) > 100 else content,
+                        "category": category,
+                        "tags": tags,
+                        "created_at": now
+                    }
+                for i, item_index in batch_duplicates.items():
+                    results[i]["memory_id"] = results[item_index]["memory_id"]
+
+            conn.commit()
+            self._tag_index.add(zip(new_tags.tags, new_tags.matrix), conn)
+            self._stats_cache = None
+            if to_store:
+                self._update_vector_index(
+                    conn, added=[(memory_id, embedding) for memory_id, _, embedding in vector_rows]
+                )
+            timer.lap("write")
+
+        except Exception as e:
+            conn.rollback()
+            raise RuntimeError(f"Failed to store memories: {e}")
+        finally:
+            conn.close()
+
+        stored = sum(1 for r in results if r["success"])
+        return {
+            "success": True,
+            "stored": stored,
+            "skipped": len(results) - stored,
+            "merged": sum(1 for r in results if r.get("action") == "merged"),
+            "results": results,
+            "timings_ms": timer.result()
+        }
+
+    @staticmethod
+    def _validate_dedupe(threshold: float, action: str) -> float:
+        """Validate dedupe_threshold and dedupe_action; returns the threshold."""
+        if action not in Config.DEDUPE_ACTIONS:
+            raise SecurityError(f"dedupe_action must be one of: {', '.join(Config.DEDUPE_ACTIONS)}")
+        return validate_similarity_threshold(threshold)
+
+    def _nearest_memory(
+        self, conn: sqlite3.Connection, embedding: Any
+    ) -> Optional[Tuple[int, List[str], float]]:
+        """
+        Find the stored memory most similar to an embedding (KNN, k = 1).
+
+        Args:
+            conn: Database connection
+            embedding: Normalized embedding
+
+        Returns:
+            (memory ID, its tags, cosine similarity), or None if the store is empty
+        """
+        rows = self._search_knn(conn, sqlite_vec.serialize_float32(embedding), 1, 0)
+        if not rows:
+            return None
+        return rows[0][0], json.loads(rows[0][3]) if rows[0][3] else [], 1 - rows[0][-1]
+
+    def _near_duplicate(
+        self,
+        conn: sqlite3.Connection,
+        memory_id: int,
+        existing_tags: List[str],
+        similarity: float,
+        tags: List[str],
+        action: str,
+        now: str
+    ) -> Dict[str, Any]:
+        """
+        Handle a new memory too similar to a stored one (not committed).
+
+        "merge" unions the new tags into the stored memory and counts the
+        attempt as an access; "reject" leaves it unchanged.
+
+        Args:
+            conn: Database connection
+            memory_id: ID of the stored near-duplicate
+            existing_tags: Its current tags
+            similarity: Cosine similarity between the two
+            tags: Normalized tags of the new memory
+            action: "merge" or "reject"
+            now: Update timestamp
+
+        Returns:
+            Result dict for the new memory
+        """
+        result = {
+            "success": False,
+            "action": "merged" if action == "merge" else "rejected",
+            "memory_id": memory_id,
+            "similarity": round(similarity, 4)
+        }
+        if action == "merge":
+            merged_tags = list(dict.fromkeys(existing_tags + tags))[:Config.MAX_TAGS_PER_MEMORY]
+            conn.execute(
+                "UPDATE memory_metadata SET tags = ?, access_count = access_count + 1, updated_at = ? WHERE id = ?",
+                (json.dumps(merged_tags), now, memory_id)
+            )
+            result["message"] = f"Merged into near-duplicate memory {memory_id}"
+            result["tags"] = merged_tags
+        else:
+            result["message"] = f"Near-duplicate of memory {memory_id}"
+        return result
+
+    def _dedupe_batch(
+        self,
+        conn: sqlite3.Connection,
+        entries: List[tuple],
+        embeddings: np.ndarray,
+        threshold: float,
+        action: str,
+        results: List[Optional[Dict[str, Any]]],
+        now: str
+    ) -> Tuple[List[tuple], np.ndarray, Dict[int, int]]:
+        """
+        Drop near-duplicates from a batch about to be stored.
+
+        Each item is compared with its nearest stored memory (KNN, k = 1),
+        then with the items kept before it (one matrix-vector product).
+        Near a stored memory it is merged or rejected as in store_memory;
+        near an earlier item, "merge" adds its tags to that item.
+
+        Args:
+            conn: Database connection
+            entries: (index, content, content hash, category, tags) to store
+            embeddings: Content embeddings, one row per entry
+            threshold: Minimum cosine similarity for a near-duplicate
+            action: "merge" or "reject"
+            results: Per-item results, filled in for dropped items
+            now: Update timestamp
+
+        Returns:
+            Tuple of (kept entries, their embeddings, input index of each item
+            dropped for an earlier item → input index of that item)
+        """
+        kept: List[list] = []
+        kept_rows: List[int] = []
+        batch_duplicates: Dict[int, int] = {}
+
+        for row, (entry, embedding) in enumerate(zip(entries, embeddings)):
+            i, tags = entry[0], entry[4]
+
+            nearest = self._nearest_memory(conn, embedding)
+            if nearest is not None and nearest[2] >= threshold:
+                results[i] = {"index": i, **self._near_duplicate(conn, *nearest, tags, action, now)}
+                continue
+
+            if kept_rows:
+                similarities = embeddings[kept_rows] @ embedding
+                best = int(np.argmax(similarities))
+                if similarities[best] >= threshold:
+                    target = kept[best]
+                    if action == "merge":
+                        target[4] = list(dict.fromkeys(target[4] + tags))[:Config.MAX_TAGS_PER_MEMORY]
+                    results[i] = {
+                        "index": i,
+                        "success": False,
+                        "action": "merged" if action == "merge" else "rejected",
+                        "memory_id": None,  # Set once the item is stored
+                        "similarity": round(float(similarities[best]), 4),
+                        "message": (
+                            f"Merged into item {target[0]} in this batch" if action == "merge"
+                            else f"Near-duplicate of item {target[0]} in this batch"
+                        )
+                    }
+                    batch_duplicates[i] = target[0]
+                    continue
+
+            kept.append(list(entry))
+            kept_rows.append(row)
+
+        return [tuple(entry) for entry in kept], embeddings[kept_rows], batch_duplicates
+
+    def find_duplicates(
+        self,
+        threshold: float = 0.95,
+        category: Optional[str] = None,
+        max_clusters: int = 20
+    ) -> Dict[str, Any]:
+        """
+        Cluster near-duplicate memories across the whole store (read-only).
+
+        The stored float32 vectors are compared in tiles of
+        Config.DUPLICATE_SCAN_BLOCK x Config.DUPLICATE_SCAN_BLOCK (one
+        matrix product each, upper triangle only); pairs at or above the
+        threshold are joined with union-find. No model is needed.
+
+        Args:
+            threshold: Minimum cosine similarity for a pair (default 0.95)
+            category: Optional category to restrict the scan to
+            max_clusters: Maximum clusters to return, largest first
+
+        Returns:
+            Dict with scan counts and clusters; members are ordered by
+            access_count, so the first is the one to keep
+        """
+        threshold = validate_similarity_threshold(threshold)
+        if not isinstance(max_clusters, int) or max_clusters < 1:
+            raise SecurityError("max_clusters must be a positive integer")
+        max_clusters = min(max_clusters, Config.DUPLICATE_MAX_CLUSTERS)
+        if category is not None:
+            # A typo must not silently widen the scan to the whole store
+            if not isinstance(category, str) or category.lower().strip() not in Config.MEMORY_CATEGORIES:
+                raise SecurityError(
+                    f"Unknown category {category!r}. Valid: {', '.join(Config.MEMORY_CATEGORIES)}"
+                )
+            category = category.lower().strip()
+
+        self._ensure_db_initialized_sync()
+        conn = self._get_connection()
+        try:
+            query = f"SELECT v.rowid, v.embedding FROM {self._float_vectors_table} v"
+            params: List[Any] = []
+            if category:
+                query += " WHERE v.rowid IN (SELECT id FROM memory_metadata WHERE category = ?)"
+                params.append(category)
+
+            ids: List[int] = []
+            blocks = []
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(10_000)
+                if not rows:
+                    break
+                ids.extend(row[0] for row in rows)
+                blocks.append(np.stack([np.frombuffer(row[1], dtype=np.float32) for row in rows]))
+            if not ids:
+                return {
+                    "success": True, "threshold": threshold, "memories_scanned": 0,
+                    "clusters_found": 0, "duplicate_memories": 0, "clusters": []
+                }
+            vectors = np.concatenate(blocks)
+
+            parent = list(range(len(ids)))
+
+            def find(x: int) -> int:
+                while parent[x] != x:
+                    parent[x] = parent[parent[x]]
+                    x = parent[x]
+                return x
+
+            block = Config.DUPLICATE_SCAN_BLOCK
+            for start in range(0, len(ids), block):
+                for other in range(start, len(ids), block):
+                    similarities = vectors[start:start + block] @ vectors[other:other + block].T
+                    if other == start:
+                        similarities = np.triu(similarities, k=1)
+                    for a, b in zip(*np.nonzero(similarities >= threshold)):
+                        root_a, root_b = find(start + int(a)), find(other + int(b))
+                        if root_a != root_b:
+                            parent[root_b] = root_a
+
+            groups: Dict[int, List[int]] = {}
+            for position in range(len(ids)):
+                groups.setdefault(find(position), []).append(position)
+            clusters = [members for members in groups.values() if len(members) > 1]
+
+            scored = []
+            for members in clusters:
+                similarities = vectors[members] @ vectors[members].T
+                np.fill_diagonal(similarities, -1.0)
+                scored.append((members, float(similarities.max())))
+            scored.sort(key=lambda item: (-len(item[0]), -item[1]))
+
+            shown = scored[:max_clusters]
+            shown_ids = [ids[position] for members, _ in shown for position in members]
+            metadata = {}
+            for start in range(0, len(shown_ids), 500):
+                chunk = shown_ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for row in conn.execute(
+                    f"SELECT id, content, category, access_count FROM memory_metadata WHERE id IN ({placeholders})",
+                    chunk
+                ):
+                    metadata[row[0]] = {
+                        "id": row[0],
+                        "content_preview": row[1][:100] + "..." if len(row[1]) > 100 else row[1],
+                        "category": row[2],
+                        "access_count": row[3]
+                    }
+
+            result_clusters = []
+            for members, similarity in shown:
+                memories = sorted(
+                    (metadata[ids[position]] for position in members if ids[position] in metadata),
+                    key=lambda memory: (-memory["access_count"], memory["id"])
+                )
+                result_clusters.append({
+                    "size": len(memories),
+                    "max_similarity": round(similarity, 4),
+                    "memories": memories
+                })
+
+            return {
+                "success": True,
+                "threshold": threshold,
+                "memories_scanned": len(ids),
+                "clusters_found": len(clusters),
+                "duplicate_memories": sum(len(members) for members in clusters),
+                "clusters": result_clusters
             }
-            
-        except SecurityError as e:
-            conn.rollback()
-            raise e
+        except SecurityError:
+            raise
         except Exception as e:
-            conn.rollback()
-            raise RuntimeError(f"Failed to store memory: {e}")
+            raise RuntimeError(f"Failed to find duplicates: {e}")
         finally:
             conn.close()
+
+    def _find_existing_hashes(self, conn: sqlite3.Connection, hashes: List[str]) -> Dict[str, int]:
+        """
+        Look up memory IDs by content hash.
+
+        Args:
+            conn: Database connection
+            hashes: Content hashes to look up
+
+        Returns:
+            Dict mapping found content hash to memory ID
+        """
+        found: Dict[str, int] = {}
+        chunk = 500  # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(hashes), chunk):
+            part = hashes[start:start + chunk]
+            placeholders = ",".join("?" * len(part))
+            rows = conn.execute(
+                f"SELECT content_hash, id FROM memory_metadata WHERE content_hash IN ({placeholders})",
+                part
+            ).fetchall()
+            found.update(rows)
+        return found
     
     def search_memories(
         self,
@@ -752,11 +2204,18 @@ class VectorMemoryStore:
         category: Optional[str] = None,
         offset: int = 0,
         tags: Optional[List[str]] = None,
-        embedding_model: Optional[EmbeddingModel] = None
-    ) -> Tuple[List[SearchResult], int]:
+        embedding_model: Optional[EmbeddingModel] = None,
+        include_total: bool = False,
+        mode: str = "vector"
+    ) -> Tuple[List[SearchResult], Optional[int]]:
         """
         Search memories using vector similarity.
 
+        In "hybrid" mode the vector ranking is fused with a BM25 keyword
+        ranking from memory_fts (reciprocal rank fusion), so exact
+        identifiers such as error codes and function names are found even
+        when the embedding misses them.
+
         Args:
             query: Search query
             limit: Maximum number of results
@@ -764,9 +2223,12 @@ class VectorMemoryStore:
             offset: Number of results to skip for pagination (default: 0)
             tags: Optional list of tags to filter by (matches if ANY tag is present)
             embedding_model: Optional pre-loaded embedding model (for async contexts)
+            include_total: Count matches exactly when filtering by tags (extra query)
+            mode: "vector" (default) or "hybrid"
 
         Returns:
-            Tuple of (List of SearchResult objects, total count matching filters)
+            Tuple of (List of SearchResult objects, total count matching filters
+            or None for tag filters without include_total)
         """
         query, limit, category = validate_search_params(query, limit, category)
 
@@ -776,6 +2238,11 @@ class VectorMemoryStore:
         if offset > 10000:
             raise ValueError("offset must not exceed 10000")
 
+        if mode not in Config.SEARCH_MODES:
+            raise ValueError(f"mode must be one of: {', '.join(Config.SEARCH_MODES)}")
+        if mode == "hybrid" and limit + offset > Config.KNN_MAX_K:
+            raise ValueError(f"hybrid search supports limit + offset up to {Config.KNN_MAX_K}")
+
         # Validate tags parameter
         if tags is not None:
             if not isinstance(tags, list):
@@ -797,94 +2264,539 @@ class VectorMemoryStore:
             # Generate query embedding
             query_embedding = model.encode_single(query)
             query_blob = sqlite_vec.serialize_float32(query_embedding)
+
+            # Total matching filters (without limit/offset)
+            total_count = self._search_total(conn, category, tags, include_total)
+
+            fts_query = self._fts_query(query) if mode == "hybrid" else None
+
+            # Native KNN when the page fits into sqlite-vec's k limit,
+            # exact distance scan for deep pagination
+            if fts_query:
+                results = self._search_hybrid(
+                    conn, query_blob, fts_query, limit, offset, category, tags
+                )
+            elif limit + offset <= Config.KNN_MAX_K:
+                results = self._search_knn(conn, query_blob, limit, offset, category, tags)
+            else:
+                results = self._search_exact(conn, query_blob, limit, offset, category, tags)
+
+            # Update access counts for returned memories
+            accesses = self._record_access(conn, Counter(row[0] for row in results))
+
+            return (self._format_search_results(results, accesses), total_count)
             
-            # Build search query
-            base_query = """
-                SELECT
-                    m.id, m.content, m.category, m.tags, m.created_at, m.updated_at, m.access_count, m.content_hash,
-                    vec_distance_cosine(v.embedding, ?) as distance
-                FROM memory_metadata m
-                JOIN memory_vectors v ON m.id = v.rowid
-            """
+        except SecurityError as e:
+            raise e
+        except Exception as e:
+            raise RuntimeError(f"Search failed: {e}")
+        finally:
+            conn.close()
 
-            params = [query_blob]
-            where_clauses = []
+    def search_many(
+        self,
+        queries: List[str],
+        limit: int = 10,
+        category: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        dedupe: bool = False,
+        embedding_model: Optional[EmbeddingModel] = None,
+        include_total: bool = False
+    ) -> Tuple[List[List[SearchResult]], Optional[int]]:
+        """
+        Run several searches with one encode pass and one connection.
 
-            # Add category filter
-            if category:
-                where_clauses.append("m.category = ?")
-                params.append(category)
+        All queries share the same filters, so the total count is computed
+        once. Access counts for the whole batch are written in a single
+        transaction.
 
-            # Add tags filter (match if ANY tag is present)
-            if tags:
-                # Build OR conditions for each tag using JSON search
-                tag_conditions = []
-                for tag in tags:
-                    # Use json_each to search within JSON array
-                    tag_conditions.append("EXISTS (SELECT 1 FROM json_each(m.tags) WHERE value = ?)")
-                    params.append(tag)
-                where_clauses.append(f"({' OR '.join(tag_conditions)})")
-
-            # Add WHERE clause if filters exist
-            if where_clauses:
-                base_query += " WHERE " + " AND ".join(where_clauses)
-
-            # Get total count of results matching filters (without limit/offset)
-            count_query = """
-                SELECT COUNT(DISTINCT m.id)
-                FROM memory_metadata m
-                JOIN memory_vectors v ON m.id = v.rowid
-            """
-            if where_clauses:
-                count_query += " WHERE " + " AND ".join(where_clauses)
+        Args:
+            queries: Search queries (max Config.MAX_QUERIES_PER_BATCH)
+            limit: Maximum number of results per query
+            category: Optional category filter
+            tags: Optional list of tags to filter by (matches if ANY tag is present)
+            dedupe: Drop memories already returned for an earlier query
+            embedding_model: Optional pre-loaded embedding model (for async contexts)
+            include_total: Count matches exactly when filtering by tags (extra query)
 
-            # Execute count query with same params (excluding query_blob, limit, offset)
-            count_params = params[1:] if len(params) > 1 else []  # Skip query_blob
-            total_count = conn.execute(count_query, count_params).fetchone()[0]
+        Returns:
+            Tuple of (results per query in input order, total count matching filters
+            or None for tag filters without include_total)
+        """
+        if not isinstance(queries, list) or not queries:
+            raise SecurityError("Queries must be a non-empty list")
+        if len(queries) > Config.MAX_QUERIES_PER_BATCH:
+            raise SecurityError(
+                f"Too many queries ({len(queries)}). Maximum per batch: {Config.MAX_QUERIES_PER_BATCH}"
+            )
 
-            # Add ORDER BY, LIMIT, and OFFSET
-            base_query += " ORDER BY distance LIMIT ? OFFSET ?"
-            params.append(limit)
-            params.append(offset)
+        validated = [validate_search_params(query, limit, category) for query in queries]
+        queries = [v[0] for v in validated]
+        limit, category = validated[0][1], validated[0][2]
+
+        if tags is not None:
+            if not isinstance(tags, list):
+                raise ValueError("tags must be a list of strings")
+            tags = [sanitize_input(str(tag)) for tag in tags if tag]
+            if not tags:
+                tags = None  # Empty list treated as no filter
+
+        self._ensure_db_initialized_sync()
+        model = embedding_model or self._get_embedding_model_sync()
+
+        try:
+            conn = self._get_connection()
+        except Exception as e:
+            raise RuntimeError(f"Failed to store memory: {e}")
+
+        try:
+            # One forward pass for every query
+            query_embeddings = model.encode(queries, normalize=True)
+
+            total_count = self._search_total(conn, category, tags, include_total)
+
+            seen = set()
+            per_query = []
+            for embedding in query_embeddings:
+                query_blob = sqlite_vec.serialize_float32(embedding)
+                # Over-fetch by the number of already returned memories so a
+                # deduplicated page can still be filled
+                k = min(limit + len(seen), Config.KNN_MAX_K) if dedupe else limit
+                rows = self._search_knn(conn, query_blob, k, 0, category, tags)
+                if dedupe:
+                    rows = [row for row in rows if row[0] not in seen][:limit]
+                    seen.update(row[0] for row in rows)
+                per_query.append(rows)
+
+            # Single write for the whole batch
+            accesses = self._record_access(conn, Counter(row[0] for rows in per_query for row in rows))
+
+            return ([self._format_search_results(rows, accesses) for rows in per_query], total_count)
 
-            results = conn.execute(base_query, params).fetchall()
-            
-            # Update access counts for returned memories
-            if results:
-                memory_ids = [str(r[0]) for r in results]
-                placeholders = ",".join(["?"] * len(memory_ids))
-                conn.execute(f"""
-                    UPDATE memory_metadata 
-                    SET access_count = access_count + 1,
-                        updated_at = ?
-                    WHERE id IN ({placeholders})
-                """, [datetime.now(timezone.utc).isoformat()] + memory_ids)
-                conn.commit()
-            
-            # Format results
-            search_results = []
-            for row in results:
-                memory = MemoryEntry.from_db_row(row[:-1])  # Exclude distance
-                memory.access_count += 1  # Include current access
-
-                distance = row[-1]
-                similarity = 1 - distance  # Convert distance to similarity
-
-                search_results.append(SearchResult(
-                    memory=memory,
-                    similarity=similarity,
-                    distance=distance
-                ))
-
-            return (search_results, total_count)
-            
         except SecurityError as e:
             raise e
         except Exception as e:
             raise RuntimeError(f"Search failed: {e}")
         finally:
             conn.close()
+
+    def _record_access(self, conn: sqlite3.Connection, accesses: Dict[int, int]) -> Dict[int, int]:
+        """
+        Count accesses for returned memories.
+
+        Deferred mode hands the increments to the AccessTracker; strict mode
+        writes them in one transaction right away.
+
+        Args:
+            conn: Database connection
+            accesses: Memory ID → number of times it was returned
+
+        Returns:
+            Memory ID → increment not yet reflected in the rows just read
+            (includes earlier unflushed accesses in deferred mode)
+        """
+        if not accesses:
+            return {}
+
+        if self._access_tracker is not None:
+            self._access_tracker.record(accesses)
+            return self._access_tracker.pending(accesses.keys())
+
+        self._write_access_counts(conn, accesses, datetime.now(timezone.utc).isoformat())
+        conn.commit()
+        return accesses
+
+    def _write_access_counts(
+        self, conn: sqlite3.Connection, accesses: Dict[int, int], updated_at: str
+    ) -> None:
+        """
+        Apply access-count increments (caller commits).
+
+        Args:
+            conn: Database connection
+            accesses: Memory ID → increment
+            updated_at: Timestamp stored in updated_at
+        """
+        # One UPDATE per distinct increment (usually just +1)
+        by_increment: Dict[int, List[int]] = {}
+        for memory_id, increment in accesses.items():
+            by_increment.setdefault(increment, []).append(memory_id)
+
+        for increment, memory_ids in by_increment.items():
+            for start in range(0, len(memory_ids), 500):
+                chunk = memory_ids[start:start + 500]
+                placeholders = ",".join(["?"] * len(chunk))
+                conn.execute(f"""
+                    UPDATE memory_metadata 
+                    SET access_count = access_count + ?,
+                        updated_at = ?
+                    WHERE id IN ({placeholders})
+                """, [increment, updated_at] + chunk)
+
+    def _flush_access_counts(self, accesses: Dict[int, int], updated_at: str) -> None:
+        """Write deferred access counts in one transaction (AccessTracker flush_fn)."""
+        conn = self._get_connection()
+        try:
+            self._write_access_counts(conn, accesses, updated_at)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def flush_access_counts(self) -> int:
+        """
+        Write pending deferred access counts now.
+
+        Returns:
+            Number of memories updated (0 in strict mode)
+        """
+        if self._access_tracker is None:
+            return 0
+        return self._access_tracker.flush()
+
+    def _format_search_results(
+        self, rows: List[tuple], accesses: Dict[int, int]
+    ) -> List[SearchResult]:
+        """
+        Convert search rows (metadata + distance) to SearchResult objects.
+
+        Args:
+            rows: Rows from _search_knn or _search_exact
+            accesses: Access increments just written (reflected in access_count)
+
+        Returns:
+            List of SearchResult
+        """
+        search_results = []
+        for row in rows:
+            memory = MemoryEntry.from_db_row(row[:-1])  # Exclude distance
+            memory.access_count += accesses.get(memory.id, 0)  # Include current access
+
+            distance = row[-1]
+            similarity = 1 - distance  # Convert distance to similarity
+
+            search_results.append(SearchResult(
+                memory=memory,
+                similarity=similarity,
+                distance=distance
+            ))
+        return search_results
     
+    def _build_search_filters(
+        self, category: Optional[str], tags: Optional[List[str]]
+    ) -> Tuple[str, List[Any]]:
+        """
+        Build WHERE clause for search filters on memory_metadata (alias m).
+
+        Args:
+            category: Optional category filter
+            tags: Optional tags filter (matches if ANY tag is present)
+
+        Returns:
+            Tuple of (SQL condition or empty string, parameters)
+        """
+        where_clauses = []
+        params: List[Any] = []
+
+        if category:
+            where_clauses.append("m.category = ?")
+            params.append(category)
+
+        if tags:
+            where_clauses.append(f"m.id IN ({self._tag_filter_subquery(tags)})")
+            params.extend(tags)
+
+        return " AND ".join(where_clauses), params
+
+    @staticmethod
+    def _tag_filter_subquery(tags: List[str]) -> str:
+        """IDs of memories with ANY of the tags (one parameter per tag)."""
+        placeholders = ",".join("?" * len(tags))
+        return f"SELECT memory_id FROM memory_tags WHERE tag IN ({placeholders})"
+
+    def _knn_cte(
+        self,
+        query_blob: bytes,
+        k: int,
+        category: Optional[str] = None,
+        tags: Optional[List[str]] = None
+    ) -> Tuple[str, List[Any]]:
+        """
+        Build the `knn` CTE: the k nearest memories as (rowid, cosine distance).
+
+        The category filter selects a single vec0 partition; the tag filter
+        is pushed into the KNN query as a rowid constraint. With quantized
+        storage the vec0 pass returns k * Config.QUANTIZED_OVERSAMPLE
+        candidates by quantized distance, which are reranked by exact cosine
+        distance against memory_vectors_float.
+
+        Args:
+            query_blob: Serialized float32 query embedding
+            k: Number of neighbours
+            category: Optional category filter (partition key)
+            tags: Optional tags filter (matches if ANY tag is present)
+
+        Returns:
+            Tuple of (CTE definitions without WITH, parameters)
+        """
+        knn_filters = []
+        filter_params: List[Any] = []
+        if category:
+            knn_filters.append("AND category = ?")
+            filter_params.append(category)
+        if tags:
+            knn_filters.append(f"AND rowid IN ({self._tag_filter_subquery(tags)})")
+            filter_params.extend(tags)
+        knn_filter = " ".join(knn_filters)
+
+        if self.vector_storage == "float":
+            return f"""
+            knn AS (
+                SELECT rowid, distance
+                FROM memory_vectors
+                WHERE embedding MATCH ? AND k = ?
+                {knn_filter}
+            )""", [query_blob, k] + filter_params
+
+        coarse_k = min(k * Config.QUANTIZED_OVERSAMPLE[self.vector_storage], Config.KNN_MAX_K)
+        return f"""
+            knn_coarse AS (
+                SELECT rowid
+                FROM memory_vectors
+                WHERE embedding MATCH {self._quantize_sql(self.vector_storage, '?')} AND k = ?
+                {knn_filter}
+            ),
+            knn AS (
+                SELECT f.id AS rowid, vec_distance_cosine(f.embedding, ?) AS distance
+                FROM knn_coarse c
+                JOIN memory_vectors_float f ON f.id = c.rowid
+                ORDER BY distance
+                LIMIT ?
+            )""", [query_blob, coarse_k] + filter_params + [query_blob, k]
+
+    def _search_knn(
+        self,
+        conn: sqlite3.Connection,
+        query_blob: bytes,
+        limit: int,
+        offset: int,
+        category: Optional[str] = None,
+        tags: Optional[List[str]] = None
+    ) -> List[tuple]:
+        """
+        Find nearest memories with the vec0 KNN index (MATCH ... AND k = ?).
+
+        Only the top-k rowids are joined with memory_metadata (see _knn_cte).
+        Unfiltered searches go through the in-process vector index instead
+        while it is current.
+
+        Args:
+            conn: Database connection
+            query_blob: Serialized query embedding
+            limit: Maximum number of results
+            offset: Number of results to skip
+            category: Optional category filter (partition key)
+            tags: Optional tags filter (matches if ANY tag is present)
+
+        Returns:
+            List of metadata rows with distance as last column
+        """
+        if not category and not tags and self._vector_index_current(conn):
+            return self._search_vector_index(conn, query_blob, limit, offset)
+
+        knn_cte, params = self._knn_cte(query_blob, limit + offset, category, tags)
+        params.extend([limit, offset])
+        return conn.execute(f"""
+            WITH {knn_cte}
+            SELECT
+                m.id, m.content, m.category, m.tags, m.created_at, m.updated_at, m.access_count, m.content_hash,
+                knn.distance
+            FROM knn
+            JOIN memory_metadata m ON m.id = knn.rowid
+            ORDER BY knn.distance
+            LIMIT ? OFFSET ?
+        """, params).fetchall()
+
+    def _search_vector_index(
+        self, conn: sqlite3.Connection, query_blob: bytes, limit: int, offset: int
+    ) -> List[tuple]:
+        """
+        Find nearest memories with the in-process vector index.
+
+        Args:
+            conn: Database connection
+            query_blob: Serialized query embedding
+            limit: Maximum number of results
+            offset: Number of results to skip
+
+        Returns:
+            List of metadata rows with distance as last column
+        """
+        ids, distances = self._vector_index.search(
+            np.frombuffer(query_blob, dtype=np.float32), limit + offset
+        )
+        ids, distances = ids[offset:], distances[offset:]
+        if not ids:
+            return []
+
+        placeholders = ",".join("?" * len(ids))
+        rows = {
+            row[0]: row for row in conn.execute(f"""
+                SELECT m.id, m.content, m.category, m.tags, m.created_at, m.updated_at, m.access_count, m.content_hash
+                FROM memory_metadata m
+                WHERE m.id IN ({placeholders})
+            """, ids)
+        }
+        return [rows[memory_id] + (distance,) for memory_id, distance in zip(ids, distances) if memory_id in rows]
+
+    @staticmethod
+    def _fts_query(query: str) -> Optional[str]:
+        """
+        Build an FTS5 MATCH expression from free text.
+
+        Every whitespace-separated term becomes a quoted phrase, so
+        identifiers like ERR_CONN_RESET or user.getById match as token
+        sequences and FTS5 operators in user input are treated literally.
+        Terms are OR-ed; BM25 ranks memories matching more and rarer terms
+        higher.
+
+        Args:
+            query: Search query
+
+        Returns:
+            MATCH expression, or None when the query has no searchable terms
+        """
+        terms = [
+            '"' + term.replace('"', '""') + '"'
+            for term in query.split()
+            if any(ch.isalnum() for ch in term)
+        ]
+        return " OR ".join(terms) if terms else None
+
+    def _search_hybrid(
+        self,
+        conn: sqlite3.Connection,
+        query_blob: bytes,
+        fts_query: str,
+        limit: int,
+        offset: int,
+        category: Optional[str] = None,
+        tags: Optional[List[str]] = None
+    ) -> List[tuple]:
+        """
+        Fuse vector KNN and BM25 rankings with reciprocal rank fusion.
+
+        Both rankings, the fusion and the metadata join run in one SQL
+        statement. Each ranking contributes 1 / (Config.HYBRID_RRF_K + rank);
+        memories found by only one ranking still get its share. distance is
+        the cosine distance to the query for every returned memory.
+
+        Args:
+            conn: Database connection
+            query_blob: Serialized query embedding
+            fts_query: FTS5 MATCH expression (see _fts_query)
+            limit: Maximum number of results
+            offset: Number of results to skip
+            category: Optional category filter
+            tags: Optional tags filter (matches if ANY tag is present)
+
+        Returns:
+            List of metadata rows with distance as last column, best fused score first
+        """
+        candidates = min(max(limit + offset, Config.HYBRID_CANDIDATES), Config.KNN_MAX_K)
+        knn_cte, knn_params = self._knn_cte(query_blob, candidates, category, tags)
+
+        fts_filter = ""
+        filter_sql, fts_params = self._build_search_filters(category, tags)
+        if filter_sql:
+            fts_filter = f"AND rowid IN (SELECT m.id FROM memory_metadata m WHERE {filter_sql})"
+
+        params: List[Any] = (
+            knn_params
+            + [fts_query] + fts_params + [candidates]
+            + [Config.HYBRID_RRF_K, Config.HYBRID_RRF_K]
+            + [query_blob, limit, offset]
+        )
+        return conn.execute(f"""
+            WITH {knn_cte},
+            vec_ranked AS (
+                SELECT rowid AS id, ROW_NUMBER() OVER (ORDER BY distance) AS rnk
+                FROM knn
+            ),
+            fts_ranked AS (
+                SELECT rowid AS id, ROW_NUMBER() OVER (ORDER BY rank) AS rnk
+                FROM (
+                    SELECT rowid, rank
+                    FROM memory_fts
+                    WHERE memory_fts MATCH ?
+                    {fts_filter}
+                    ORDER BY rank
+                    LIMIT ?
+                )
+            ),
+            fused AS (
+                SELECT id, SUM(score) AS score
+                FROM (
+                    SELECT id, 1.0 / (? + rnk) AS score FROM vec_ranked
+                    UNION ALL
+                    SELECT id, 1.0 / (? + rnk) AS score FROM fts_ranked
+                )
+                GROUP BY id
+            )
+            SELECT
+                m.id, m.content, m.category, m.tags, m.created_at, m.updated_at, m.access_count, m.content_hash,
+                vec_distance_cosine(v.embedding, ?) AS distance
+            FROM fused
+            JOIN memory_metadata m ON m.id = fused.id
+            JOIN {self._float_vectors_table} v ON v.rowid = fused.id
+            ORDER BY fused.score DESC, distance
+            LIMIT ? OFFSET ?
+        """, params).fetchall()
+
+    def _search_exact(
+        self,
+        conn: sqlite3.Connection,
+        query_blob: bytes,
+        limit: int,
+        offset: int,
+        category: Optional[str] = None,
+        tags: Optional[List[str]] = None
+    ) -> List[tuple]:
+        """
+        Find nearest memories by computing the distance for every row.
+
+        Used when limit + offset exceeds Config.KNN_MAX_K.
+
+        Args:
+            conn: Database connection
+            query_blob: Serialized query embedding
+            limit: Maximum number of results
+            offset: Number of results to skip
+            category: Optional category filter
+            tags: Optional tags filter (matches if ANY tag is present)
+
+        Returns:
+            List of metadata rows with distance as last column
+        """
+        query = f"""
+            SELECT
+                m.id, m.content, m.category, m.tags, m.created_at, m.updated_at, m.access_count, m.content_hash,
+                vec_distance_cosine(v.embedding, ?) as distance
+            FROM memory_metadata m
+            JOIN {self._float_vectors_table} v ON m.id = v.rowid
+        """
+        params: List[Any] = [query_blob]
+        filter_sql, filter_params = self._build_search_filters(category, tags)
+        if filter_sql:
+            query += " WHERE " + filter_sql
+            params.extend(filter_params)
+
+        query += " ORDER BY distance LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+        return conn.execute(query, params).fetchall()
+
     def get_recent_memories(self, limit: int = 10) -> List[MemoryEntry]:
         """
         Get recently stored memories.
@@ -923,46 +2835,42 @@ class VectorMemoryStore:
         """
         Get database statistics.
 
+        Totals and the category breakdown are read from memory_counts
+        (maintained by triggers), so they are exact and O(1). The recent-week
+        count and the most accessed memories need index scans and are
+        cached for Config.STATS_CACHE_TTL seconds.
+
         Returns:
             MemoryStats object with comprehensive statistics
         """
         self._ensure_db_initialized_sync()
 
+        # Include deferred access counts when top_accessed is refreshed;
+        # flushed before taking a connection, the flush uses its own
+        cached = self._stats_cache
+        if cached is None or time.monotonic() >= cached[0]:
+            self.flush_access_counts()
+
         try:
             conn = self._get_connection()
         except Exception as e:
             raise RuntimeError(f"Failed to store memory: {e}")
         
         try:
-            # Basic counts
-            total_memories = conn.execute("SELECT COUNT(*) FROM memory_metadata").fetchone()[0]
-            
-            # Category breakdown
+            # Basic counts and category breakdown
+            total_memories = self._count_memories(conn)
             categories = dict(conn.execute("""
-                SELECT category, COUNT(*) 
-                FROM memory_metadata 
-                GROUP BY category 
-                ORDER BY COUNT(*) DESC
+                SELECT key, count
+                FROM memory_counts
+                WHERE scope = 'category' AND count > 0
+                ORDER BY count DESC
             """).fetchall())
-            
-            # Recent activity
-            week_ago = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
-            recent_count = conn.execute(
-                "SELECT COUNT(*) FROM memory_metadata WHERE created_at > ?",
-                (week_ago,)
-            ).fetchone()[0]
+
+            recent_count, top_accessed = self._cached_activity_stats(conn)
             
             # Database size
             db_size = os.path.getsize(self.db_path) if self.db_path.exists() else 0
             
-            # Most accessed memories
-            top_memories = conn.execute("""
-                SELECT content, access_count 
-                FROM memory_metadata 
-                ORDER BY access_count DESC 
-                LIMIT 5
-            """).fetchall()
-            
             # Health status
             usage_pct = (total_memories / self.memory_limit) * 100
             if usage_pct < 70:
@@ -980,14 +2888,10 @@ class VectorMemoryStore:
                 database_size_mb=round(db_size / 1024 / 1024, 2),
                 embedding_model=self.embedding_model_name,
                 embedding_dimensions=Config.EMBEDDING_DIM,
-                top_accessed=[
-                    {
-                        "content_preview": content[:100] + "..." if len(content) > 100 else content,
-                        "access_count": count
-                    }
-                    for content, count in top_memories
-                ],
-                health_status=health_status
+                top_accessed=top_accessed,
+                health_status=health_status,
+                vector_storage=self.vector_storage,
+                vector_index=self._vector_index_stats(conn)
             )
             
             return stats
@@ -997,6 +2901,43 @@ class VectorMemoryStore:
         finally:
             conn.close()
     
+    def _cached_activity_stats(self, conn: sqlite3.Connection) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Recent-week count and top accessed memories, refreshed at most
+        every Config.STATS_CACHE_TTL seconds.
+
+        Args:
+            conn: Database connection
+
+        Returns:
+            Tuple of (memories created in the last 7 days, top 5 by access_count)
+        """
+        cached = self._stats_cache
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1], cached[2]
+
+        week_ago = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
+        recent_count = conn.execute(
+            "SELECT COUNT(*) FROM memory_metadata WHERE created_at > ?",
+            (week_ago,)
+        ).fetchone()[0]
+
+        top_accessed = [
+            {
+                "content_preview": content[:100] + "..." if len(content) > 100 else content,
+                "access_count": count
+            }
+            for content, count in conn.execute("""
+                SELECT content, access_count
+                FROM memory_metadata
+                ORDER BY access_count DESC
+                LIMIT 5
+            """)
+        ]
+
+        self._stats_cache = (time.monotonic() + Config.STATS_CACHE_TTL, recent_count, top_accessed)
+        return recent_count, top_accessed
+
     def clear_old_memories(self, days_old: int = 30, max_to_keep: int = 1000) -> Dict[str, Any]:
         """
         Clear old, less accessed memories.
@@ -1011,6 +2952,8 @@ class VectorMemoryStore:
         days_old, max_to_keep = validate_cleanup_params(days_old, max_to_keep)
 
         self._ensure_db_initialized_sync()
+        # Retention ranks by access_count, so include deferred accesses
+        self.flush_access_counts()
 
         cutoff_date = (datetime.now(timezone.utc) - timedelta(days=days_old)).isoformat()
 
@@ -1049,6 +2992,8 @@ class VectorMemoryStore:
             conn.execute(f"DELETE FROM memory_vectors WHERE rowid IN ({placeholders})", delete_ids)
             
             conn.commit()
+            self._update_vector_index(conn, removed=[int(memory_id) for memory_id in delete_ids])
+            self._stats_cache = None
             
             return {
                 "success": True,
@@ -1131,6 +3076,8 @@ class VectorMemoryStore:
             conn.execute("DELETE FROM memory_vectors WHERE rowid = ?", (memory_id,))
             
             conn.commit()
+            self._stats_cache = None
+            self._update_vector_index(conn, removed=[memory_id])
             return True
             
         except Exception as e:
@@ -1154,22 +3101,9 @@ class VectorMemoryStore:
             raise RuntimeError(f"Failed to get unique tags: {e}")
 
         try:
-            # Get all tags from memory_metadata
-            results = conn.execute("SELECT tags FROM memory_metadata").fetchall()
-
-            # Collect unique tags
-            unique_tags = set()
-            for row in results:
-                tags_json = row[0]
-                try:
-                    tags_list = json.loads(tags_json)
-                    if isinstance(tags_list, list):
-                        unique_tags.update(tags_list)
-                except json.JSONDecodeError:
-                    continue
-
-            # Return sorted list
-            return sorted(list(unique_tags))
+            # Distinct tags straight from the memory_tags index
+            results = conn.execute("SELECT DISTINCT tag FROM memory_tags ORDER BY tag").fetchall()
+            return [row[0] for row in results]
 
         except Exception as e:
             raise RuntimeError(f"Failed to get unique tags: {e}")
@@ -1344,6 +3278,7 @@ class VectorMemoryStore:
                 restored += 1
 
             conn.commit()
+            self._stats_cache = None
 
             return {
                 "success": True,
@@ -1370,6 +3305,10 @@ class VectorMemoryStore:
         For each non-canonical tag in memory_metadata, finds the best
         matching canonical tag using semantic similarity with guards.
 
+        All candidate tags are encoded in one batch and scored against the
+        canonical-tag matrix as (N x M) products; guards only run for
+        pairs at or above the threshold.
+
         Args:
             threshold: Minimum similarity for merging
             max_changes: Maximum number of tag mappings to propose
@@ -1379,47 +3318,44 @@ class VectorMemoryStore:
         Returns:
             Dict with mapping, stats, and preview_id
         """
-        canonical_tags = self._get_canonical_tags(conn)
+        canonical_tags = self._tag_index
+        canonical_tags.sync(conn)
 
-        rows = conn.execute(
-            "SELECT id, tags FROM memory_metadata ORDER BY id"
-        ).fetchall()
-
-        # Collect tag → memory_ids
-        tag_usage: Dict[str, List[int]] = {}
-        for row in rows:
-            memory_id = row[0]
-            tags = json.loads(row[1]) if row[1] else []
-            for tag in tags:
-                if tag not in tag_usage:
-                    tag_usage[tag] = []
-                tag_usage[tag].append(memory_id)
+        # Tag → number of memories using it (memory_tags index scan)
+        tag_usage: Dict[str, int] = dict(
+            conn.execute("SELECT tag, COUNT(*) FROM memory_tags GROUP BY tag").fetchall()
+        )
 
         # Build mapping: old_tag → canonical_tag
         mapping: Dict[str, str] = {}
-        canonical_set = set(canonical_tags.keys())
-
-        if canonical_tags:
-            canonical_list = list(canonical_tags.keys())
 
-            for tag in sorted(tag_usage.keys()):
-                if tag in canonical_set:
-                    continue  # Already canonical
-
-                tag_normalized = _normalize_tag_for_embedding(tag)
-                similarities = model.batch_similarity(tag_normalized, canonical_list)
+        # Non-canonical tags with something to embed
+        candidates = []
+        for tag in sorted(tag_usage.keys()):
+            if tag in canonical_tags:
+                continue  # Already canonical
+            tag_normalized = _normalize_tag_for_embedding(tag)
+            if tag_normalized.strip():
+                candidates.append((tag, tag_normalized))
+
+        if candidates and len(canonical_tags):
+            # One encode call for every candidate tag
+            embeddings = np.asarray(
+                model.encode([tag_normalized for _, tag_normalized in candidates], normalize=True),
+                dtype=np.float32
+            )
+            canonical_normalized: Dict[str, str] = {}
 
+            matches = canonical_tags.candidates_many(embeddings, threshold)
+            for (tag, tag_normalized), pairs in zip(candidates, matches):
+                # Pairs are sorted best first: the first one passing the guards wins
                 best_match = None
-                best_sim = 0.0
-
-                for i, sim in enumerate(similarities):
-                    can_tag = canonical_list[i]
-                    if sim >= threshold and _can_merge_tags(
-                        tag_normalized, _normalize_tag_for_embedding(can_tag), sim
-                    ):
-                        if sim > best_sim:
-                            best_sim = sim
-                            best_match = can_tag
+                for can_tag, sim in pairs:
+                    if can_tag not in canonical_normalized:
+                        canonical_normalized[can_tag] = _normalize_tag_for_embedding(can_tag)
+                    if _can_merge_tags(tag_normalized, canonical_normalized[can_tag], sim):
+                        best_match = can_tag
+                        break
 
                 if best_match and best_match != tag:
                     mapping[tag] = best_match
@@ -1438,27 +3374,25 @@ class VectorMemoryStore:
             tags_after_set.add(mapping.get(tag, tag))
         unique_tags_after = len(tags_after_set)
 
-        affected_memories = set()
-        for old_tag in mapping:
-            affected_memories.update(tag_usage.get(old_tag, []))
+        affected_memories = self._memory_ids_with_tags(conn, list(mapping))
 
         # Changes sorted by frequency (most impactful first)
         changes = []
         for old_tag, new_tag in sorted(
             mapping.items(),
-            key=lambda x: len(tag_usage.get(x[0], [])),
+            key=lambda x: tag_usage.get(x[0], 0),
             reverse=True
         ):
             changes.append({
                 "from": old_tag,
                 "to": new_tag,
-                "affected_memories": len(tag_usage.get(old_tag, []))
+                "affected_memories": tag_usage.get(old_tag, 0)
             })
 
         return {
             "mapping": mapping,
             "preview_id": preview_id,
-            "total_memories_scanned": len(rows),
+            "total_memories_scanned": self._count_memories(conn),
             "unique_tags_before": unique_tags_before,
             "unique_tags_after": unique_tags_after,
             "planned_updates_count": len(mapping),
@@ -1582,10 +3516,16 @@ class VectorMemoryStore:
                     "message": "No tags need normalization"
                 }
 
-            # Step 3: Apply changes atomically
-            rows = conn.execute(
-                "SELECT id, tags FROM memory_metadata ORDER BY id"
-            ).fetchall()
+            # Step 3: Apply changes atomically (only memories carrying mapped tags)
+            rows = []
+            memory_ids = self._memory_ids_with_tags(conn, list(mapping))
+            for start in range(0, len(memory_ids), 500):
+                chunk = memory_ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows.extend(conn.execute(
+                    f"SELECT id, tags FROM memory_metadata WHERE id IN ({placeholders}) ORDER BY id",
+                    chunk
+                ).fetchall())
 
             now = datetime.now(timezone.utc).isoformat()
             updated_count = 0
@@ -1615,12 +3555,12 @@ class VectorMemoryStore:
                     updated_count += 1
 
             conn.commit()
+            self._stats_cache = None
 
             # Final unique tag count
-            all_tags = set()
-            for r in conn.execute("SELECT tags FROM memory_metadata").fetchall():
-                for t in json.loads(r[0]) if r[0] else []:
-                    all_tags.add(t)
+            unique_tags_after = conn.execute(
+                "SELECT COUNT(DISTINCT tag) FROM memory_tags"
+            ).fetchone()[0]
 
             return {
                 "success": True,
@@ -1628,7 +3568,7 @@ class VectorMemoryStore:
                 "snapshot_id": snapshot_id,
                 "memories_updated": updated_count,
                 "tags_replaced": tags_replaced,
-                "unique_tags_after": len(all_tags),
+                "unique_tags_after": unique_tags_after,
                 "message": f"Applied {tags_replaced} tag replacements "
                            f"across {updated_count} memories"
             }
@@ -111,6 +111,8 @@ class MemoryStats:
     embedding_dimensions: int = 384
     top_accessed: List[Dict[str, Any]] = None
     health_status: str = "Unknown"
+    vector_storage: str = "float"
+    vector_index: Dict[str, Any] = None
 
     def __post_init__(self):
         """Initialize default values"""
@@ -138,7 +140,9 @@ class MemoryStats:
             "embedding_model": self.embedding_model,
             "embedding_dimensions": self.embedding_dimensions,
             "top_accessed": self.top_accessed,
-            "health_status": self.health_status
+            "health_status": self.health_status,
+            "vector_storage": self.vector_storage,
+            "vector_index": self.vector_index
         }
 
 
@@ -153,9 +157,11 @@ class Config:
     # Security limits
     MAX_MEMORY_LENGTH = 10000
     MAX_MEMORIES_PER_SEARCH = 50
+    MAX_QUERIES_PER_BATCH = 20  # Queries per search_many call
     MAX_TOTAL_MEMORIES = 10000
     MAX_TAG_LENGTH = 100
     MAX_TAGS_PER_MEMORY = 10
+    MAX_MEMORIES_PER_BATCH = 1000  # Items per store_memories call
 
     # Tag normalization
     TAG_SIMILARITY_THRESHOLD = 0.90
@@ -180,6 +186,95 @@ class Config:
     DB_NAME = "vector_memory.db"
     EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
     EMBEDDING_DIM = 384
+
+    # Connection pool
+    DB_POOL_SIZE = 16  # >= ENCODE_WORKERS + DB_WORKERS
+    DB_POOL_TIMEOUT = 30.0  # Seconds to wait for a free connection
+    DB_STATEMENT_CACHE_SIZE = 256  # Prepared statements cached per connection
+    DB_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -20000,  # Negative = KiB (~20 MB page cache per connection)
+        "busy_timeout": 5000,  # ms to wait on a locked database
+        "temp_store": "MEMORY",
+    }
+
+    # Tool executors (blocking store calls run off the event loop)
+    ENCODE_WORKERS = 8  # Calls doing model inference; forward passes are micro-batched
+    DB_WORKERS = 4  # Database-only calls
+    EXECUTOR_MAX_PENDING = 256  # Queued calls per executor before rejecting
+
+    # Encode micro-batching (concurrent encode calls share forward passes)
+    ENCODE_BATCHING = True
+    ENCODE_BATCH_SIZE = 64  # Max texts per forward pass
+    ENCODE_BATCH_LATENCY_MS = 2.0  # Max wait for more requests after the first
+
+    # Warm up database, model and category embeddings at startup (--preload)
+    PRELOAD = False
+
+    # Embedding cache (in-memory LRU + SQLite file next to the database)
+    EMBEDDING_CACHE_ENABLED = True
+    EMBEDDING_CACHE_SIZE = 4096  # Max in-memory entries (~1.5KB each at 384 dims)
+    EMBEDDING_CACHE_DISK_ROWS = 50_000  # Max SQLite rows, least recently used dropped (~75 MB)
+    EMBEDDING_CACHE_DB_NAME = "embedding_cache.db"
+
+    # Vector search (sqlite-vec KNN)
+    KNN_MAX_K = 4096  # sqlite-vec hard limit for k in MATCH queries
+
+    # Vector storage: "float" keeps float32 vectors in memory_vectors;
+    # "int8"/"bit" keep quantized vectors there for the KNN pass and rerank
+    # k * QUANTIZED_OVERSAMPLE candidates against float32 copies in
+    # memory_vectors_float. Stored per database, explicit choice migrates.
+    VECTOR_STORAGE = "float"
+    VECTOR_STORAGE_MODES = ("float", "int8", "bit")
+    QUANTIZED_OVERSAMPLE = {"int8": 4, "bit": 16}
+
+    # In-process vector index for unfiltered vector searches: None (off),
+    # "hnsw" (requires hnswlib), "flat" or "mmap" (memory-mapped sidecar).
+    # Saved next to the database as VECTOR_INDEX_FILE.* and used only while
+    # it matches the database.
+    VECTOR_INDEX_ENGINE = None
+    VECTOR_INDEX_FILE = "vector_index"
+    VECTOR_INDEX_COMPACT_RATIO = 0.25  # mmap: compact when this share of rows is deleted
+    HNSW_M = 16
+    HNSW_EF_CONSTRUCTION = 200
+    HNSW_EF_SEARCH = 64  # Raise for recall, lower for latency
+    HNSW_INITIAL_CAPACITY = 10_000  # Grows by doubling
+
+    # Hybrid search: BM25 (FTS5) and vector rankings fused with
+    # reciprocal rank fusion, score = sum(1 / (HYBRID_RRF_K + rank))
+    SEARCH_MODES = ("vector", "hybrid")
+    HYBRID_RRF_K = 60
+    HYBRID_CANDIDATES = 100  # Minimum candidates taken from each ranking
+
+    # Near-duplicate detection: store_memory/store_memories with
+    # dedupe_threshold compare each new memory with its nearest stored
+    # memory; find_duplicates scores the store in DUPLICATE_SCAN_BLOCK^2 tiles
+    DEDUPE_ACTIONS = ("merge", "reject")
+    DUPLICATE_SCAN_BLOCK = 2048  # Vectors per side of one similarity tile
+    DUPLICATE_MAX_CLUSTERS = 100  # Clusters returned by find_duplicates
+
+    # Network transports (--transport sse|streamable-http)
+    HTTP_HOST = "127.0.0.1"
+    HTTP_PORT = 8000
+    SESSION_MAX_CONCURRENT_CALLS = 4  # Tool calls running at once per client session (not stdio)
+
+    # Shared daemon (--daemon / --connect): one process owns the store and
+    # model and serves tool calls to stdio proxies on a Unix socket
+    DAEMON_SOCKET_NAME = "vector_memory.sock"  # Next to the database
+    DAEMON_LOG_NAME = "vector_memory.daemon.log"  # stderr of an auto-started daemon
+    DAEMON_CONNECT_TIMEOUT = 60.0  # Seconds to wait for an auto-started daemon
+    DAEMON_IDLE_TIMEOUT = 900.0  # Seconds without clients before exiting (0 = never)
+
+    # get_memory_stats: totals come from memory_counts; the recent-week
+    # count and top accessed memories are cached for this many seconds
+    STATS_CACHE_TTL = 30.0
+
+    # Access-count tracking: "deferred" batches increments in memory,
+    # "strict" writes them in the search transaction
+    ACCESS_TRACKING_MODE = "deferred"
+    ACCESS_FLUSH_INTERVAL = 5.0  # Seconds between deferred flushes
+    ACCESS_FLUSH_THRESHOLD = 1000  # Pending distinct memories waking the flush thread early
     
     # Memory categories
     MEMORY_CATEGORIES = MemoryCategory.list_values()
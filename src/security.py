@@ -254,6 +254,24 @@ def validate_cleanup_params(days_old: int, max_to_keep: int) -> tuple:
     return days_old, max_to_keep
 
 
+def validate_similarity_threshold(threshold: float) -> float:
+    """
+    Validate a cosine similarity threshold for near-duplicate detection.
+
+    Args:
+        threshold: Minimum similarity (0 < threshold <= 1)
+
+    Returns:
+        float: Validated threshold
+
+    Raises:
+        SecurityError: If validation fails
+    """
+    if isinstance(threshold, bool) or not isinstance(threshold, (int, float)) or not 0 < threshold <= 1:
+        raise SecurityError("Similarity threshold must be a number in (0, 1]")
+    return float(threshold)
+
+
 def generate_content_hash(content: str) -> str:
     """
     Generate hash for content deduplication.
@@ -0,0 +1,129 @@
+"""
+Client Sessions
+===============
+
+Per-session concurrency limits for a server shared by many clients
+(HTTP/SSE transports, the shared daemon). Each client session runs at
+most Config.SESSION_MAX_CONCURRENT_CALLS tool calls at once; further
+calls from that session wait for a slot, so one busy client cannot fill
+the worker pools every session shares. A stdio server has a single
+client, so its limit is the executor capacity instead.
+"""
+
+import asyncio
+import contextvars
+from contextlib import asynccontextmanager
+from typing import Any, Dict
+
+from mcp.server.fastmcp import FastMCP
+
+from .models import Config
+
+# Session of calls made outside an MCP request (set per daemon connection)
+current_session: contextvars.ContextVar = contextvars.ContextVar("vector_memory_session", default=None)
+
+
+def session_call_limit(transport: str, daemon: bool, capacity: int) -> int:
+    """
+    Calls one session may run at once on this server.
+
+    Args:
+        transport: MCP transport (stdio, sse, streamable-http)
+        daemon: Whether the server is the shared daemon
+        capacity: Workers across the tool executors
+
+    Returns:
+        Config.SESSION_MAX_CONCURRENT_CALLS for shared servers, capacity for stdio
+    """
+    if daemon or transport != "stdio":
+        return Config.SESSION_MAX_CONCURRENT_CALLS
+    return capacity
+
+
+class _SessionSlots:
+    __slots__ = ("semaphore", "users")
+
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.users = 0  # Running plus waiting calls
+
+
+class SessionLimiter:
+    """
+    Concurrency limit per client session.
+
+    Sessions are tracked only while they have calls in flight, so
+    disconnected clients leave nothing behind.
+    """
+
+    def __init__(self, max_concurrent: int = None):
+        """
+        Initialize limiter.
+
+        Args:
+            max_concurrent: Calls running at once per session
+                            (default Config.SESSION_MAX_CONCURRENT_CALLS)
+        """
+        self.max_concurrent = max_concurrent or Config.SESSION_MAX_CONCURRENT_CALLS
+        self._sessions: Dict[int, _SessionSlots] = {}
+        self._running = 0
+        self._waited = 0
+        self._peak_sessions = 0
+
+    @asynccontextmanager
+    async def slot(self, session: Any):
+        """
+        Hold one of the session's call slots, waiting if all are taken.
+
+        Args:
+            session: Object identifying the client session (None for local calls)
+        """
+        key = id(session)
+        slots = self._sessions.get(key)
+        if slots is None:
+            slots = self._sessions[key] = _SessionSlots(self.max_concurrent)
+            self._peak_sessions = max(self._peak_sessions, len(self._sessions))
+        slots.users += 1
+        if slots.semaphore.locked():
+            self._waited += 1
+
+        try:
+            async with slots.semaphore:
+                self._running += 1
+                try:
+                    yield
+                finally:
+                    self._running -= 1
+        finally:
+            slots.users -= 1
+            if slots.users == 0:
+                del self._sessions[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Sessions with calls in flight, running/waiting calls and totals."""
+        return {
+            "max_concurrent_per_session": self.max_concurrent,
+            "active_sessions": len(self._sessions),
+            "peak_sessions": self._peak_sessions,
+            "running_calls": self._running,
+            "waiting_calls": sum(slots.users for slots in self._sessions.values()) - self._running,
+            "calls_waited": self._waited,
+        }
+
+
+class SessionLimitedFastMCP(FastMCP):
+    """FastMCP server running every tool call under its session's limit."""
+
+    def __init__(self, *args, max_concurrent_calls: int = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.session_limiter = SessionLimiter(max_concurrent_calls)
+
+    def _current_session(self) -> Any:
+        try:
+            return self._mcp_server.request_context.session
+        except LookupError:
+            return current_session.get()
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]):
+        async with self.session_limiter.slot(self._current_session()):
+            return await super().call_tool(name, arguments)
@@ -0,0 +1,200 @@
+"""
+Canonical Tag Index
+===================
+
+In-process matrix of canonical tag embeddings used by semantic tag
+normalization. Stored embeddings are loaded once into a contiguous,
+L2-normalized float32 matrix so an incoming tag is scored against the
+whole vocabulary with a single matrix-vector product instead of
+re-encoding every canonical tag string.
+
+The index tracks (MAX(rowid), COUNT(*)) of canonical_tags as its
+version. Tags inserted by this process are added only after their
+transaction commits, together with the version re-read from the
+database; any change it did not make itself (another process) shows up
+as a version mismatch and triggers a reload.
+"""
+
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .models import Config
+
+
+class CanonicalTagIndex:
+    """
+    Versioned canonical-tag matrix with a tag → row index.
+    """
+
+    def __init__(self, dim: int = None):
+        """
+        Initialize empty index.
+
+        Args:
+            dim: Embedding dimensions (default Config.EMBEDDING_DIM)
+        """
+        self.dim = dim or Config.EMBEDDING_DIM
+        self.tags: List[str] = []
+        self.index: Dict[str, int] = {}
+        self._matrix = np.empty((0, self.dim), dtype=np.float32)
+        self._size = 0
+        self._version: Optional[Tuple[int, int]] = None
+        self._lock = threading.RLock()
+        self.reloads = 0
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Normalized embeddings, one row per tag in self.tags."""
+        return self._matrix[:self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, tag: str) -> bool:
+        return tag in self.index
+
+    @staticmethod
+    def _db_version(conn: sqlite3.Connection) -> Tuple[int, int]:
+        """Cheap change detector for canonical_tags."""
+        row = conn.execute("SELECT COALESCE(MAX(rowid), 0), COUNT(*) FROM canonical_tags").fetchone()
+        return row[0], row[1]
+
+    def sync(self, conn: sqlite3.Connection) -> None:
+        """
+        Reload the matrix if canonical_tags changed since the last sync.
+
+        Args:
+            conn: Database connection
+        """
+        with self._lock:
+            version = self._db_version(conn)
+            if version == self._version:
+                return
+
+            rows = conn.execute("SELECT rowid, tag, embedding FROM canonical_tags ORDER BY rowid").fetchall()
+            matrix = np.empty((max(len(rows), 1), self.dim), dtype=np.float32)
+            tags = []
+            for i, (_, tag, blob) in enumerate(rows):
+                matrix[i] = np.frombuffer(blob, dtype=np.float32)
+                tags.append(tag)
+
+            self._matrix = matrix
+            self._normalize_rows(self._matrix[:len(rows)])
+            self._size = len(rows)
+            self.tags = tags
+            self.index = {tag: i for i, tag in enumerate(tags)}
+            self._version = version
+            self.reloads += 1
+
+    def append(self, tag: str, embedding) -> None:
+        """
+        Append a tag in memory only, leaving the version alone.
+
+        Used directly for a transaction's pending tags; the shared index
+        is updated through add() once they are committed.
+
+        Args:
+            tag: Canonical tag string
+            embedding: Tag embedding vector
+        """
+        with self._lock:
+            if tag in self.index:
+                return
+
+            if self._size == len(self._matrix):
+                grown = np.empty((max(2 * len(self._matrix), 64), self.dim), dtype=np.float32)
+                grown[:self._size] = self._matrix[:self._size]
+                self._matrix = grown
+
+            self._matrix[self._size] = np.asarray(embedding, dtype=np.float32)
+            self._normalize_rows(self._matrix[self._size:self._size + 1])
+            self.index[tag] = self._size
+            self.tags.append(tag)
+            self._size += 1
+
+    def add(self, tags: Iterable[Tuple[str, Any]], conn: sqlite3.Connection) -> None:
+        """
+        Append tags this process inserted, after their transaction committed.
+
+        The version is re-read from the database. If the table holds rows
+        the matrix does not (another process inserted meanwhile), the
+        index is left stale and reloads on the next sync.
+
+        Args:
+            tags: (tag, embedding) pairs that were committed
+            conn: Database connection that committed them
+        """
+        with self._lock:
+            for tag, embedding in tags:
+                self.append(tag, embedding)
+
+            if self._version is not None:
+                version = self._db_version(conn)
+                self._version = version if version[1] == self._size else None
+
+    def invalidate(self) -> None:
+        """Force a reload on the next sync."""
+        with self._lock:
+            self._version = None
+
+    def candidates(self, embedding, min_similarity: float) -> List[Tuple[str, float]]:
+        """
+        Score an embedding against every canonical tag in one matrix-vector product.
+
+        Args:
+            embedding: Query embedding (normalized)
+            min_similarity: Drop tags scoring below this
+
+        Returns:
+            List of (tag, similarity), best first
+        """
+        query = np.asarray(embedding, dtype=np.float32).reshape(1, -1)
+        return next(self.candidates_many(query, min_similarity))
+
+    def candidates_many(
+        self, embeddings: np.ndarray, min_similarity: float, chunk_size: int = 1024
+    ) -> Iterator[List[Tuple[str, float]]]:
+        """
+        Score many embeddings against the vocabulary as (N x M) matrix products.
+
+        Rows are processed chunk_size at a time so memory stays bounded and
+        callers can stop early; pairs below min_similarity are dropped
+        before any Python-level work.
+
+        Args:
+            embeddings: Array of shape (N, dim), rows normalized
+            min_similarity: Drop pairs scoring below this
+            chunk_size: Query rows per matrix product
+
+        Yields:
+            For each input row, list of (tag, similarity), best first
+        """
+        with self._lock:
+            tags = list(self.tags)
+            matrix = self.matrix
+
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        for start in range(0, len(embeddings), chunk_size):
+            chunk = embeddings[start:start + chunk_size]
+            if not tags:
+                for _ in range(len(chunk)):
+                    yield []
+                continue
+
+            sims = chunk @ matrix.T
+            rows, cols = np.nonzero(sims >= min_similarity)
+            hits: List[List[Tuple[str, float]]] = [[] for _ in range(len(chunk))]
+            for row, col in zip(rows.tolist(), cols.tolist()):
+                hits[row].append((tags[col], float(sims[row, col])))
+            for row_hits in hits:
+                row_hits.sort(key=lambda hit: -hit[1])
+                yield row_hits
+
+    @staticmethod
+    def _normalize_rows(rows: np.ndarray) -> None:
+        norms = np.linalg.norm(rows, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        rows /= norms
@@ -0,0 +1,679 @@
+"""
+Vector Index
+============
+
+In-process nearest-neighbour engines kept alongside the memory_vectors
+table. sqlite-vec KNN is exact and scans every vector of the searched
+partition; an in-memory HNSW graph answers unfiltered searches in
+sub-linear time on very large stores.
+
+Engines implement the VectorIndex abstract base class (hnsw and flat
+through SnapshotVectorIndex, which saves them to one data file):
+
+- "hnsw": hnswlib HNSW graph (optional dependency: pip install hnswlib)
+- "flat": exact float32 matrix product (no extra dependency)
+- "mmap": exact matrix product over a memory-mapped sidecar file shared
+  by every process using the database
+
+Every index carries the database version it reflects, (sqlite_sequence
+seq, row count) of memory_metadata. VectorMemoryStore searches through
+the index only while that version matches the database and falls back
+to sqlite-vec otherwise.
+"""
+
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+
+import numpy as np
+
+from .models import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
+
+class VectorIndex(ABC):
+    """
+    Interface for in-process vector indexes (cosine distance).
+
+    Subclasses implement add/remove/search/ids/__len__ and save/load;
+    an engine missing any of them cannot be instantiated.
+    """
+
+    engine = ""
+    # Persistent indexes write through to their files, so a stale index
+    # is caught up instead of rebuilt
+    persistent = False
+
+    def __init__(self, dim: int = None):
+        """
+        Initialize empty index.
+
+        Args:
+            dim: Embedding dimensions (default Config.EMBEDDING_DIM)
+        """
+        self.dim = dim or Config.EMBEDDING_DIM
+        self._version: Optional[Tuple[int, int]] = None
+        self._lock = threading.RLock()
+
+    @property
+    def version(self) -> Optional[Tuple[int, int]]:
+        """Database version the index reflects (None if unknown)."""
+        return self._version
+
+    @version.setter
+    def version(self, value: Optional[Tuple[int, int]]) -> None:
+        self._version = value
+
+    @classmethod
+    def create(cls, base_path: Path, dim: int = None) -> "VectorIndex":
+        """
+        Create an empty index for a sidecar path.
+
+        Args:
+            base_path: Sidecar path without suffix
+            dim: Embedding dimensions (default Config.EMBEDDING_DIM)
+
+        Returns:
+            Empty VectorIndex
+        """
+        return cls(dim)
+
+    @abstractmethod
+    def add(self, ids: List[int], vectors) -> None:
+        """
+        Insert vectors (ids already present are replaced).
+
+        Args:
+            ids: Memory IDs
+            vectors: Embeddings, one row per ID
+        """
+
+    @abstractmethod
+    def remove(self, ids: Iterable[int]) -> None:
+        """
+        Remove vectors; unknown IDs are ignored.
+
+        Args:
+            ids: Memory IDs
+        """
+
+    @abstractmethod
+    def search(self, query, k: int) -> Tuple[List[int], List[float]]:
+        """
+        Find the k nearest vectors.
+
+        Args:
+            query: Query embedding
+            k: Number of neighbours
+
+        Returns:
+            Tuple of (memory IDs, cosine distances), nearest first
+        """
+
+    @abstractmethod
+    def ids(self) -> np.ndarray:
+        """IDs currently in the index."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of vectors in the index."""
+
+    @abstractmethod
+    def save(self, base_path: Path) -> None:
+        """
+        Persist the index next to the database.
+
+        Args:
+            base_path: Sidecar path without suffix
+        """
+
+    @classmethod
+    @abstractmethod
+    def load(cls, base_path: Path, dim: int = None, **options) -> Optional["VectorIndex"]:
+        """
+        Open an index persisted with save().
+
+        Args:
+            base_path: Sidecar path without suffix
+            dim: Embedding dimensions (default Config.EMBEDDING_DIM)
+            **options: Engine options
+
+        Returns:
+            VectorIndex, or None if missing or saved by another engine/dimension
+        """
+
+
+class SnapshotVectorIndex(VectorIndex):
+    """
+    Index held in memory and written to one data file by save().
+
+    Subclasses implement _save/_load for <base_path><file_suffix>.
+    """
+
+    file_suffix = ""
+
+    @abstractmethod
+    def _save(self, path: Path) -> None:
+        """Write the engine's data file."""
+
+    @abstractmethod
+    def _load(self, path: Path) -> None:
+        """Read the engine's data file."""
+
+    def save(self, base_path: Path) -> None:
+        """
+        Write the index to <base_path><file_suffix> plus a <base_path>.json
+        metadata file. Files are replaced atomically.
+
+        Args:
+            base_path: Sidecar path without suffix
+        """
+        base_path = Path(base_path)
+        data_path = base_path.with_suffix(self.file_suffix)
+        meta_path = base_path.with_suffix(".json")
+        with self._lock:
+            tmp_path = data_path.with_name(data_path.name + ".tmp")
+            self._save(tmp_path)
+            os.replace(tmp_path, data_path)
+
+            meta = {"engine": self.engine, "dim": self.dim, "version": self.version, "count": len(self)}
+            tmp_meta = meta_path.with_name(meta_path.name + ".tmp")
+            tmp_meta.write_text(json.dumps(meta))
+            os.replace(tmp_meta, meta_path)
+
+    @classmethod
+    def load(cls, base_path: Path, dim: int = None, **options) -> Optional["VectorIndex"]:
+        """
+        Load an index saved with save().
+
+        Args:
+            base_path: Sidecar path without suffix
+            dim: Embedding dimensions (default Config.EMBEDDING_DIM)
+            **options: Engine options
+
+        Returns:
+            VectorIndex, or None if missing or saved by another engine/dimension
+        """
+        base_path = Path(base_path)
+        data_path = base_path.with_suffix(cls.file_suffix)
+        meta_path = base_path.with_suffix(".json")
+        if not data_path.exists() or not meta_path.exists():
+            return None
+
+        try:
+            meta = json.loads(meta_path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+        index = cls(dim, **options)
+        if meta.get("engine") != cls.engine or meta.get("dim") != index.dim:
+            return None
+
+        index._load(data_path)
+        index.version = tuple(meta["version"]) if meta.get("version") else None
+        return index
+
+
+class FlatVectorIndex(SnapshotVectorIndex):
+    """
+    Exact index: normalized float32 matrix scored with one matrix-vector
+    product and argpartition.
+    """
+
+    engine = "flat"
+    file_suffix = ".npz"
+
+    def __init__(self, dim: int = None):
+        super().__init__(dim)
+        self._matrix = np.empty((0, self.dim), dtype=np.float32)
+        self._ids = np.empty(0, dtype=np.int64)
+        self._positions: Dict[int, int] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def ids(self) -> np.ndarray:
+        with self._lock:
+            return self._ids[:self._size].copy()
+
+    def _reserve(self, extra: int) -> None:
+        """Grow the matrix geometrically to fit `extra` more rows."""
+        needed = self._size + extra
+        if needed <= len(self._matrix):
+            return
+        capacity = max(needed, 2 * len(self._matrix), 1024)
+        matrix = np.empty((capacity, self.dim), dtype=np.float32)
+        matrix[:self._size] = self._matrix[:self._size]
+        ids = np.empty(capacity, dtype=np.int64)
+        ids[:self._size] = self._ids[:self._size]
+        self._matrix, self._ids = matrix, ids
+
+    def add(self, ids: List[int], vectors) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.maximum(norms, 1e-12)
+        with self._lock:
+            self._reserve(len(ids))
+            for memory_id, vector in zip(ids, vectors):
+                row = self._positions.get(int(memory_id))
+                if row is None:
+                    row = self._size
+                    self._positions[int(memory_id)] = row
+                    self._ids[row] = memory_id
+                    self._size += 1
+                self._matrix[row] = vector
+
+    def remove(self, ids: Iterable[int]) -> None:
+        with self._lock:
+            for memory_id in ids:
+                row = self._positions.pop(int(memory_id), None)
+                if row is None:
+                    continue
+                # Move the last row into the hole
+                last = self._size - 1
+                if row != last:
+                    self._matrix[row] = self._matrix[last]
+                    self._ids[row] = self._ids[last]
+                    self._positions[int(self._ids[row])] = row
+                self._size = last
+
+    def search(self, query, k: int) -> Tuple[List[int], List[float]]:
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        with self._lock:
+            k = min(k, self._size)
+            if k <= 0:
+                return [], []
+            scores = self._matrix[:self._size] @ query
+            top = np.argpartition(-scores, k - 1)[:k] if k < self._size else np.arange(self._size)
+            top = top[np.argsort(-scores[top])]
+            return self._ids[top].tolist(), (1.0 - scores[top]).tolist()
+
+    def _save(self, path: Path) -> None:
+        with open(path, "wb") as f:
+            np.savez(f, ids=self._ids[:self._size], matrix=self._matrix[:self._size])
+
+    def _load(self, path: Path) -> None:
+        with np.load(path) as data:
+            ids, matrix = data["ids"], data["matrix"]
+        self._size = 0
+        self._positions = {}
+        self._reserve(len(ids))
+        self._matrix[:len(ids)] = matrix
+        self._ids[:len(ids)] = ids
+        self._positions = {int(memory_id): row for row, memory_id in enumerate(ids)}
+        self._size = len(ids)
+
+
+class HnswVectorIndex(SnapshotVectorIndex):
+    """
+    Approximate index backed by an hnswlib HNSW graph.
+
+    Removed IDs are marked deleted in the graph (memory IDs are never
+    reused). ef_search trades recall for latency at query time.
+    """
+
+    engine = "hnsw"
+    file_suffix = ".hnsw"
+
+    def __init__(
+        self,
+        dim: int = None,
+        m: int = None,
+        ef_construction: int = None,
+        ef_search: int = None
+    ):
+        """
+        Initialize empty graph.
+
+        Args:
+            dim: Embedding dimensions (default Config.EMBEDDING_DIM)
+            m: Graph degree (default Config.HNSW_M)
+            ef_construction: Build-time candidate list size (default Config.HNSW_EF_CONSTRUCTION)
+            ef_search: Query-time candidate list size (default Config.HNSW_EF_SEARCH)
+        """
+        try:
+            import hnswlib
+        except ImportError as e:
+            raise ImportError(
+                "hnswlib is required for the 'hnsw' vector index. Install with: pip install hnswlib"
+            ) from e
+
+        super().__init__(dim)
+        self.m = m or Config.HNSW_M
+        self.ef_construction = ef_construction or Config.HNSW_EF_CONSTRUCTION
+        self.ef_search = ef_search or Config.HNSW_EF_SEARCH
+        self._index = hnswlib.Index(space="cosine", dim=self.dim)
+        self._index.init_index(
+            max_elements=Config.HNSW_INITIAL_CAPACITY, M=self.m, ef_construction=self.ef_construction
+        )
+        self._live: set = set()
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def ids(self) -> np.ndarray:
+        with self._lock:
+            return np.fromiter(self._live, dtype=np.int64, count=len(self._live))
+
+    def add(self, ids: List[int], vectors) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        if not len(vectors):
+            return
+        with self._lock:
+            needed = self._index.get_current_count() + len(vectors)
+            if needed > self._index.get_max_elements():
+                self._index.resize_index(max(needed, 2 * self._index.get_max_elements()))
+            self._index.add_items(vectors, np.asarray(ids, dtype=np.int64), replace_deleted=False)
+            self._live.update(int(memory_id) for memory_id in ids)
+
+    def remove(self, ids: Iterable[int]) -> None:
+        with self._lock:
+            for memory_id in ids:
+                if int(memory_id) in self._live:
+                    self._index.mark_deleted(int(memory_id))
+                    self._live.discard(int(memory_id))
+
+    def search(self, query, k: int) -> Tuple[List[int], List[float]]:
+        query = np.asarray(query, dtype=np.float32).reshape(1, -1)
+        with self._lock:
+            k = min(k, len(self._live))
+            if k <= 0:
+                return [], []
+            self._index.set_ef(max(self.ef_search, k))
+            labels, distances = self._index.knn_query(query, k=k)
+            return labels[0].tolist(), distances[0].tolist()
+
+    @staticmethod
+    def _ids_path(path: Path) -> Path:
+        """Live-ID list stored next to the graph (<base>.ids.npy)."""
+        return path.with_name(path.name.split(".")[0] + ".ids.npy")
+
+    def _save(self, path: Path) -> None:
+        # hnswlib keeps deleted labels in the graph, so live IDs are saved separately
+        self._index.save_index(str(path))
+        ids_path = self._ids_path(path)
+        tmp_path = ids_path.with_name(ids_path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, self.ids())
+        os.replace(tmp_path, ids_path)
+
+    def _load(self, path: Path) -> None:
+        self._index.load_index(str(path), max_elements=0)
+        self._index.set_ef(self.ef_search)
+        self._live = set(np.load(self._ids_path(path)).tolist())
+
+
+class MmapVectorIndex(VectorIndex):
+    """
+    Exact index over memory-mapped sidecar files.
+
+    <base>.<generation>.vec holds normalized float32 rows with a fixed
+    stride; <base>.<generation>.ids holds the int64 memory ID of each row
+    (0 marks a deleted row). Inserts are appended, deletes overwrite the
+    ID in place, and searches score the mapped rows with one matrix-vector
+    product, so nothing is copied and the pages are shared through the OS
+    page cache by every process that maps the files.
+
+    <base>.json holds the database version and the current generation.
+    Compaction writes the live rows to the next generation and switches
+    the metadata file atomically; readers remap on their next call. Writes
+    from several processes are serialized with a lock file.
+    """
+
+    engine = "mmap"
+    persistent = True
+
+    def __init__(self, dim: int = None, base_path: Path = None):
+        """
+        Open the index files of a sidecar path.
+
+        Args:
+            dim: Embedding dimensions (default Config.EMBEDDING_DIM)
+            base_path: Sidecar path without suffix
+        """
+        super().__init__(dim)
+        self._base = Path(base_path)
+        self._meta_path = self._base.with_suffix(".json")
+        self._meta: Dict = {}
+        self._meta_stat = None
+        self._mapped: Tuple[int, int] = (-1, -1)
+        self._vec = np.empty((0, self.dim), dtype=np.float32)
+        self._ids = np.empty(0, dtype=np.int64)
+        self._max_id = 0
+        self._lock_depth = 0
+
+    def _paths(self, generation: int) -> Tuple[Path, Path]:
+        """Vector and ID file of a generation."""
+        prefix = f"{self._base.name}.{generation}"
+        return self._base.with_name(prefix + ".vec"), self._base.with_name(prefix + ".ids")
+
+    @contextmanager
+    def _write_lock(self):
+        """Serialize writers within and across processes."""
+        with self._lock:
+            if fcntl is None or self._lock_depth:
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                return
+            with open(self._base.with_suffix(".lock"), "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_meta(self) -> Dict:
+        """Metadata file contents (re-read only when the file changed)."""
+        stat = os.stat(self._meta_path)
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if key != self._meta_stat:
+            self._meta = json.loads(self._meta_path.read_text())
+            self._meta_stat = key
+        return self._meta
+
+    def _write_meta(self, **changes) -> None:
+        """Update metadata atomically (caller holds the write lock)."""
+        meta = {**self._read_meta(), **changes}
+        tmp_path = self._meta_path.with_name(self._meta_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(meta))
+        os.replace(tmp_path, self._meta_path)
+
+    def _refresh(self) -> None:
+        """Map rows appended since the last call, or a new generation."""
+        generation = self._read_meta()["generation"]
+        vec_path, ids_path = self._paths(generation)
+        rows = min(os.path.getsize(vec_path) // (4 * self.dim), os.path.getsize(ids_path) // 8)
+        if (generation, rows) == self._mapped:
+            return
+
+        previous_generation, previous_rows = self._mapped
+        if rows:
+            self._vec = np.memmap(vec_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+            self._ids = np.memmap(ids_path, dtype=np.int64, mode="r", shape=(rows,))
+        else:
+            self._vec = np.empty((0, self.dim), dtype=np.float32)
+            self._ids = np.empty(0, dtype=np.int64)
+
+        if generation == previous_generation and 0 <= previous_rows <= rows:
+            new_ids = self._ids[previous_rows:]
+            self._max_id = max(self._max_id, int(new_ids.max()) if len(new_ids) else 0)
+        else:
+            self._max_id = int(self._ids.max()) if rows else 0
+        self._mapped = (generation, rows)
+
+    @property
+    def version(self) -> Optional[Tuple[int, int]]:
+        version = self._read_meta().get("version")
+        return tuple(version) if version else None
+
+    @version.setter
+    def version(self, value: Optional[Tuple[int, int]]) -> None:
+        if not hasattr(self, "_base"):
+            return  # VectorIndex.__init__ default
+        with self._write_lock():
+            self._write_meta(version=list(value) if value else None)
+
+    @classmethod
+    def create(cls, base_path: Path, dim: int = None) -> "MmapVectorIndex":
+        """Start a new, empty generation (replaces any existing sidecar)."""
+        index = cls(dim, base_path)
+        with index._write_lock():
+            generation = 0
+            try:
+                meta = json.loads(index._meta_path.read_text())
+                if meta.get("engine") == cls.engine:
+                    generation = meta["generation"] + 1
+            except (OSError, ValueError, KeyError):
+                pass
+
+            for path in index._paths(generation):
+                path.write_bytes(b"")
+            meta = {"engine": cls.engine, "dim": index.dim, "version": None, "generation": generation}
+            tmp_path = index._meta_path.with_name(index._meta_path.name + ".tmp")
+            tmp_path.write_text(json.dumps(meta))
+            os.replace(tmp_path, index._meta_path)
+            index._remove_generations_before(generation)
+        return index
+
+    @classmethod
+    def load(cls, base_path: Path, dim: int = None, **options) -> Optional["MmapVectorIndex"]:
+        """Open existing sidecar files (None if missing or another engine/dimension)."""
+        index = cls(dim, base_path)
+        try:
+            meta = index._read_meta()
+            if meta.get("engine") != cls.engine or meta.get("dim") != index.dim:
+                return None
+            if not all(path.exists() for path in index._paths(meta["generation"])):
+                return None
+        except (OSError, ValueError, KeyError):
+            return None
+        return index
+
+    def save(self, base_path: Path = None) -> None:
+        """Rows are written through on every change; nothing to do."""
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return int(np.count_nonzero(self._ids > 0))
+
+    def ids(self) -> np.ndarray:
+        with self._lock:
+            self._refresh()
+            return np.array(self._ids[self._ids > 0])
+
+    def add(self, ids: List[int], vectors) -> None:
+        ids = np.asarray(ids, dtype=np.int64)
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        vectors = np.ascontiguousarray(vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12))
+        if not len(ids):
+            return
+
+        with self._write_lock():
+            self._refresh()
+            generation, rows = self._mapped
+            vec_path, ids_path = self._paths(generation)
+
+            # Replaced IDs (never the case for fresh AUTOINCREMENT IDs)
+            if rows and int(ids.min()) <= self._max_id:
+                self._tombstone(np.isin(self._ids, ids))
+
+            # Drop a torn tail left by an interrupted append
+            os.truncate(vec_path, rows * 4 * self.dim)
+            os.truncate(ids_path, rows * 8)
+            with open(vec_path, "ab") as f:
+                f.write(vectors.tobytes())
+            with open(ids_path, "ab") as f:
+                f.write(ids.tobytes())
+            self._refresh()
+
+    def _tombstone(self, mask: np.ndarray) -> None:
+        """Zero the IDs of the masked rows in place (caller holds the write lock)."""
+        rows = np.flatnonzero(mask & (self._ids > 0))
+        if not len(rows):
+            return
+        _, ids_path = self._paths(self._mapped[0])
+        zero = np.zeros(1, dtype=np.int64).tobytes()
+        with open(ids_path, "r+b") as f:
+            for row in rows:
+                f.seek(int(row) * 8)
+                f.write(zero)
+
+    def remove(self, ids: Iterable[int]) -> None:
+        ids = np.fromiter(ids, dtype=np.int64)
+        if not len(ids):
+            return
+        with self._write_lock():
+            self._refresh()
+            self._tombstone(np.isin(self._ids, ids))
+            rows = len(self._ids)
+            dead = int(np.count_nonzero(self._ids <= 0))
+            if dead and dead > Config.VECTOR_INDEX_COMPACT_RATIO * rows:
+                self.compact()
+
+    def compact(self) -> None:
+        """Rewrite live rows into the next generation and drop deleted ones."""
+        with self._write_lock():
+            self._refresh()
+            generation = self._mapped[0] + 1
+            vec_path, ids_path = self._paths(generation)
+            live = np.flatnonzero(self._ids > 0)
+            with open(vec_path, "wb") as vec_file, open(ids_path, "wb") as ids_file:
+                for start in range(0, len(live), 65_536):
+                    chunk = live[start:start + 65_536]
+                    vec_file.write(np.ascontiguousarray(self._vec[chunk]).tobytes())
+                    ids_file.write(np.ascontiguousarray(self._ids[chunk]).tobytes())
+            self._write_meta(generation=generation)
+            self._refresh()
+            # Processes still mapping old files keep them until they remap
+            self._remove_generations_before(generation)
+
+    def _remove_generations_before(self, generation: int) -> None:
+        """Delete sidecar files of older generations."""
+        for path in self._base.parent.glob(f"{self._base.name}.*"):
+            parts = path.name[len(self._base.name) + 1:].split(".")
+            if len(parts) == 2 and parts[1] in ("vec", "ids") and parts[0].isdigit():
+                if int(parts[0]) < generation:
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+
+    def search(self, query, k: int) -> Tuple[List[int], List[float]]:
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        with self._lock:
+            self._refresh()
+            vec, ids = self._vec, self._ids
+        if not len(ids):
+            return [], []
+
+        scores = vec @ query
+        scores[ids <= 0] = -np.inf
+        k = min(k, int(np.count_nonzero(ids > 0)))
+        if k <= 0:
+            return [], []
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+        return ids[top].tolist(), (1.0 - scores[top]).tolist()
+
+
+VECTOR_INDEX_ENGINES: Dict[str, Type[VectorIndex]] = {
+    FlatVectorIndex.engine: FlatVectorIndex,
+    HnswVectorIndex.engine: HnswVectorIndex,
+    MmapVectorIndex.engine: MmapVectorIndex,
+}
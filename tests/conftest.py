@@ -0,0 +1,95 @@
+"""
+Shared test fixtures.
+
+Provides a deterministic stand-in for the sentence-transformers model so
+store tests run without downloading model weights.
+"""
+
+import hashlib
+import sys
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+
+class FakeEmbeddingModel:
+    """
+    Bag-of-words hashing encoder with the EmbeddingModel interface.
+
+    Texts sharing words get similar unit vectors; identical texts get
+    identical vectors.
+    """
+
+    model_name = "fake-bag-of-words"
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+        self.encode_calls = 0
+
+    def _vector(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for word in text.lower().split():
+            digest = hashlib.sha256(word.encode("utf-8")).digest()
+            vec[int.from_bytes(digest[:4], "little") % self.dim] += 1.0
+        norm = np.linalg.norm(vec)
+        if norm == 0:
+            vec[0] = 1.0
+            norm = 1.0
+        return vec / norm
+
+    def encode(self, texts: List[str], normalize: bool = True) -> np.ndarray:
+        self.encode_calls += 1
+        return np.stack([self._vector(t) for t in texts])
+
+    def encode_single(self, text: str, normalize: bool = True) -> List[float]:
+        return self.encode([text])[0].tolist()
+
+    def similarity(self, text1: str, text2: str) -> float:
+        embeddings = self.encode([text1, text2])
+        return float(np.dot(embeddings[0], embeddings[1]))
+
+    def batch_similarity(self, query: str, texts: List[str]) -> List[float]:
+        embeddings = self.encode([query] + texts)
+        return [float(x) for x in embeddings[1:] @ embeddings[0]]
+
+
+@pytest.fixture
+def fake_model():
+    """Deterministic embedding model stand-in."""
+    return FakeEmbeddingModel()
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Empty initialized VectorMemoryStore in a temporary directory."""
+    from src.memory_store import VectorMemoryStore
+
+    db_path = tmp_path / "memory" / "vector_memory.db"
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    store = VectorMemoryStore(db_path, memory_limit=1000)
+    store._ensure_db_initialized_sync()
+    return store
+
+
+@pytest.fixture
+def single_connection_store(tmp_path, monkeypatch):
+    """
+    Store whose pool holds one connection, with a short acquire timeout:
+    any code path taking a second connection while holding one fails fast.
+    """
+    from src.memory_store import VectorMemoryStore
+    from src.models import Config
+
+    monkeypatch.setattr(Config, "DB_POOL_TIMEOUT", 0.5)
+    db_path = tmp_path / "memory" / "vector_memory.db"
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    store = VectorMemoryStore(db_path, memory_limit=1000, pool_size=1)
+    store._ensure_db_initialized_sync()
+    return store
@@ -0,0 +1,160 @@
+"""
+Tests for AccessTracker (deferred access counts)
+================================================
+
+Validates that:
+1. Deferred mode keeps searches read-only until a flush
+2. Increments are aggregated and flushed by the background thread (early
+   once the size threshold is reached) and on close
+3. Failed flushes keep their increments for the next attempt, and a batch
+   stays visible in pending() until its flush returns
+4. Strict mode writes in the search transaction
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.access_tracker import AccessTracker
+from src.memory_store import VectorMemoryStore
+
+
+def _access_counts(store):
+    conn = store._get_connection()
+    try:
+        return dict(conn.execute("SELECT id, access_count FROM memory_metadata").fetchall())
+    finally:
+        conn.close()
+
+
+def _make_store(tmp_path, mode):
+    db_path = tmp_path / "memory" / "vector_memory.db"
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    store = VectorMemoryStore(db_path, memory_limit=1000, access_tracking=mode)
+    store._ensure_db_initialized_sync()
+    return store
+
+
+class TestAccessTracker:
+    """Tests for the accumulator itself."""
+
+    def test_aggregates_and_flushes_on_threshold(self):
+        flushed = []
+        threads = []
+
+        def flush(counts, ts):
+            threads.append(threading.current_thread())
+            flushed.append(counts)
+
+        tracker = AccessTracker(flush, interval=60, max_pending=3)
+
+        tracker.record({1: 1, 2: 1})
+        tracker.record({1: 1})
+        assert flushed == []
+        assert tracker.pending([1, 2, 3]) == {1: 2, 2: 1}
+
+        # A full buffer wakes the flush thread; record() itself never writes
+        tracker.record({3: 1})
+        deadline = time.monotonic() + 2
+        while not tracker.flushes and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert flushed == [{1: 2, 2: 1, 3: 1}]
+        assert threads[0] is not threading.current_thread()
+        assert tracker.pending([1, 2, 3]) == {}
+        tracker.close()
+
+    def test_failed_flush_keeps_increments(self):
+        calls = []
+
+        def flaky(counts, ts):
+            calls.append(counts)
+            if len(calls) == 1:
+                raise RuntimeError("database is locked")
+
+        tracker = AccessTracker(flaky, interval=60, max_pending=100)
+        tracker.record({7: 2})
+        with pytest.raises(RuntimeError):
+            tracker.flush()
+        tracker.record({7: 1})
+
+        assert tracker.flush() == 1
+        assert calls[-1] == {7: 3}
+        tracker.close()
+
+    def test_inflight_batch_stays_visible(self):
+        writing, release = threading.Event(), threading.Event()
+        seen = []
+
+        def slow(counts, ts):
+            writing.set()
+            release.wait(5)
+
+        tracker = AccessTracker(slow, interval=60, max_pending=100)
+        tracker.record({4: 2})
+        flusher = threading.Thread(target=tracker.flush)
+        flusher.start()
+        assert writing.wait(5)
+
+        tracker.record({4: 1, 5: 1})
+        seen.append(tracker.pending([4, 5]))
+        release.set()
+        flusher.join(5)
+
+        assert seen == [{4: 3, 5: 1}]
+        assert tracker.pending([4, 5]) == {4: 1, 5: 1}
+        tracker.close()
+
+    def test_background_flush(self):
+        flushed = []
+        tracker = AccessTracker(lambda counts, ts: flushed.append(counts), interval=0.05, max_pending=100)
+        tracker.record({1: 1})
+        time.sleep(0.3)
+        assert flushed == [{1: 1}]
+        tracker.close()
+
+
+class TestStoreAccessTracking:
+    """Tests for access tracking modes in VectorMemoryStore."""
+
+    def test_deferred_mode_flushes_on_close(self, tmp_path, fake_model):
+        store = _make_store(tmp_path, "deferred")
+        stored = store.store_memory("sqlite wal tuning", "performance", [], embedding_model=fake_model)
+        memory_id = stored["memory_id"]
+
+        for expected in (1, 2):
+            results, _ = store.search_memories("sqlite wal", embedding_model=fake_model)
+            assert results[0].memory.access_count == expected
+        assert _access_counts(store)[memory_id] == 0
+
+        store.close()
+        reopened = _make_store(tmp_path, "deferred")
+        assert _access_counts(reopened)[memory_id] == 2
+        reopened.close()
+
+    def test_strict_mode_writes_immediately(self, tmp_path, fake_model):
+        store = _make_store(tmp_path, "strict")
+        stored = store.store_memory("sqlite wal tuning", "performance", [], embedding_model=fake_model)
+
+        store.search_memories("sqlite wal", embedding_model=fake_model)
+        assert _access_counts(store)[stored["memory_id"]] == 1
+        assert store.flush_access_counts() == 0
+        store.close()
+
+    def test_rejects_unknown_mode(self, tmp_path):
+        with pytest.raises(ValueError, match="access_tracking"):
+            _make_store(tmp_path, "eventually")
+
+    def test_threshold_during_search_on_single_connection(self, single_connection_store, fake_model):
+        store = single_connection_store
+        store._access_tracker.max_pending = 1
+        stored = store.store_memory("sqlite wal tuning", "performance", [], embedding_model=fake_model)
+
+        results, _ = store.search_memories("sqlite wal", embedding_model=fake_model)
+        assert results[0].memory.access_count == 1
+
+        deadline = time.monotonic() + 2
+        while _access_counts(store)[stored["memory_id"]] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert _access_counts(store)[stored["memory_id"]] == 1
+        store.close()
@@ -0,0 +1,89 @@
+"""
+Tests for persisted canonical category embeddings
+=================================================
+
+Validates that:
+1. Category labels are embedded once, in one batch, and stored per model
+2. Later stores read the matrix from the database without encoding
+3. Relabelled categories are re-embedded
+4. Vectorized scoring picks the same categories as pairwise dot products
+5. Loading the matrix during a store reuses the store's connection
+"""
+
+import numpy as np
+import pytest
+
+import src.memory_store as memory_store_module
+from src.memory_store import VectorMemoryStore
+from src.models import Config
+
+
+def _open(tmp_path):
+    db_path = tmp_path / "memory" / "vector_memory.db"
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    store = VectorMemoryStore(db_path, memory_limit=1000)
+    store._ensure_db_initialized_sync()
+    return store
+
+
+def _stored_rows(store):
+    conn = store._get_connection()
+    try:
+        return conn.execute("SELECT model, category, label FROM category_embeddings ORDER BY category").fetchall()
+    finally:
+        conn.close()
+
+
+class TestCategoryEmbeddings:
+    """Tests for the category_embeddings table and matrix."""
+
+    def test_embedded_once_and_reloaded(self, tmp_path, fake_model):
+        store = _open(tmp_path)
+        categories, matrix = store._get_canonical_categories_embeddings(fake_model)
+        assert fake_model.encode_calls == 1
+        assert categories == list(Config.MEMORY_CATEGORIES)
+        assert matrix.shape == (len(categories), Config.EMBEDDING_DIM)
+        assert len(_stored_rows(store)) == len(categories)
+
+        store._get_canonical_categories_embeddings(fake_model)
+        assert fake_model.encode_calls == 1
+
+        # New process: read from the table, no forward pass
+        other = _open(tmp_path)
+        _, reloaded = other._get_canonical_categories_embeddings(fake_model)
+        assert fake_model.encode_calls == 1
+        np.testing.assert_array_equal(reloaded, matrix)
+
+    def test_relabelled_category_reembedded(self, tmp_path, fake_model, monkeypatch):
+        store = _open(tmp_path)
+        store._get_canonical_categories_embeddings(fake_model)
+
+        labels = {**memory_store_module.CATEGORY_LABELS, "security": "security auth secrets"}
+        monkeypatch.setattr(memory_store_module, "CATEGORY_LABELS", labels)
+        other = _open(tmp_path)
+        categories, matrix = other._get_canonical_categories_embeddings(fake_model)
+
+        assert fake_model.encode_calls == 2
+        row = matrix[categories.index("security")]
+        np.testing.assert_allclose(row, fake_model.encode(["security auth secrets"])[0])
+        assert ("fake-bag-of-words", "security", "security auth secrets") in _stored_rows(other)
+
+    @pytest.mark.parametrize("category", ["bug fix error", "speed optimization", "design structure", "misc notes"])
+    def test_matches_pairwise_scoring(self, store, fake_model, category):
+        categories, matrix = store._get_canonical_categories_embeddings(fake_model)
+        embedding = fake_model.encode_single(category)
+        similarities = {cat: float(np.dot(embedding, row)) for cat, row in zip(categories, matrix)}
+
+        best = max((cat for cat in categories if cat != "other"), key=similarities.get)
+        expected = "other"
+        if (similarities[best] >= Config.CATEGORY_SIMILARITY_THRESHOLD
+                and similarities[best] >= similarities["other"] + Config.CATEGORY_MIN_MARGIN):
+            expected = best
+        assert store._normalize_category_semantic(category, fake_model) == expected
+
+    def test_loaded_on_callers_connection(self, single_connection_store, fake_model):
+        store = single_connection_store
+        result = store.store_memory("notes on something", "some weird category", [], embedding_model=fake_model)
+
+        assert result["success"] is True
+        assert len(_stored_rows(store)) == len(Config.MEMORY_CATEGORIES)
@@ -0,0 +1,23 @@
+"""
+Tests for server cold start
+===========================
+
+Validates that importing the server does not load torch or
+sentence-transformers (they are imported on the first encode).
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+
+def test_import_main_skips_model_libraries():
+    script = (
+        "import sys, main\n"
+        "heavy = sorted(m for m in ('torch', 'transformers', 'sentence_transformers') if m in sys.modules)\n"
+        "print(','.join(heavy))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
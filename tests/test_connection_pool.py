@@ -0,0 +1,81 @@
+"""
+Tests for ConnectionPool
+========================
+
+Validates that:
+1. Connections are reused instead of reopened
+2. The pool is bounded and times out when exhausted
+3. PRAGMAs and sqlite-vec are applied to every connection
+4. Open transactions are rolled back on release
+5. Closing the pool closes idle connections and rejects new checkouts
+"""
+
+import threading
+
+import pytest
+
+from src.connection_pool import ConnectionPool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(tmp_path / "pool.db", max_size=2, timeout=0.2)
+    yield pool
+    pool.close()
+
+
+class TestConnectionPool:
+    """Tests for pooled connection lifecycle."""
+
+    def test_close_returns_connection_for_reuse(self, pool):
+        conn = pool.acquire()
+        conn.close()
+        assert pool.acquire() is conn
+        assert pool.stats()["open"] == 1
+
+    def test_connections_have_extension_and_pragmas(self, pool):
+        conn = pool.acquire()
+        try:
+            assert conn.execute("SELECT vec_version()").fetchone()[0].startswith("v")
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        finally:
+            conn.close()
+
+    def test_pool_is_bounded(self, pool):
+        first, second = pool.acquire(), pool.acquire()
+        with pytest.raises(RuntimeError, match="Timed out"):
+            pool.acquire()
+
+        # A waiting thread gets the connection as soon as one is released
+        acquired = []
+        waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+        pool.timeout = 5
+        waiter.start()
+        first.close()
+        waiter.join(timeout=5)
+        assert acquired == [first]
+        second.close()
+        acquired[0].close()
+
+    def test_release_rolls_back_open_transaction(self, pool):
+        conn = pool.acquire()
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.execute("INSERT INTO t VALUES (1)")
+        assert conn.in_transaction
+        conn.close()
+
+        conn = pool.acquire()
+        try:
+            assert not conn.in_transaction
+            assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+        finally:
+            conn.close()
+
+    def test_closed_pool_rejects_acquire(self, pool):
+        conn = pool.acquire()
+        conn.close()
+        pool.close()
+        assert pool.stats()["open"] == 0
+        with pytest.raises(RuntimeError, match="closed"):
+            pool.acquire()
@@ -0,0 +1,155 @@
+"""
+Tests for the shared server daemon
+==================================
+
+Validates that:
+1. The stdio proxy exposes the daemon's tools with identical results
+2. Requests from several clients run concurrently on one daemon
+3. Only one daemon serves a socket; stale sockets are replaced; the socket
+   is owner-only from the moment it is bound
+4. The daemon exits after its idle timeout
+"""
+
+import asyncio
+import json
+import os
+import stat
+
+import mcp.types as types
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from src.daemon import DaemonClient, DaemonServer, create_proxy_server
+
+
+def _tools_server():
+    mcp = FastMCP("test")
+
+    @mcp.tool()
+    async def add(a: int, b: int = 1) -> dict:
+        """Add two numbers."""
+        return {"sum": a + b}
+
+    @mcp.tool()
+    async def sleep(seconds: float) -> dict:
+        """Sleep, then report."""
+        await asyncio.sleep(seconds)
+        return {"slept": seconds}
+
+    return mcp
+
+
+async def _with_daemon(tmp_path, body, idle_timeout=0):
+    daemon = DaemonServer(_tools_server(), tmp_path / "test.sock", idle_timeout=idle_timeout)
+    serving = asyncio.create_task(daemon.serve())
+    while not daemon.socket_path.is_socket():
+        await asyncio.sleep(0.01)
+    try:
+        return await body(daemon)
+    finally:
+        daemon.stop()
+        await serving
+
+
+class TestProxy:
+    """Tests for create_proxy_server."""
+
+    def test_lists_and_calls_daemon_tools(self, tmp_path):
+        async def body(daemon):
+            client = DaemonClient(daemon.socket_path)
+            proxy = create_proxy_server(client)
+            listed = await proxy.request_handlers[types.ListToolsRequest](types.ListToolsRequest())
+            assert [tool.name for tool in listed.root.tools] == ["add", "sleep"]
+            assert listed.root.tools[0].inputSchema["required"] == ["a"]
+
+            call = proxy.request_handlers[types.CallToolRequest]
+            result = await call(types.CallToolRequest(
+                params=types.CallToolRequestParams(name="add", arguments={"a": 2, "b": 3})
+            ))
+            direct = await daemon.mcp._mcp_server.request_handlers[types.CallToolRequest](types.CallToolRequest(
+                params=types.CallToolRequestParams(name="add", arguments={"a": 2, "b": 3})
+            ))
+            assert result.root == direct.root
+            assert json.loads(result.root.content[0].text) == {"sum": 5}
+
+            invalid = await call(types.CallToolRequest(
+                params=types.CallToolRequestParams(name="add", arguments={"b": 3})
+            ))
+            assert invalid.root.isError
+            await client.close()
+
+        asyncio.run(_with_daemon(tmp_path, body))
+
+
+class TestDaemon:
+    """Tests for DaemonServer and DaemonClient."""
+
+    def test_concurrent_clients(self, tmp_path):
+        async def body(daemon):
+            first, second = DaemonClient(daemon.socket_path), DaemonClient(daemon.socket_path)
+            call = {"name": "sleep", "arguments": {"seconds": 0.3}}
+            slow = asyncio.ensure_future(first.request("call_tool", call))
+            fast = asyncio.ensure_future(first.request("call_tool", {"name": "add", "arguments": {"a": 1}}))
+            other = asyncio.ensure_future(second.request("call_tool", call))
+
+            # Out-of-order answers on one connection
+            done, _ = await asyncio.wait([slow, fast], return_when=asyncio.FIRST_COMPLETED)
+            assert done == {fast}
+            assert daemon.stats()["clients"] == 2
+
+            start = asyncio.get_running_loop().time()
+            await asyncio.gather(slow, other)
+            assert asyncio.get_running_loop().time() - start < 0.5
+
+            with pytest.raises(RuntimeError, match="Unknown method"):
+                await first.request("restart")
+            await first.close()
+            await second.close()
+
+        asyncio.run(_with_daemon(tmp_path, body))
+
+    def test_single_daemon_per_socket(self, tmp_path):
+        (tmp_path / "test.sock").write_text("stale")
+
+        async def body(daemon):
+            rival = DaemonServer(_tools_server(), daemon.socket_path)
+            assert await rival.serve() is False
+            client = DaemonClient(daemon.socket_path)
+            result = await client.request("call_tool", {"name": "add", "arguments": {"a": 4}})
+            assert json.loads(result["content"][0]["text"]) == {"sum": 5}
+            await client.close()
+
+        asyncio.run(_with_daemon(tmp_path, body))
+        assert not (tmp_path / "test.sock").exists()
+
+    def test_socket_owner_only_when_bound(self, tmp_path, monkeypatch):
+        modes = []
+        chmod = os.chmod
+
+        def record_mode(path, mode):
+            modes.append(stat.S_IMODE(os.stat(path).st_mode))
+            chmod(path, mode)
+
+        monkeypatch.setattr(os, "chmod", record_mode)
+        old_umask = os.umask(0)
+        try:
+            async def body(daemon):
+                return stat.S_IMODE(os.stat(daemon.socket_path).st_mode)
+
+            mode = asyncio.run(_with_daemon(tmp_path, body))
+        finally:
+            restored = os.umask(old_umask)
+
+        assert modes == [0o600]
+        assert mode == 0o600
+        assert restored == 0
+
+    def test_idle_timeout_and_missing_daemon(self, tmp_path):
+        async def main():
+            daemon = DaemonServer(_tools_server(), tmp_path / "test.sock", idle_timeout=0.2)
+            assert await asyncio.wait_for(daemon.serve(), 5) is True
+
+            with pytest.raises(ConnectionError, match="No daemon listening"):
+                await DaemonClient(daemon.socket_path).request("list_tools")
+
+        asyncio.run(main())
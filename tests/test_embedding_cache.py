@@ -0,0 +1,232 @@
+"""
+Tests for EmbeddingCache
+========================
+
+Validates that:
+1. The LRU tier evicts least recently used entries
+2. The disk tier survives a new cache instance
+3. Changing the model name hides persisted entries without deleting them;
+   rows of other models are evicted first
+4. The disk tier is bounded and evicts least recently used rows; disk hits
+   write their recency with the next store, never during the lookup; large
+   lookups are chunked and older cache files are migrated
+5. EmbeddingModel.encode only sends cache misses to the model and encodes
+   without the cache when its disk tier fails
+"""
+
+import sqlite3
+import time
+
+import numpy as np
+import pytest
+
+from src.embedding_cache import EmbeddingCache
+from src.embeddings import EmbeddingModel
+
+
+class CountingTransformer:
+    """Stand-in for SentenceTransformer that records encoded texts."""
+
+    def __init__(self):
+        self.seen = []
+
+    def encode(self, texts, normalize_embeddings=True, convert_to_numpy=True):
+        self.seen.extend(texts)
+        return np.array([[float(len(t)), 1.0, 0.0] for t in texts], dtype=np.float32)
+
+
+def vectors(n: int) -> np.ndarray:
+    return np.arange(n * 3, dtype=np.float32).reshape(n, 3)
+
+
+class TestEmbeddingCache:
+    """Tests for the two cache tiers."""
+
+    def test_lru_evicts_oldest(self):
+        cache = EmbeddingCache("model-a", max_entries=2)
+        cache.store(["a", "b"], vectors(2))
+        cache.lookup(["a"])  # a becomes most recent
+        cache.store(["c"], vectors(1))
+
+        found, missing = cache.lookup(["a", "b", "c"])
+        assert sorted(found) == [0, 2]
+        assert missing == [1]
+
+    def test_whitespace_normalized_keys(self):
+        cache = EmbeddingCache("model-a")
+        cache.store(["hello   world"], vectors(1))
+
+        found, missing = cache.lookup(["  hello world\n"])
+        assert missing == []
+        assert cache.stats()["memory_hits"] == 1
+
+    def test_disk_tier_persists(self, tmp_path):
+        path = tmp_path / "embedding_cache.db"
+        cache = EmbeddingCache("model-a", path)
+        cache.store(["persisted text"], vectors(1))
+        cache.close()
+
+        reopened = EmbeddingCache("model-a", path)
+        found, missing = reopened.lookup(["persisted text"])
+        assert missing == []
+        np.testing.assert_array_equal(found[0], vectors(1)[0])
+        assert reopened.stats()["disk_hits"] == 1
+        reopened.close()
+
+    def test_model_change_invalidates(self, tmp_path):
+        path = tmp_path / "embedding_cache.db"
+        cache = EmbeddingCache("model-a", path)
+        cache.store(["text"], vectors(1))
+        cache.close()
+
+        other = EmbeddingCache("model-b", path)
+        _, missing = other.lookup(["text"])
+        assert missing == [0]
+        other.close()
+
+        # Another process may still use model-a: its rows are kept
+        back = EmbeddingCache("model-a", path)
+        _, missing = back.lookup(["text"])
+        assert missing == []
+        back.close()
+
+    def test_other_model_rows_evicted_first(self, tmp_path):
+        path = tmp_path / "embedding_cache.db"
+        old = EmbeddingCache("model-a", path)
+        old.store(["old 1", "old 2"], vectors(2))
+        old.close()
+
+        cache = EmbeddingCache("model-b", path, max_disk_rows=3)
+        cache.store(["new 1", "new 2"], vectors(2))
+        assert cache.stats()["disk_evictions"] == 1
+        cache.close()
+
+        conn = sqlite3.connect(str(path))
+        models = [row[0] for row in conn.execute("SELECT model_name FROM embedding_cache ORDER BY model_name")]
+        conn.close()
+        assert models == ["model-a", "model-b", "model-b"]
+
+    def test_disk_tier_evicts_least_recently_used(self, tmp_path, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(time, "time", lambda: clock[0])
+        path = tmp_path / "embedding_cache.db"
+        cache = EmbeddingCache("model-a", path, max_entries=1, max_disk_rows=3)
+        for text in ("a", "b", "c"):
+            clock[0] += 1
+            cache.store([text], vectors(1))
+
+        # Read "a" from disk ("c" is the only one in memory), then add "d"
+        clock[0] += 1
+        cache.lookup(["a"])
+        clock[0] += 1
+        cache.store(["d"], vectors(1))
+
+        stats = cache.stats()
+        assert (stats["disk_entries"], stats["disk_evictions"]) == (3, 1)
+        cache.close()
+
+        reopened = EmbeddingCache("model-a", path)
+        _, missing = reopened.lookup(["a", "b", "c", "d"])
+        assert missing == [1]
+        reopened.close()
+
+    def test_disk_hit_does_not_write(self, tmp_path, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(time, "time", lambda: clock[0])
+        path = tmp_path / "embedding_cache.db"
+        cache = EmbeddingCache("model-a", path, max_entries=1)
+        cache.store(["a"], vectors(1))
+        cache.store(["b"], vectors(1))
+
+        clock[0] += 1
+        cache.lookup(["a"])
+        assert not cache._conn.in_transaction
+
+        def last_used():
+            conn = sqlite3.connect(str(path))
+            try:
+                return conn.execute("SELECT last_used FROM embedding_cache ORDER BY last_used").fetchall()
+            finally:
+                conn.close()
+
+        assert last_used() == [(1000.0,), (1000.0,)]
+        # Written in the next store's transaction
+        cache.store(["c"], vectors(1))
+        assert last_used() == [(1000.0,), (1001.0,), (1001.0,)]
+        cache.close()
+
+    def test_large_lookup_is_chunked(self, tmp_path):
+        path = tmp_path / "embedding_cache.db"
+        texts = [f"text {i}" for i in range(2500)]
+        cache = EmbeddingCache("model-a", path, max_entries=10)
+        cache.store(texts, vectors(len(texts)))
+
+        found, missing = cache.lookup(texts + ["not cached"])
+        assert len(found) == 2500
+        assert missing == [2500]
+        cache.close()
+
+    def test_migrates_cache_without_recency(self, tmp_path):
+        path = tmp_path / "embedding_cache.db"
+        conn = sqlite3.connect(str(path))
+        conn.execute("""
+            CREATE TABLE embedding_cache (
+                model_name TEXT NOT NULL, text_hash TEXT NOT NULL, embedding BLOB NOT NULL,
+                PRIMARY KEY (model_name, text_hash)
+            ) WITHOUT ROWID
+        """)
+        conn.executemany(
+            "INSERT INTO embedding_cache VALUES ('model-a', ?, ?)",
+            [(EmbeddingCache.text_key(f"old {i}"), vectors(1)[0].tobytes()) for i in range(5)]
+        )
+        conn.commit()
+        conn.close()
+
+        cache = EmbeddingCache("model-a", path, max_disk_rows=3)
+        assert cache.stats()["disk_entries"] == 3
+        cache.store(["new"], vectors(1))
+        _, missing = cache.lookup(["new"])
+        assert missing == []
+        cache.close()
+
+
+class TestEmbeddingModelCache:
+    """Tests for the cache in front of EmbeddingModel.encode."""
+
+    def test_only_misses_are_encoded(self):
+        model = EmbeddingModel("model-a", batching=False)
+        model.model = CountingTransformer()
+        model.attach_cache(EmbeddingCache("model-a"))
+
+        first = model.encode(["alpha", "beta"])
+        second = model.encode(["beta", "gamma", "alpha"])
+
+        assert model.model.seen == ["alpha", "beta", "gamma"]
+        np.testing.assert_array_equal(second[0], first[1])
+        np.testing.assert_array_equal(second[2], first[0])
+        assert model.cache.stats()["misses"] == 3
+
+    def test_failing_cache_falls_back_to_model(self, tmp_path):
+        model = EmbeddingModel("model-a", batching=False)
+        model.model = CountingTransformer()
+        model.attach_cache(EmbeddingCache("model-a", tmp_path / "embedding_cache.db"))
+        model.encode(["alpha"])
+
+        def locked(*args):
+            raise sqlite3.OperationalError("database is locked")
+
+        model.cache._read_disk_tier = locked
+        model.cache._write_disk_tier = locked
+        model.cache._lru.clear()
+
+        assert model.encode(["alpha", "beta"]).shape == (2, 3)
+        # Lookup failed: both texts re-encoded
+        assert model.model.seen == ["alpha", "alpha", "beta"]
+        model.cache._read_disk_tier = lambda keys: []
+        assert model.encode(["gamma"]).shape == (1, 3)
+        model.cache.close()
+
+    def test_rejects_cache_of_other_model(self):
+        model = EmbeddingModel("model-a", batching=False)
+        with pytest.raises(ValueError, match="model-b"):
+            model.attach_cache(EmbeddingCache("model-b"))
@@ -0,0 +1,156 @@
+"""
+Tests for EncodeBatcher
+=======================
+
+Validates that:
+1. Concurrent requests are merged into fewer forward passes
+2. Each caller receives exactly its own embeddings
+3. Encoding errors propagate to every caller in the batch
+4. A cancelled caller neither kills the worker nor reaches the model
+5. close() stops the worker and a later request starts a new one
+6. EmbeddingModel routes encode() through the batcher
+"""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from src.embeddings import EncodeBatcher, EmbeddingModel
+
+
+class RecordingEncoder:
+    """encode_fn that records batch sizes and returns text-derived vectors."""
+
+    def __init__(self, delay: float = 0.0):
+        self.batch_sizes = []
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self, texts):
+        with self._lock:
+            self.batch_sizes.append(len(texts))
+        if self.delay:
+            threading.Event().wait(self.delay)
+        return np.array([[float(len(t)), float(ord(t[0]))] for t in texts], dtype=np.float32)
+
+
+class TestEncodeBatcher:
+    """Tests for batching and fan-out."""
+
+    def test_concurrent_requests_share_forward_passes(self):
+        encoder = RecordingEncoder(delay=0.02)
+        batcher = EncodeBatcher(encoder, max_batch_size=64, max_latency_ms=20)
+        texts = [f"text-{i}" * (i + 1) for i in range(16)]
+        results = {}
+
+        def call(i):
+            results[i] = batcher.encode([texts[i]])
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sum(encoder.batch_sizes) == 16
+        assert len(encoder.batch_sizes) < 16
+        for i, text in enumerate(texts):
+            assert results[i].shape == (1, 2)
+            assert results[i][0][0] == len(text)
+
+    def test_batch_size_is_bounded(self):
+        encoder = RecordingEncoder()
+        batcher = EncodeBatcher(encoder, max_batch_size=4, max_latency_ms=50)
+        futures = [batcher.submit([f"t{i}"]) for i in range(10)]
+        for f in futures:
+            f.result(timeout=5)
+        assert max(encoder.batch_sizes) <= 4
+
+    def test_errors_reach_every_caller(self):
+        def failing(texts):
+            raise RuntimeError("boom")
+
+        batcher = EncodeBatcher(failing, max_latency_ms=10)
+        futures = [batcher.submit(["a"]), batcher.submit(["b"])]
+        for f in futures:
+            with pytest.raises(RuntimeError, match="boom"):
+                f.result(timeout=5)
+
+    def test_async_encode(self):
+        batcher = EncodeBatcher(RecordingEncoder(), max_latency_ms=5)
+
+        async def main():
+            return await asyncio.gather(*(batcher.encode_async([c]) for c in "abc"))
+
+        results = asyncio.run(main())
+        assert [r[0][1] for r in results] == [ord("a"), ord("b"), ord("c")]
+
+    def test_cancelled_caller_keeps_worker_alive(self):
+        started, release = threading.Event(), threading.Event()
+
+        def blocking(texts):
+            started.set()
+            release.wait(5)
+            return np.ones((len(texts), 2), dtype=np.float32)
+
+        batcher = EncodeBatcher(blocking, max_latency_ms=0)
+
+        async def main():
+            task = asyncio.ensure_future(batcher.encode_async(["a"]))
+            await asyncio.to_thread(started.wait, 5)
+            task.cancel()
+            release.set()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return await asyncio.wait_for(batcher.encode_async(["b"]), timeout=5)
+
+        assert asyncio.run(main()).shape == (1, 2)
+        assert batcher._worker.is_alive()
+
+    def test_cancelled_request_is_dropped(self):
+        encoder = RecordingEncoder()
+        release = threading.Event()
+        batcher = EncodeBatcher(lambda texts: release.wait(5) and encoder(texts), max_latency_ms=0)
+
+        first = batcher.submit(["a"])
+        cancelled = batcher.submit(["b"])
+        assert cancelled.cancel()
+        last = batcher.submit(["c"])
+        release.set()
+
+        assert first.result(timeout=5)[0][1] == ord("a")
+        assert last.result(timeout=5)[0][1] == ord("c")
+        assert sum(encoder.batch_sizes) == 2
+
+    def test_close_stops_worker(self):
+        batcher = EncodeBatcher(RecordingEncoder(), max_latency_ms=0)
+        pending = batcher.submit(["a"])
+        worker = batcher._worker
+        batcher.close(timeout=5)
+
+        assert pending.result(timeout=0)[0][1] == ord("a")
+        assert not worker.is_alive()
+        assert batcher.encode(["b"])[0][1] == ord("b")
+        batcher.close(timeout=5)
+
+
+class TestEmbeddingModelBatching:
+    """Tests for EmbeddingModel integration."""
+
+    def test_encode_goes_through_batcher(self):
+        class FakeTransformer:
+            def __init__(self):
+                self.calls = 0
+
+            def encode(self, texts, normalize_embeddings=True, convert_to_numpy=True):
+                self.calls += 1
+                return np.ones((len(texts), 3), dtype=np.float32)
+
+        model = EmbeddingModel("fake", batching=True)
+        model.model = FakeTransformer()
+
+        assert model.encode_single("hello") == [1.0, 1.0, 1.0]
+        assert model.batcher.texts == 1
+        assert model.model.calls == 1
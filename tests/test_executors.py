@@ -0,0 +1,79 @@
+"""
+Tests for ToolExecutors
+=======================
+
+Validates that:
+1. Calls run on worker threads, not on the event loop thread
+2. A saturated encode pool does not delay db calls
+3. Calls beyond max_pending are rejected and counted
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.executors import ToolExecutor, ToolExecutors
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+class TestToolExecutor:
+    """Tests for executor dispatch and metrics."""
+
+    def test_runs_off_event_loop_thread(self):
+        executor = ToolExecutor("test", max_workers=1)
+
+        async def main():
+            loop_thread = threading.get_ident()
+            worker_thread = await executor.run(threading.get_ident)
+            return loop_thread, worker_thread
+
+        loop_thread, worker_thread = _run(main())
+        executor.shutdown()
+        assert loop_thread != worker_thread
+        assert executor.metrics()["completed"] == 1
+
+    def test_slow_encode_does_not_stall_db(self):
+        executors = ToolExecutors(encode_workers=1, db_workers=1)
+        release = threading.Event()
+
+        async def main():
+            slow = asyncio.ensure_future(executors.encode.run(release.wait, 5))
+            await asyncio.sleep(0.05)
+            start = time.perf_counter()
+            await executors.db.run(lambda: None)
+            elapsed = time.perf_counter() - start
+            depth = executors.metrics()["encode"]["active"]
+            release.set()
+            await slow
+            return elapsed, depth
+
+        elapsed, depth = _run(main())
+        executors.shutdown()
+        assert depth == 1
+        assert elapsed < 1.0
+
+    def test_rejects_when_queue_full(self):
+        executor = ToolExecutor("test", max_workers=1, max_pending=1)
+        release = threading.Event()
+
+        async def main():
+            first = asyncio.ensure_future(executor.run(release.wait, 5))
+            await asyncio.sleep(0.05)  # first is running, queue empty
+            second = asyncio.ensure_future(executor.run(lambda: "queued"))
+            await asyncio.sleep(0)
+            with pytest.raises(RuntimeError, match="queue is full"):
+                await executor.run(lambda: None)
+            release.set()
+            return await first, await second
+
+        assert _run(main()) == (True, "queued")
+        executor.shutdown()
+        metrics = executor.metrics()
+        assert metrics["rejected"] == 1
+        assert metrics["max_queue_depth"] == 1
+        assert metrics["queue_depth"] == 0
@@ -0,0 +1,106 @@
+"""
+Tests for hybrid (BM25 + vector) search
+=======================================
+
+Validates that:
+1. Triggers keep memory_fts in sync; existing databases are indexed on open
+2. Hybrid mode finds exact identifiers and respects category/tag filters
+3. Free text is turned into a safe FTS5 expression
+"""
+
+import pytest
+
+from src.memory_store import VectorMemoryStore
+
+CONTENTS = [
+    ("proxy drops requests with ERR_CONN_RESET under load", "bug-fix", ["proxy"]),
+    ("python asyncio event loop blocking", "code-solution", ["python"]),
+    ("sqlite wal journal mode tuning", "performance", ["sqlite"]),
+    ("retry policy for flaky network errors", "bug-fix", ["network"]),
+]
+
+
+def _populate(store, model):
+    return [
+        store.store_memory(content, category, tags, embedding_model=model)["memory_id"]
+        for content, category, tags in CONTENTS
+    ]
+
+
+def _fts_ids(store, expression):
+    conn = store._get_connection()
+    try:
+        return sorted(row[0] for row in conn.execute(
+            "SELECT rowid FROM memory_fts WHERE memory_fts MATCH ?", (expression,)
+        ))
+    finally:
+        conn.close()
+
+
+class TestMemoryFts:
+    """Tests for the memory_fts index."""
+
+    def test_triggers_track_insert_update_delete(self, store, fake_model):
+        ids = _populate(store, fake_model)
+        assert _fts_ids(store, "asyncio") == [ids[1]]
+
+        conn = store._get_connection()
+        try:
+            conn.execute("UPDATE memory_metadata SET content = 'trio nursery' WHERE id = ?", (ids[1],))
+            conn.commit()
+        finally:
+            conn.close()
+        store.delete_memory(ids[2])
+
+        assert _fts_ids(store, "asyncio") == []
+        assert _fts_ids(store, "trio") == [ids[1]]
+        assert _fts_ids(store, "sqlite") == []
+
+    def test_builds_index_for_existing_database(self, store, fake_model):
+        ids = _populate(store, fake_model)
+        conn = store._get_connection()
+        try:
+            for trigger in ("insert", "update", "delete"):
+                conn.execute(f"DROP TRIGGER memory_fts_{trigger}")
+            conn.execute("DROP TABLE memory_fts")
+            conn.commit()
+        finally:
+            conn.close()
+
+        store._init_database()
+        assert _fts_ids(store, '"ERR_CONN_RESET"') == [ids[0]]
+
+
+class TestHybridSearch:
+    """Tests for search_memories(mode="hybrid")."""
+
+    def test_finds_identifier_missed_by_vector(self, store, fake_model):
+        ids = _populate(store, fake_model)
+
+        vector, _ = store.search_memories("err conn reset", limit=1, embedding_model=fake_model)
+        assert vector[0].memory.id != ids[0]
+
+        hybrid, total = store.search_memories(
+            "err conn reset", limit=1, embedding_model=fake_model, mode="hybrid"
+        )
+        assert hybrid[0].memory.id == ids[0]
+        assert total == 4
+
+    def test_respects_filters(self, store, fake_model):
+        ids = _populate(store, fake_model)
+
+        results, _ = store.search_memories(
+            "ERR_CONN_RESET network", category="bug-fix", tags=["network"],
+            embedding_model=fake_model, mode="hybrid"
+        )
+        assert [r.memory.id for r in results] == [ids[3]]
+
+    def test_rejects_unknown_mode(self, store, fake_model):
+        with pytest.raises(ValueError, match="mode must be one of"):
+            store.search_memories("anything", embedding_model=fake_model, mode="keyword")
+
+    def test_fts_query_quotes_terms(self):
+        assert VectorMemoryStore._fts_query('ERR_CONN_RESET say "hi" OR') == (
+            '"ERR_CONN_RESET" OR "say" OR """hi""" OR "OR"'
+        )
+        assert VectorMemoryStore._fts_query("-- ?!") is None
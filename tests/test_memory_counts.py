@@ -0,0 +1,95 @@
+"""
+Tests for maintained memory counters
+====================================
+
+Validates that:
+1. Triggers keep total and per-category counts in sync
+2. Existing databases are backfilled on first initialization
+3. search_memories only runs the exact count for tag filters on request
+"""
+
+CONTENTS = [
+    ("python asyncio event loop blocking", "code-solution", ["python"]),
+    ("sqlite vector index knn query", "performance", ["sqlite"]),
+    ("sqlite wal journal mode tuning", "performance", ["sqlite", "wal"]),
+]
+
+
+def _populate(store, model):
+    return [
+        store.store_memory(content, category, tags, embedding_model=model)["memory_id"]
+        for content, category, tags in CONTENTS
+    ]
+
+
+def _counts(store):
+    conn = store._get_connection()
+    try:
+        return {
+            (scope, key): count
+            for scope, key, count in conn.execute("SELECT scope, key, count FROM memory_counts")
+            if count
+        }
+    finally:
+        conn.close()
+
+
+class TestMemoryCounts:
+    """Tests for the memory_counts table."""
+
+    def test_triggers_track_insert_delete_update(self, store, fake_model):
+        ids = _populate(store, fake_model)
+        assert _counts(store) == {
+            ("total", ""): 3, ("category", "code-solution"): 1, ("category", "performance"): 2
+        }
+
+        store.delete_memory(ids[1])
+        conn = store._get_connection()
+        try:
+            conn.execute("UPDATE memory_metadata SET category = 'learning' WHERE id = ?", (ids[0],))
+            conn.commit()
+        finally:
+            conn.close()
+
+        assert _counts(store) == {
+            ("total", ""): 2, ("category", "learning"): 1, ("category", "performance"): 1
+        }
+
+    def test_backfills_existing_database(self, store, fake_model):
+        _populate(store, fake_model)
+        conn = store._get_connection()
+        try:
+            for trigger in ("insert", "delete", "update"):
+                conn.execute(f"DROP TRIGGER memory_counts_{trigger}")
+            conn.execute("DROP TABLE memory_counts")
+            conn.commit()
+        finally:
+            conn.close()
+
+        store._init_database()
+        assert _counts(store)[("total", "")] == 3
+        assert _counts(store)[("category", "performance")] == 2
+
+
+class TestSearchTotal:
+    """Tests for the total returned by search_memories."""
+
+    def test_total_from_counters(self, store, fake_model):
+        _populate(store, fake_model)
+
+        _, total = store.search_memories("sqlite", embedding_model=fake_model)
+        assert total == 3
+        _, total = store.search_memories("sqlite", category="performance", embedding_model=fake_model)
+        assert total == 2
+
+    def test_tag_filter_total_is_opt_in(self, store, fake_model):
+        _populate(store, fake_model)
+
+        results, total = store.search_memories("sqlite", tags=["wal"], embedding_model=fake_model)
+        assert total is None
+        assert len(results) == 1
+
+        _, total = store.search_memories(
+            "sqlite", tags=["sqlite", "python"], include_total=True, embedding_model=fake_model
+        )
+        assert total == 3
@@ -0,0 +1,113 @@
+"""
+Tests for the memory_tags join table
+====================================
+
+Validates that:
+1. Triggers mirror memory_metadata.tags on insert, update and delete
+2. Existing databases are backfilled on first initialization
+3. Tag filters, tag listing and normalization read the index
+"""
+
+import json
+
+CONTENTS = [
+    ("python asyncio event loop blocking", "code-solution", ["python", "asyncio"]),
+    ("sqlite vector index knn query", "performance", ["sqlite"]),
+    ("sqlite wal journal mode tuning", "performance", ["sqlite", "wal"]),
+]
+
+
+def _populate(store, model):
+    return [
+        store.store_memory(content, category, tags, embedding_model=model)["memory_id"]
+        for content, category, tags in CONTENTS
+    ]
+
+
+def _pairs(store):
+    conn = store._get_connection()
+    try:
+        return set(conn.execute("SELECT memory_id, tag FROM memory_tags").fetchall())
+    finally:
+        conn.close()
+
+
+class TestMemoryTagsTable:
+    """Tests for trigger maintenance and backfill."""
+
+    def test_triggers_track_insert_update_delete(self, store, fake_model):
+        ids = _populate(store, fake_model)
+        assert _pairs(store) == {
+            (ids[0], "python"), (ids[0], "asyncio"), (ids[1], "sqlite"), (ids[2], "sqlite"), (ids[2], "wal")
+        }
+
+        conn = store._get_connection()
+        try:
+            conn.execute("UPDATE memory_metadata SET tags = ? WHERE id = ?", (json.dumps(["wal"]), ids[1]))
+            conn.execute("UPDATE memory_metadata SET tags = 'not json' WHERE id = ?", (ids[0],))
+            conn.commit()
+        finally:
+            conn.close()
+        store.delete_memory(ids[2])
+
+        assert _pairs(store) == {(ids[1], "wal")}
+
+    def test_backfills_existing_database(self, store, fake_model):
+        ids = _populate(store, fake_model)
+        conn = store._get_connection()
+        try:
+            for trigger in ("insert", "update", "delete"):
+                conn.execute(f"DROP TRIGGER memory_tags_{trigger}")
+            conn.execute("DROP TABLE memory_tags")
+            conn.commit()
+        finally:
+            conn.close()
+
+        store._init_database()
+        assert (ids[2], "wal") in _pairs(store)
+        assert len(_pairs(store)) == 5
+
+
+class TestTagQueries:
+    """Tests for readers of memory_tags."""
+
+    def test_tag_filtered_search(self, store, fake_model):
+        ids = _populate(store, fake_model)
+
+        results, _ = store.search_memories("sqlite", tags=["wal", "python"], embedding_model=fake_model)
+        assert sorted(r.memory.id for r in results) == [ids[0], ids[2]]
+
+        results, total = store.search_memories(
+            "sqlite", category="performance", tags=["sqlite"], include_total=True, embedding_model=fake_model
+        )
+        assert sorted(r.memory.id for r in results) == [ids[1], ids[2]]
+        assert total == 2
+
+    def test_unique_tags(self, store, fake_model):
+        _populate(store, fake_model)
+        assert store.get_unique_tags() == ["asyncio", "python", "sqlite", "wal"]
+
+    def test_normalize_apply_updates_index(self, store, fake_model):
+        store.store_memory("tokens expire", "security", ["auth token"], embedding_model=fake_model)
+        conn = store._get_connection()
+        try:
+            conn.execute(
+                "INSERT INTO memory_metadata (content_hash, content, category, tags, created_at, updated_at) "
+                "VALUES ('raw', 'raw memory', 'other', ?, '2026-01-01', '2026-01-01')",
+                (json.dumps(["token auth", "cache layer"]),)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        preview = store.tag_normalize_preview(embedding_model=fake_model)
+        assert preview["affected_memories_count"] == 1
+        assert preview["total_memories_scanned"] == 2
+
+        snapshot = store.snapshot_create("before normalize")
+        result = store.tag_normalize_apply(
+            preview["preview_id"], snapshot["snapshot_id"], embedding_model=fake_model
+        )
+        assert result["success"] is True
+        assert result["unique_tags_after"] == 2
+        assert store.get_unique_tags() == ["auth token", "cache layer"]
@@ -0,0 +1,174 @@
+"""
+Tests for near-duplicate detection
+==================================
+
+Validates that:
+1. dedupe_threshold merges paraphrases into the nearest stored memory
+   (tags unioned, access_count bumped) or rejects them
+2. store_memories also catches near-duplicates within the batch
+3. find_duplicates clusters the store across scan tiles like a brute-force pass
+   and rejects unknown categories instead of scanning everything
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.models import Config
+from src.security import SecurityError
+
+# Same words in another order: identical bag-of-words vectors, different hash
+ORIGINAL = "tuning sqlite wal checkpoints"
+PARAPHRASE = "wal checkpoints tuning sqlite"
+
+
+def _row(store, memory_id):
+    conn = store._get_connection()
+    try:
+        tags, access_count = conn.execute(
+            "SELECT tags, access_count FROM memory_metadata WHERE id = ?", (memory_id,)
+        ).fetchone()
+        indexed = {row[0] for row in conn.execute("SELECT tag FROM memory_tags WHERE memory_id = ?", (memory_id,))}
+        count = store._count_memories(conn)
+    finally:
+        conn.close()
+    return json.loads(tags), access_count, indexed, count
+
+
+class TestDedupeOnStore:
+    """Tests for dedupe_threshold on store_memory / store_memories."""
+
+    def test_merge_unions_tags(self, store, fake_model):
+        original = store.store_memory(ORIGINAL, "performance", ["sqlite"], embedding_model=fake_model)
+
+        result = store.store_memory(
+            PARAPHRASE, "performance", ["wal"], embedding_model=fake_model, dedupe_threshold=0.9
+        )
+        assert result["success"] is False
+        assert result["action"] == "merged"
+        assert result["memory_id"] == original["memory_id"]
+        assert result["similarity"] == pytest.approx(1.0, abs=1e-4)
+        assert "dedupe" in result["timings_ms"]
+
+        tags, access_count, indexed, count = _row(store, original["memory_id"])
+        assert tags == ["sqlite", "wal"]
+        assert indexed == {"sqlite", "wal"}
+        assert access_count == 1
+        assert count == 1
+
+    def test_reject_leaves_store_unchanged(self, store, fake_model):
+        original = store.store_memory(ORIGINAL, "performance", ["sqlite"], embedding_model=fake_model)
+
+        result = store.store_memory(
+            PARAPHRASE, "performance", ["checkpointing"], embedding_model=fake_model,
+            dedupe_threshold=0.9, dedupe_action="reject"
+        )
+        assert result["action"] == "rejected"
+        assert result["memory_id"] == original["memory_id"]
+        assert _row(store, original["memory_id"]) == (["sqlite"], 0, {"sqlite"}, 1)
+        assert "checkpointing" not in store.get_canonical_tags()
+
+    def test_below_threshold_is_stored(self, store, fake_model):
+        store.store_memory(ORIGINAL, "performance", [], embedding_model=fake_model)
+        result = store.store_memory(
+            "tuning postgres autovacuum", "performance", [], embedding_model=fake_model, dedupe_threshold=0.9
+        )
+        assert result["success"] is True
+
+    def test_batch_checks_store_and_earlier_items(self, store, fake_model):
+        original = store.store_memory(ORIGINAL, "performance", ["sqlite"], embedding_model=fake_model)
+        items = [
+            {"content": PARAPHRASE, "tags": ["wal"]},
+            {"content": "asyncio event loop blocking calls", "tags": ["python"]},
+            {"content": "blocking calls asyncio event loop", "tags": ["asyncio"]},
+        ]
+        result = store.store_memories(items, embedding_model=fake_model, dedupe_threshold=0.9)
+
+        assert (result["stored"], result["skipped"], result["merged"]) == (1, 2, 2)
+        assert {"dedupe", "write"} <= set(result["timings_ms"])
+        first, second, third = result["results"]
+        assert first["memory_id"] == original["memory_id"]
+        assert second["success"] is True
+        assert third["action"] == "merged"
+        assert third["memory_id"] == second["memory_id"]
+        assert _row(store, second["memory_id"])[0] == ["python", "asyncio"]
+        assert _row(store, original["memory_id"])[0] == ["sqlite", "wal"]
+
+    def test_batch_of_near_duplicates_records_write(self, store, fake_model):
+        store.store_memory(ORIGINAL, "performance", [], embedding_model=fake_model)
+        result = store.store_memories([{"content": PARAPHRASE}], embedding_model=fake_model, dedupe_threshold=0.9)
+
+        assert (result["stored"], result["merged"]) == (0, 1)
+        assert list(result["timings_ms"]) == [
+            "validate", "hash_check", "limit_check", "category", "tags", "encode", "dedupe", "write", "total"
+        ]
+
+    @pytest.mark.parametrize("threshold, action", [(0, "merge"), (1.5, "merge"), ("high", "merge"), (0.9, "drop")])
+    def test_invalid_parameters(self, store, fake_model, threshold, action):
+        with pytest.raises(SecurityError):
+            store.store_memory(
+                ORIGINAL, "other", [], embedding_model=fake_model,
+                dedupe_threshold=threshold, dedupe_action=action
+            )
+
+
+class TestFindDuplicates:
+    """Tests for VectorMemoryStore.find_duplicates."""
+
+    def _seed(self, store, fake_model):
+        contents = [
+            ORIGINAL, PARAPHRASE, "checkpoints wal sqlite tuning",
+            "asyncio event loop blocking", "blocking asyncio event loop",
+            "react hooks dependency array", "docker build cache layers",
+        ]
+        result = store.store_memories(
+            [{"content": content, "category": "performance" if i < 3 else "other"} for i, content in enumerate(contents)],
+            embedding_model=fake_model
+        )
+        return [item["memory_id"] for item in result["results"]]
+
+    def test_clusters_match_brute_force(self, store, fake_model, monkeypatch):
+        ids = self._seed(store, fake_model)
+        # Tiles smaller than the store so pairs span tiles
+        monkeypatch.setattr(Config, "DUPLICATE_SCAN_BLOCK", 2)
+
+        result = store.find_duplicates(threshold=0.95)
+        assert result["memories_scanned"] == 7
+        assert result["clusters_found"] == 2
+        assert result["duplicate_memories"] == 5
+        assert [
+            sorted(memory["id"] for memory in cluster["memories"]) for cluster in result["clusters"]
+        ] == [ids[:3], ids[3:5]]
+
+        # Brute force: every pair above the threshold lands in one cluster
+        conn = store._get_connection()
+        rows = conn.execute("SELECT id, content FROM memory_metadata ORDER BY id").fetchall()
+        conn.close()
+        vectors = fake_model.encode([content for _, content in rows])
+        clusters = {
+            memory["id"]: index for index, cluster in enumerate(result["clusters"]) for memory in cluster["memories"]
+        }
+        for a, b in zip(*np.nonzero(np.triu(vectors @ vectors.T, k=1) >= 0.95)):
+            assert clusters[rows[a][0]] == clusters[rows[b][0]]
+
+    def test_category_filter_and_keeper_order(self, store, fake_model):
+        ids = self._seed(store, fake_model)
+        conn = store._get_connection()
+        conn.execute("UPDATE memory_metadata SET access_count = 5 WHERE id = ?", (ids[2],))
+        conn.commit()
+        conn.close()
+
+        result = store.find_duplicates(threshold=0.95, category="performance")
+        assert result["memories_scanned"] == 3
+        assert [cluster["size"] for cluster in result["clusters"]] == [3]
+        assert result["clusters"][0]["memories"][0]["id"] == ids[2]
+
+    def test_unknown_category_rejected(self, store, fake_model):
+        self._seed(store, fake_model)
+        with pytest.raises(SecurityError):
+            store.find_duplicates(category="perfromance")
+        assert store.find_duplicates(category=" Performance ")["memories_scanned"] == 3
+
+    def test_empty_store(self, store):
+        assert store.find_duplicates()["clusters"] == []
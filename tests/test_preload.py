@@ -0,0 +1,112 @@
+"""
+Tests for background warm-up (preload) and readiness
+====================================================
+
+Validates that:
+1. preload() initializes the database, loads the model and embeds the
+   canonical categories, and get_readiness() reports each step
+2. Tool calls during preload wait for it instead of initializing again
+3. A failing step is reported without blocking the others
+"""
+
+import threading
+import time
+
+import pytest
+
+import src.memory_store as memory_store_module
+from src.memory_store import VectorMemoryStore
+from src.models import Config
+from tests.conftest import FakeEmbeddingModel
+
+
+class SlowLoadingModel(FakeEmbeddingModel):
+    """Fake model whose load takes a while (like sentence-transformers)."""
+
+    def __init__(self, load_seconds=0.2, error=None):
+        super().__init__()
+        self.model = None
+        self.load_seconds = load_seconds
+        self.error = error
+        self.loads = 0
+        self._init_lock = threading.Lock()
+
+    def _initialize_model(self):
+        with self._init_lock:
+            if self.model is None:
+                self.loads += 1
+                time.sleep(self.load_seconds)
+                if self.error:
+                    raise RuntimeError(self.error)
+                self.model = object()
+
+
+@pytest.fixture
+def unopened_store(tmp_path, monkeypatch):
+    """Store whose database is not yet initialized, with a slow model."""
+    monkeypatch.setattr(Config, "EMBEDDING_CACHE_ENABLED", False)
+    model = SlowLoadingModel()
+    monkeypatch.setattr(memory_store_module, "get_embedding_model", lambda name=None: model)
+
+    db_path = tmp_path / "memory" / "vector_memory.db"
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    store = VectorMemoryStore(db_path, memory_limit=1000)
+    store.model = model
+    return store
+
+
+class TestPreload:
+    """Tests for VectorMemoryStore.preload and get_readiness."""
+
+    def test_preload_reports_each_step(self, unopened_store):
+        store = unopened_store
+        assert store.get_readiness() == {
+            "ready": False, "preload": False,
+            "database": "pending", "model": "pending", "categories": "pending",
+        }
+
+        thread = store.preload()
+        assert store.preload() is thread
+        time.sleep(0.1)
+        assert store.get_readiness()["model"] == "loading"
+
+        thread.join(5)
+        readiness = store.get_readiness()
+        assert readiness["ready"] is True
+        assert [readiness[step] for step in ("database", "model", "categories")] == ["ready"] * 3
+        assert readiness["preload_seconds"]["model"] >= 0.2
+        assert store.model.loads == 1
+        categories, matrix = store._category_embeddings[1:]
+        assert categories == list(Config.MEMORY_CATEGORIES)
+        assert matrix.shape == (len(categories), Config.EMBEDDING_DIM)
+
+    def test_calls_during_preload_share_initialization(self, unopened_store, monkeypatch):
+        store = unopened_store
+        init_calls = []
+        init_database = store._init_database
+
+        def slow_init():
+            init_calls.append(1)
+            time.sleep(0.1)
+            init_database()
+
+        monkeypatch.setattr(store, "_init_database", slow_init)
+        thread = store.preload()
+        time.sleep(0.02)
+
+        result = store.store_memory("python asyncio notes", "learning", [], embedding_model=store.embedding_model)
+        assert result["success"] is True
+        thread.join(5)
+        assert len(init_calls) == 1
+        assert store.model.loads == 1
+
+    def test_failed_step_is_reported(self, unopened_store):
+        store = unopened_store
+        store.model.error = "weights not found"
+        store.preload().join(5)
+
+        readiness = store.get_readiness()
+        assert readiness["ready"] is False
+        assert readiness["database"] == "ready"
+        assert readiness["model"] == "failed"
+        assert readiness["errors"]["model"] == "weights not found"
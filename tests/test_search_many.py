@@ -0,0 +1,89 @@
+"""
+Tests for search_many (batch search)
+====================================
+
+Validates that:
+1. Each query gets the same results as an individual search
+2. All queries are encoded in a single call
+3. Cross-query dedup fills pages with the next best matches
+4. Access counts for the batch are merged
+"""
+
+import pytest
+
+from src.security import SecurityError
+
+
+CONTENTS = [
+    ("python asyncio event loop blocking", "code-solution", ["python"]),
+    ("python asyncio task cancellation", "code-solution", ["python"]),
+    ("sqlite vector index knn query", "performance", ["sqlite"]),
+    ("sqlite wal journal mode tuning", "performance", ["sqlite"]),
+    ("fix null pointer in parser", "bug-fix", ["parser"]),
+]
+
+
+@pytest.fixture
+def populated(store, fake_model):
+    for content, category, tags in CONTENTS:
+        store.store_memory(content, category, tags, embedding_model=fake_model)
+    return store
+
+
+def _access_counts(store):
+    conn = store._get_connection()
+    try:
+        return dict(conn.execute("SELECT id, access_count FROM memory_metadata").fetchall())
+    finally:
+        conn.close()
+
+
+class TestSearchMany:
+    """Tests for VectorMemoryStore.search_many."""
+
+    def test_matches_individual_searches(self, populated, fake_model):
+        queries = ["python asyncio", "sqlite tuning"]
+        per_query, total = populated.search_many(queries, limit=3, embedding_model=fake_model)
+
+        assert total == len(CONTENTS)
+        for query, results in zip(queries, per_query):
+            single, _ = populated.search_memories(query, limit=3, embedding_model=fake_model)
+            assert [r.memory.id for r in results] == [r.memory.id for r in single]
+
+    def test_single_encode_call(self, populated, fake_model):
+        calls = fake_model.encode_calls
+        populated.search_many(["python", "sqlite", "parser"], embedding_model=fake_model)
+        assert fake_model.encode_calls == calls + 1
+
+    def test_dedupe_fills_page(self, populated, fake_model):
+        per_query, _ = populated.search_many(
+            ["python asyncio", "python asyncio"], limit=2, dedupe=True, embedding_model=fake_model
+        )
+        first = [r.memory.id for r in per_query[0]]
+        second = [r.memory.id for r in per_query[1]]
+
+        assert len(second) == 2
+        assert not set(first) & set(second)
+
+    def test_access_counts_merged(self, populated, fake_model):
+        per_query, _ = populated.search_many(
+            ["python asyncio", "python asyncio"], limit=1, embedding_model=fake_model
+        )
+        memory_id = per_query[0][0].memory.id
+
+        assert per_query[1][0].memory.id == memory_id
+        assert per_query[0][0].memory.access_count == 2
+        populated.flush_access_counts()
+        assert _access_counts(populated)[memory_id] == 2
+
+    def test_filters_apply_to_every_query(self, populated, fake_model):
+        per_query, total = populated.search_many(
+            ["python", "parser"], category="performance", embedding_model=fake_model
+        )
+        assert total == 2
+        assert all(r.memory.category == "performance" for results in per_query for r in results)
+
+    def test_rejects_too_many_queries(self, populated, fake_model, monkeypatch):
+        monkeypatch.setattr("src.models.Config.MAX_QUERIES_PER_BATCH", 2)
+        with pytest.raises(SecurityError, match="Too many queries"):
+            populated.search_many(["a", "b", "c"], embedding_model=fake_model)
@@ -0,0 +1,146 @@
+"""
+Tests for per-session concurrency limits
+========================================
+
+Validates that:
+1. A session runs at most max_concurrent calls; other sessions are not held up
+2. Sessions are forgotten once their calls finish
+3. SessionLimitedFastMCP applies the limit to tool calls, keyed per daemon connection
+4. Only shared servers cap a session; stdio runs up to the executor capacity
+"""
+
+import asyncio
+
+import pytest
+
+from src.executors import ToolExecutors
+from src.models import Config
+from src.sessions import SessionLimitedFastMCP, SessionLimiter, current_session, session_call_limit
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+class TestSessionLimiter:
+    """Tests for SessionLimiter."""
+
+    def test_limits_each_session_separately(self):
+        limiter = SessionLimiter(max_concurrent=2)
+        busy, idle = object(), object()
+        running = {"busy": 0, "peak": 0}
+
+        async def call(session, name):
+            async with limiter.slot(session):
+                if name == "busy":
+                    running["busy"] += 1
+                    running["peak"] = max(running["peak"], running["busy"])
+                await asyncio.sleep(0.05)
+                if name == "busy":
+                    running["busy"] -= 1
+
+        async def main():
+            calls = [asyncio.ensure_future(call(busy, "busy")) for _ in range(6)]
+            await asyncio.sleep(0.01)
+            stats = limiter.stats()
+            assert stats["running_calls"] == 2
+            assert stats["waiting_calls"] == 4
+
+            # Another session gets a slot right away
+            start = asyncio.get_running_loop().time()
+            await call(idle, "idle")
+            assert asyncio.get_running_loop().time() - start < 0.09
+            await asyncio.gather(*calls)
+
+        _run(main())
+        assert running["peak"] == 2
+        stats = limiter.stats()
+        assert stats["active_sessions"] == 0
+        assert stats["peak_sessions"] == 2
+        assert stats["calls_waited"] == 4
+
+    def test_cancelled_waiter_releases_session(self):
+        limiter = SessionLimiter(max_concurrent=1)
+        session = object()
+
+        async def hold(seconds):
+            async with limiter.slot(session):
+                await asyncio.sleep(seconds)
+
+        async def main():
+            holder = asyncio.ensure_future(hold(0.05))
+            await asyncio.sleep(0.01)
+            waiter = asyncio.ensure_future(hold(0))
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            await asyncio.gather(holder, waiter, return_exceptions=True)
+
+        _run(main())
+        assert limiter.stats()["active_sessions"] == 0
+
+
+class TestSessionLimitedFastMCP:
+    """Tests for tool calls through SessionLimitedFastMCP."""
+
+    def test_tool_calls_limited_per_connection(self):
+        mcp = SessionLimitedFastMCP("test", max_concurrent_calls=1)
+        seen = []
+
+        @mcp.tool()
+        async def slow() -> dict:
+            """Report the limiter state mid-call."""
+            seen.append(mcp.session_limiter.stats())
+            await asyncio.sleep(0.05)
+            return {}
+
+        async def connection(key):
+            current_session.set(key)
+            await asyncio.gather(mcp.call_tool("slow", {}), mcp.call_tool("slow", {}))
+
+        async def main():
+            start = asyncio.get_running_loop().time()
+            await asyncio.gather(
+                asyncio.create_task(connection("a")), asyncio.create_task(connection("b"))
+            )
+            return asyncio.get_running_loop().time() - start
+
+        elapsed = _run(main())
+        # Two connections in parallel, two calls each in series
+        assert 0.1 <= elapsed < 0.15
+        assert max(stats["running_calls"] for stats in seen) == 2
+        assert mcp.session_limiter.stats()["calls_waited"] == 2
+
+    @pytest.mark.parametrize("transport, daemon, shared", [
+        ("stdio", False, False), ("stdio", True, True), ("sse", False, True), ("streamable-http", False, True)
+    ])
+    def test_only_shared_servers_cap_sessions(self, transport, daemon, shared):
+        limit = session_call_limit(transport, daemon, capacity=12)
+        assert limit == (Config.SESSION_MAX_CONCURRENT_CALLS if shared else 12)
+
+    def test_stdio_session_not_capped(self):
+        executors = ToolExecutors()
+        try:
+            capacity = executors.max_workers
+            assert capacity == Config.ENCODE_WORKERS + Config.DB_WORKERS
+            mcp = SessionLimitedFastMCP("test", max_concurrent_calls=session_call_limit("stdio", False, capacity))
+        finally:
+            executors.shutdown()
+        running = {"now": 0, "peak": 0}
+
+        @mcp.tool()
+        async def slow() -> dict:
+            """Count calls running together."""
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            await asyncio.sleep(0.02)
+            running["now"] -= 1
+            return {}
+
+        async def main():
+            # stdio requests share one session
+            current_session.set("stdio")
+            await asyncio.gather(*(mcp.call_tool("slow", {}) for _ in range(capacity)))
+
+        _run(main())
+        assert running["peak"] == capacity > Config.SESSION_MAX_CONCURRENT_CALLS
+        assert mcp.session_limiter.stats()["calls_waited"] == 0
@@ -0,0 +1,114 @@
+"""
+Tests for get_stats
+===================
+
+Validates that:
+1. Totals and the category breakdown come from memory_counts and are
+   current after every store and delete
+2. Recent-week and top-accessed numbers are cached for STATS_CACHE_TTL
+   seconds; every write that changes memories drops the cache, search
+   accesses do not
+3. Deferred access counts are flushed before get_stats takes a connection
+"""
+
+import pytest
+
+import src.memory_store as memory_store_module
+from src.models import Config
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic for the stats cache."""
+    now = [1000.0]
+    monkeypatch.setattr(memory_store_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _execute(store, sql, params=()):
+    conn = store._get_connection()
+    try:
+        conn.execute(sql, params)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+class TestStats:
+    """Tests for VectorMemoryStore.get_stats."""
+
+    def test_counts_read_from_memory_counts(self, store, fake_model):
+        store.store_memory("sqlite wal tuning", "performance", [], embedding_model=fake_model)
+        second = store.store_memory("null pointer in parser", "bug-fix", [], embedding_model=fake_model)
+        store.store_memory("index the created_at column", "performance", [], embedding_model=fake_model)
+
+        stats = store.get_stats()
+        assert stats.total_memories == 3
+        assert stats.categories == {"performance": 2, "bug-fix": 1}
+
+        store.delete_memory(second["memory_id"])
+        stats = store.get_stats()
+        assert stats.total_memories == 2
+        assert stats.categories == {"performance": 2}
+
+        # Served by the counters, not a scan of memory_metadata
+        _execute(store, "UPDATE memory_counts SET count = 42 WHERE scope = 'total'")
+        assert store.get_stats().total_memories == 42
+
+    def test_activity_cached_for_ttl(self, store, fake_model, clock):
+        store.store_memory("sqlite wal tuning", "performance", [], embedding_model=fake_model)
+        store.store_memory("null pointer in parser", "bug-fix", [], embedding_model=fake_model)
+        stats = store.get_stats()
+        assert stats.recent_week_count == 2
+        assert stats.top_accessed[0]["access_count"] == 0
+
+        # Search accesses do not reset the cache
+        store.search_memories("sqlite wal tuning", limit=1, embedding_model=fake_model)
+        assert store.get_stats().top_accessed[0]["access_count"] == 0
+
+        clock[0] += Config.STATS_CACHE_TTL
+        stats = store.get_stats()
+        assert stats.top_accessed[0] == {"content_preview": "sqlite wal tuning", "access_count": 1}
+
+    @pytest.mark.parametrize("write", ["store_memory", "store_memories", "merge", "delete_memory", "snapshot_restore"])
+    def test_writes_drop_cache(self, store, fake_model, clock, write):
+        first = store.store_memory("sqlite wal tuning", "performance", ["sqlite"], embedding_model=fake_model)
+        snapshot = store.snapshot_create()
+        store.get_stats()
+        cached = store._stats_cache
+
+        if write == "store_memory":
+            store.store_memory("null pointer in parser", "bug-fix", [], embedding_model=fake_model)
+        elif write == "store_memories":
+            store.store_memories([{"content": "null pointer in parser"}], embedding_model=fake_model)
+        elif write == "merge":
+            store.store_memory(
+                "wal tuning sqlite", "performance", ["wal"], embedding_model=fake_model, dedupe_threshold=0.9
+            )
+        elif write == "delete_memory":
+            store.delete_memory(first["memory_id"])
+        else:
+            store.snapshot_restore(snapshot["snapshot_id"])
+        assert store._stats_cache is None
+
+        store.get_stats()
+        assert store._stats_cache is not cached
+
+    def test_clear_old_memories_drops_cache(self, store, fake_model, clock):
+        store.store_memories([{"content": f"note number {i}"} for i in range(105)], embedding_model=fake_model)
+        _execute(store, "UPDATE memory_metadata SET created_at = '2020-01-01T00:00:00+00:00'")
+        assert store.get_stats().recent_week_count == 0
+        cached = store._stats_cache
+
+        assert store.clear_old_memories(days_old=30, max_to_keep=100)["deleted_count"] == 5
+        assert store._stats_cache is None
+        assert store.get_stats().total_memories == 100
+        assert store._stats_cache is not cached
+
+    def test_flush_before_taking_connection(self, single_connection_store, fake_model):
+        store = single_connection_store
+        store.store_memory("sqlite wal tuning", "performance", [], embedding_model=fake_model)
+        store.search_memories("sqlite wal tuning", limit=1, embedding_model=fake_model)
+
+        stats = store.get_stats()
+        assert stats.top_accessed[0]["access_count"] == 1
@@ -0,0 +1,92 @@
+"""
+Tests for store_memories (bulk import)
+======================================
+
+Validates that:
+1. All contents are encoded in a single call and searchable afterwards
+2. Invalid items, duplicates and over-limit items get per-item results
+3. A failure rolls back the whole batch
+"""
+
+import pytest
+
+from src.security import SecurityError
+
+
+ITEMS = [
+    {"content": "python asyncio event loop blocking", "category": "code-solution", "tags": ["python"]},
+    {"content": "sqlite wal journal mode tuning", "category": "perf", "tags": ["sqlite"]},
+    {"content": "fix null pointer in parser"},
+]
+
+
+def _count(store):
+    conn = store._get_connection()
+    try:
+        return (
+            conn.execute("SELECT COUNT(*) FROM memory_metadata").fetchone()[0],
+            conn.execute("SELECT COUNT(*) FROM memory_vectors").fetchone()[0],
+        )
+    finally:
+        conn.close()
+
+
+class TestStoreMemories:
+    """Tests for VectorMemoryStore.store_memories."""
+
+    def test_stores_batch_with_one_content_encode(self, store, fake_model):
+        result = store.store_memories(ITEMS, embedding_model=fake_model)
+
+        assert result["stored"] == 3
+        assert [r["category"] for r in result["results"]] == ["code-solution", "performance", "other"]
+        assert _count(store) == (3, 3)
+
+        # One batched encode for contents plus one per new tag
+        assert fake_model.encode_calls == 1 + 2
+
+        results, _ = store.search_memories("sqlite wal", limit=1, embedding_model=fake_model)
+        assert results[0].memory.id == result["results"][1]["memory_id"]
+        assert results[0].memory.category == "performance"
+
+    def test_per_item_failures(self, store, fake_model):
+        store.store_memory(ITEMS[0]["content"], "code-solution", [], embedding_model=fake_model)
+
+        result = store.store_memories(
+            [ITEMS[0], {"content": "   "}, "not a dict", ITEMS[1], dict(ITEMS[1])],
+            embedding_model=fake_model
+        )
+        results = result["results"]
+
+        assert result["stored"] == 1
+        assert result["skipped"] == 4
+        assert results[0]["message"] == "Memory already exists"
+        assert results[0]["memory_id"] == 1
+        assert results[1]["error"] == "Security validation failed"
+        assert results[2]["error"] == "Security validation failed"
+        assert results[3]["success"] is True
+        assert results[4]["message"] == "Duplicate of item 3 in this batch"
+
+    def test_memory_limit_applies_per_item(self, store, fake_model):
+        store.memory_limit = 2
+        result = store.store_memories(ITEMS, embedding_model=fake_model)
+
+        assert [r["success"] for r in result["results"]] == [True, True, False]
+        assert "Memory limit reached" in result["results"][2]["message"]
+        assert _count(store) == (2, 2)
+
+    def test_rejects_oversized_batch(self, store, fake_model, monkeypatch):
+        monkeypatch.setattr("src.models.Config.MAX_MEMORIES_PER_BATCH", 2)
+        with pytest.raises(SecurityError, match="Too many items"):
+            store.store_memories(ITEMS, embedding_model=fake_model)
+
+    def test_failure_rolls_back_batch(self, store, fake_model, monkeypatch):
+        def broken_encode(texts, normalize=True):
+            raise RuntimeError("model crashed")
+
+        monkeypatch.setattr(fake_model, "encode", broken_encode)
+        monkeypatch.setattr(fake_model, "encode_single", lambda text, normalize=True: [1.0] + [0.0] * 383)
+
+        with pytest.raises(RuntimeError, match="model crashed"):
+            store.store_memories(ITEMS, embedding_model=fake_model)
+
+        assert _count(store) == (0, 0)
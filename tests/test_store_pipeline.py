@@ -0,0 +1,100 @@
+"""
+Tests for the store pipeline ordering
+=====================================
+
+Validates that:
+1. A duplicate is answered by the hash lookup without loading the model
+2. A full store is reported before any model inference
+3. New memories report per-stage timings_ms
+4. A batch of duplicates never loads or runs the model
+5. Every stage runs on the one connection the store holds
+"""
+
+import pytest
+
+from src.models import Config
+
+
+class UnloadableModel:
+    """Model stand-in that fails the test if it is ever used."""
+
+    model_name = "unloadable"
+
+    def __getattr__(self, name):
+        pytest.fail(f"embedding model used ({name}) on a path that needs no inference")
+
+
+@pytest.fixture
+def no_model(store, monkeypatch):
+    """Make any lazy model load fail the test."""
+    monkeypatch.setattr(store, "_get_embedding_model_sync", lambda: UnloadableModel())
+    return store
+
+
+class TestStorePipeline:
+    """Tests for store_memory / store_memories stage ordering."""
+
+    def test_new_memory_reports_stage_timings(self, store, fake_model):
+        result = store.store_memory("sqlite wal tuning notes", "performance", ["sqlite"], embedding_model=fake_model)
+
+        assert result["success"] is True
+        assert list(result["timings_ms"]) == ["hash_check", "limit_check", "category", "tags", "encode", "write", "total"]
+        assert all(ms >= 0 for ms in result["timings_ms"].values())
+
+    def test_duplicate_skips_model(self, no_model, fake_model):
+        stored = no_model.store_memory("sqlite wal tuning notes", "performance", [], embedding_model=fake_model)
+        encodes = fake_model.encode_calls
+
+        result = no_model.store_memory("sqlite wal tuning notes", "performance", [])
+        assert result["success"] is False
+        assert result["memory_id"] == stored["memory_id"]
+        assert list(result["timings_ms"]) == ["hash_check", "total"]
+        assert fake_model.encode_calls == encodes
+
+    def test_limit_checked_before_inference(self, no_model, fake_model):
+        no_model.memory_limit = 1
+        no_model.store_memory("first memory", "other", [], embedding_model=fake_model)
+
+        result = no_model.store_memory("second memory", "other", [])
+        assert result["success"] is False
+        assert "Memory limit reached" in result["message"]
+        assert list(result["timings_ms"]) == ["hash_check", "limit_check", "total"]
+
+    def test_batch_of_duplicates_skips_model(self, no_model, fake_model):
+        items = [{"content": f"note {i} about asyncio", "category": "learning"} for i in range(3)]
+        no_model.store_memories(items, embedding_model=fake_model)
+
+        result = no_model.store_memories(items + items[:1])
+        assert result["stored"] == 0
+        assert [item["success"] for item in result["results"]] == [False] * 4
+        assert "category" not in result["timings_ms"]
+        assert "encode" not in result["timings_ms"]
+
+    def test_batch_normalizes_each_category_once(self, store, fake_model, monkeypatch):
+        monkeypatch.setattr(Config, "EMBEDDING_CACHE_ENABLED", False)
+        calls = []
+        normalize = store._normalize_category_semantic
+        monkeypatch.setattr(
+            store, "_normalize_category_semantic",
+            lambda category, model, conn=None: calls.append(category) or normalize(category, model, conn)
+        )
+        items = [{"content": f"profiling run {i}", "category": "perf"} for i in range(5)]
+        result = store.store_memories(items, embedding_model=fake_model)
+
+        assert result["stored"] == 5
+        assert calls == ["perf"]
+        assert {"validate", "hash_check", "limit_check", "category", "tags", "encode", "write", "total"} <= set(result["timings_ms"])
+
+    def test_stages_share_one_connection(self, single_connection_store, fake_model):
+        store = single_connection_store
+        result = store.store_memory(
+            "notes on pool sizing", "some weird category", ["pooling", "sqlite"], embedding_model=fake_model
+        )
+        assert result["success"] is True
+
+        items = [
+            {"content": f"connection note {i}", "category": "another odd category", "tags": ["pooling", f"t{i}"]}
+            for i in range(3)
+        ]
+        result = store.store_memories(items, embedding_model=fake_model)
+        assert result["stored"] == 3
@@ -0,0 +1,186 @@
+"""
+Tests for CanonicalTagIndex
+===========================
+
+Validates that:
+1. Semantic tag normalization scores against the stored matrix
+   (no re-encoding of canonical tags, cost independent of vocabulary)
+2. Previews encode all candidate tags in a single call
+3. Tags added by this process are appended after commit without a reload;
+   uncommitted or rolled-back tags never reach the shared index
+4. External changes trigger a reload, also when they land next to our own
+"""
+
+import json
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+import sqlite_vec
+
+from src.tag_index import CanonicalTagIndex
+
+
+def _insert_canonical(conn, tag, embedding):
+    conn.execute(
+        "INSERT INTO canonical_tags (tag, embedding, frequency, created_at) VALUES (?, ?, 1, ?)",
+        (tag, sqlite_vec.serialize_float32(list(embedding)), datetime.now(timezone.utc).isoformat())
+    )
+
+
+class TestSemanticNormalization:
+    """Tests for _normalize_tags_semantic on top of the index."""
+
+    def test_merges_with_existing_canonical_tag(self, store, fake_model):
+        first = store.store_memory("tokens expire", "security", ["auth token"], embedding_model=fake_model)
+        second = store.store_memory("rotate tokens", "security", ["token auth"], embedding_model=fake_model)
+
+        assert first["tags"] == ["auth token"]
+        assert second["tags"] == ["auth token"]
+
+    def test_encode_calls_independent_of_vocabulary(self, store, fake_model):
+        store.store_memory("baseline", "other", ["alpha"], embedding_model=fake_model)
+        calls = fake_model.encode_calls
+        store.store_memory("small vocabulary", "other", ["beta", "gamma"], embedding_model=fake_model)
+        small = fake_model.encode_calls - calls
+
+        conn = store._get_connection()
+        try:
+            for i in range(500):
+                _insert_canonical(conn, f"vocab-{i}", fake_model.encode_single(f"vocab {i}"))
+            conn.commit()
+        finally:
+            conn.close()
+
+        calls = fake_model.encode_calls
+        store.store_memory("large vocabulary", "other", ["delta", "epsilon"], embedding_model=fake_model)
+        large = fake_model.encode_calls - calls
+
+        assert large == small
+        assert len(store._tag_index) == 505
+
+
+class TestNormalizationPreview:
+    """Tests for the batched _compute_tag_normalization engine."""
+
+    def test_preview_encodes_candidates_once(self, store, fake_model):
+        store.store_memory("tokens expire", "security", ["auth token"], embedding_model=fake_model)
+        conn = store._get_connection()
+        try:
+            for i, tags in enumerate((["token auth"], ["token auth", "cache layer"], ["wal mode"])):
+                conn.execute(
+                    "INSERT INTO memory_metadata (content_hash, content, category, tags, created_at, updated_at) "
+                    "VALUES (?, ?, 'other', ?, '2026-01-01', '2026-01-01')",
+                    (f"raw{i}", f"raw memory {i}", json.dumps(tags))
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+        calls = fake_model.encode_calls
+        conn = store._get_connection()
+        try:
+            result = store._compute_tag_normalization(0.9, 200, fake_model, conn)
+        finally:
+            conn.close()
+
+        assert fake_model.encode_calls == calls + 1
+        assert result["mapping"] == {"token auth": "auth token"}
+        assert result["affected_memories_count"] == 2
+
+
+class TestCanonicalTagIndex:
+    """Tests for versioning and incremental updates."""
+
+    def test_add_is_incremental(self, store):
+        conn = store._get_connection()
+        try:
+            index = CanonicalTagIndex(dim=384)
+            index.sync(conn)
+            added = []
+            for i in range(100):
+                embedding = np.zeros(384, dtype=np.float32)
+                embedding[i] = 2.0
+                _insert_canonical(conn, f"t{i}", embedding)
+                added.append((f"t{i}", embedding))
+            conn.commit()
+            index.add(added, conn)
+
+            index.sync(conn)
+            assert index.reloads == 1
+            assert len(index) == 100
+            np.testing.assert_allclose(np.linalg.norm(index.matrix, axis=1), 1.0)
+
+            query = np.zeros(384, dtype=np.float32)
+            query[7] = 0.8
+            query[3] = 0.6
+            candidates = index.candidates(query, 0.5)
+            assert [tag for tag, _ in candidates] == ["t7", "t3"]
+            assert [sim for _, sim in candidates] == pytest.approx([0.8, 0.6])
+        finally:
+            conn.close()
+
+    def test_reloads_after_external_insert(self, store):
+        conn = store._get_connection()
+        try:
+            index = CanonicalTagIndex(dim=384)
+            index.sync(conn)
+            _insert_canonical(conn, "external", np.ones(384))
+            conn.commit()
+
+            index.sync(conn)
+            assert "external" in index
+            assert index.reloads == 2
+        finally:
+            conn.close()
+
+    def test_reloads_after_external_insert_next_to_add(self, store):
+        conn = store._get_connection()
+        other = store._get_connection()
+        try:
+            index = CanonicalTagIndex(dim=384)
+            index.sync(conn)
+            _insert_canonical(other, "external", np.ones(384))
+            other.commit()
+            _insert_canonical(conn, "ours", np.full(384, 2.0))
+            conn.commit()
+            index.add([("ours", np.full(384, 2.0))], conn)
+
+            index.sync(conn)
+            assert "external" in index
+            assert index.reloads == 2
+        finally:
+            other.close()
+            conn.close()
+
+    def test_uncommitted_tags_stay_out_of_shared_index(self, store, fake_model, monkeypatch):
+        store.store_memory("tuning sqlite wal checkpoints", "performance", ["sqlite"], embedding_model=fake_model)
+        seen_mid_transaction = []
+        nearest = store._nearest_memory
+
+        def check_then_find(conn, embedding):
+            seen_mid_transaction.append("checkpointing" in store._tag_index)
+            return nearest(conn, embedding)
+
+        monkeypatch.setattr(store, "_nearest_memory", check_then_find)
+        result = store.store_memory(
+            "wal checkpoints tuning sqlite", "performance", ["checkpointing"], embedding_model=fake_model,
+            dedupe_threshold=0.9, dedupe_action="reject"
+        )
+
+        assert result["action"] == "rejected"
+        assert seen_mid_transaction == [False]
+        assert "checkpointing" not in store._tag_index
+
+        result = store.store_memory(
+            "postgres autovacuum", "performance", ["checkpointing"], embedding_model=fake_model
+        )
+        assert result["success"] is True
+        assert "checkpointing" in store._tag_index
+        reloads = store._tag_index.reloads
+        conn = store._get_connection()
+        try:
+            store._tag_index.sync(conn)
+        finally:
+            conn.close()
+        assert store._tag_index.reloads == reloads
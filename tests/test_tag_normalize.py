@@ -17,6 +17,7 @@ import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock
 
+import numpy as np
 import pytest
 
 
@@ -88,6 +89,30 @@ def memory_store(temp_db):
     return store
 
 
+def mock_model(memory_store, similarity):
+    """
+    Mock embedding model whose encode() returns vectors with the given
+    cosine similarity to the fixture's canonical tag embedding.
+    """
+    conn = memory_store._get_connection()
+    try:
+        blob = conn.execute("SELECT embedding FROM canonical_tags LIMIT 1").fetchone()[0]
+    finally:
+        conn.close()
+
+    canonical = np.frombuffer(blob, dtype=np.float32)
+    canonical = canonical / np.linalg.norm(canonical)
+    orthogonal = np.zeros_like(canonical)
+    orthogonal[np.argmin(np.abs(canonical))] = 1.0
+    orthogonal -= orthogonal.dot(canonical) * canonical
+    orthogonal /= np.linalg.norm(orthogonal)
+    vector = similarity * canonical + np.sqrt(1 - similarity ** 2) * orthogonal
+
+    model = MagicMock()
+    model.encode.side_effect = lambda texts, normalize=True: np.tile(vector, (len(texts), 1))
+    return model
+
+
 class TestSnapshotCreate:
     """Tests for snapshot_create."""
 
@@ -179,8 +204,7 @@ class TestTagNormalizePreview:
         conn.close()
 
         # Create mock model
-        model = MagicMock()
-        model.batch_similarity.return_value = [0.5, 0.5, 0.5, 0.5]
+        model = mock_model(memory_store, 0.5)
 
         memory_store.tag_normalize_preview(embedding_model=model)
 
@@ -192,8 +216,7 @@ class TestTagNormalizePreview:
         assert before == after
 
     def test_preview_id_is_deterministic(self, memory_store):
-        model = MagicMock()
-        model.batch_similarity.return_value = [0.5, 0.5, 0.5, 0.5]
+        model = mock_model(memory_store, 0.5)
 
         r1 = memory_store.tag_normalize_preview(embedding_model=model)
         r2 = memory_store.tag_normalize_preview(embedding_model=model)
@@ -201,8 +224,7 @@ class TestTagNormalizePreview:
         assert r1["preview_id"] == r2["preview_id"]
 
     def test_preview_returns_required_fields(self, memory_store):
-        model = MagicMock()
-        model.batch_similarity.return_value = [0.5, 0.5, 0.5, 0.5]
+        model = mock_model(memory_store, 0.5)
 
         result = memory_store.tag_normalize_preview(embedding_model=model)
         assert result["success"] is True
@@ -230,8 +252,7 @@ class TestTagNormalizeApply:
         # Create snapshot
         snap = memory_store.snapshot_create("test")
 
-        model = MagicMock()
-        model.batch_similarity.return_value = [0.5, 0.5, 0.5, 0.5]
+        model = mock_model(memory_store, 0.5)
 
         result = memory_store.tag_normalize_apply(
             preview_id="wrong_id",
@@ -247,9 +268,8 @@ class TestTagNormalizeApply:
     def test_apply_is_noop_when_no_changes(self, memory_store):
         snap = memory_store.snapshot_create("test")
 
-        model = MagicMock()
         # Low similarity → no merges proposed
-        model.batch_similarity.return_value = [0.1, 0.1, 0.1, 0.1]
+        model = mock_model(memory_store, 0.1)
 
         preview = memory_store.tag_normalize_preview(embedding_model=model)
         result = memory_store.tag_normalize_apply(
@@ -270,9 +290,8 @@ class TestTagNormalizeApply:
         ).fetchall())
         conn.close()
 
-        model = MagicMock()
         # High similarity for all → merges proposed
-        model.batch_similarity.return_value = [0.95, 0.95, 0.95, 0.95]
+        model = mock_model(memory_store, 0.95)
         model.encode_single.return_value = [0.0] * 384
 
         preview = memory_store.tag_normalize_preview(embedding_model=model)
@@ -302,8 +321,7 @@ class TestTagNormalizeApply:
         }
         conn.close()
 
-        model = MagicMock()
-        model.batch_similarity.return_value = [0.95, 0.95, 0.95, 0.95]
+        model = mock_model(memory_store, 0.95)
         model.encode_single.return_value = [0.0] * 384
 
         preview = memory_store.tag_normalize_preview(embedding_model=model)
@@ -0,0 +1,246 @@
+"""
+Tests for the in-process vector index
+=====================================
+
+Validates that:
+1. Engines return nearest neighbours and survive a save/load round trip;
+   an engine missing part of the interface cannot be constructed
+2. Unfiltered searches use the index; filtered searches use sqlite-vec
+3. Stores, deletes and cleanup keep the index current
+4. Changes from another connection make it stale until synced
+5. The mmap engine is shared across stores, compacts and repairs torn appends
+"""
+
+import numpy as np
+import pytest
+
+from src.memory_store import VectorMemoryStore
+from src.models import Config
+from src.vector_index import FlatVectorIndex, HnswVectorIndex, MmapVectorIndex, VectorIndex
+
+CONTENTS = [
+    ("python asyncio event loop blocking", "code-solution", ["python"]),
+    ("sqlite vector index knn query", "performance", ["sqlite"]),
+    ("sqlite wal journal mode tuning", "performance", ["sqlite", "wal"]),
+    ("token refresh race in auth middleware", "security", ["auth"]),
+]
+
+
+def _open(tmp_path, vector_index="flat"):
+    db_path = tmp_path / "memory" / "vector_memory.db"
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    store = VectorMemoryStore(db_path, memory_limit=1000, vector_index=vector_index)
+    store._ensure_db_initialized_sync()
+    return store
+
+
+def _populate(store, model):
+    return [
+        store.store_memory(content, category, tags, embedding_model=model)["memory_id"]
+        for content, category, tags in CONTENTS
+    ]
+
+
+def _unit_vectors(count, dim=384, seed=0):
+    vectors = np.random.default_rng(seed).standard_normal((count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestEngines:
+    """Tests for VectorIndex implementations."""
+
+    @pytest.mark.parametrize("engine", ["flat", "hnsw", "mmap"])
+    def test_search_remove_save_load(self, tmp_path, engine):
+        if engine == "hnsw":
+            pytest.importorskip("hnswlib")
+        cls = {"flat": FlatVectorIndex, "hnsw": HnswVectorIndex, "mmap": MmapVectorIndex}[engine]
+
+        vectors = _unit_vectors(200)
+        index = cls.create(tmp_path / "vector_index")
+        index.add(list(range(1, 201)), vectors)
+        index.remove([5, 999])
+        index.version = (200, 199)
+
+        ids, distances = index.search(vectors[9], 3)
+        assert ids[0] == 10
+        assert distances[0] == pytest.approx(0.0, abs=1e-5)
+        assert 5 not in index.search(vectors[4], 10)[0]
+
+        index.save(tmp_path / "vector_index")
+        loaded = cls.load(tmp_path / "vector_index")
+        assert loaded.version == (200, 199)
+        assert len(loaded) == 199
+        assert sorted(loaded.ids().tolist()) == [i for i in range(1, 201) if i != 5]
+        assert loaded.search(vectors[9], 1)[0] == [10]
+
+    def test_load_rejects_other_engine(self, tmp_path):
+        index = FlatVectorIndex()
+        index.add([1], _unit_vectors(1))
+        index.save(tmp_path / "vector_index")
+
+        meta = tmp_path / "vector_index.json"
+        meta.write_text(meta.read_text().replace('"flat"', '"hnsw"'))
+        assert FlatVectorIndex.load(tmp_path / "vector_index") is None
+
+    def test_incomplete_engine_fails_on_construction(self):
+        class SearchOnly(VectorIndex):
+            engine = "search-only"
+
+            def search(self, query, k):
+                return [], []
+
+        with pytest.raises(TypeError, match="abstract"):
+            SearchOnly()
+
+
+class TestStoreIntegration:
+    """Tests for VectorMemoryStore with vector_index="flat"."""
+
+    def test_unfiltered_search_uses_index(self, tmp_path, fake_model, monkeypatch):
+        store = _open(tmp_path)
+        ids = _populate(store, fake_model)
+        calls = []
+        search = store._vector_index.search
+        monkeypatch.setattr(store._vector_index, "search", lambda q, k: calls.append(k) or search(q, k))
+
+        results, _ = store.search_memories("sqlite wal journal", limit=2, offset=1, embedding_model=fake_model)
+        assert calls == [3]
+        assert len(results) == 2
+
+        results, _ = store.search_memories("sqlite wal journal", limit=1, embedding_model=fake_model)
+        assert results[0].memory.id == ids[2]
+        assert results[0].memory.tags == ["sqlite", "wal"]
+
+        store.search_memories("sqlite", category="performance", embedding_model=fake_model)
+        store.search_memories("sqlite", tags=["wal"], embedding_model=fake_model)
+        assert calls == [3, 1]
+        store.close()
+
+    def test_writes_keep_index_current(self, tmp_path, fake_model):
+        store = _open(tmp_path)
+        ids = _populate(store, fake_model)
+        store.store_memories([{"content": "bulk import memory"}], embedding_model=fake_model)
+        store.delete_memory(ids[0])
+
+        stats = store.get_stats().vector_index
+        assert stats == {"engine": "flat", "size": 4, "current": True}
+        assert ids[0] not in store._vector_index.ids()
+        store.close()
+
+    def test_sidecar_reloaded_without_rebuild(self, tmp_path, fake_model, monkeypatch):
+        store = _open(tmp_path)
+        _populate(store, fake_model)
+        store.close()
+
+        def no_rebuild(*args):
+            raise AssertionError("index rebuilt")
+
+        monkeypatch.setattr(VectorMemoryStore, "_sync_vector_index", no_rebuild)
+        store = _open(tmp_path)
+        assert len(store._vector_index) == 4
+        store.close()
+
+    def test_stale_index_falls_back_and_syncs(self, tmp_path, fake_model, monkeypatch):
+        store = _open(tmp_path)
+        ids = _populate(store, fake_model)
+        monkeypatch.setattr(store, "_schedule_vector_index_sync", lambda: None)
+
+        # Delete behind the store's back
+        conn = store._get_connection()
+        try:
+            conn.execute("DELETE FROM memory_metadata WHERE id = ?", (ids[2],))
+            conn.execute("DELETE FROM memory_vectors WHERE rowid = ?", (ids[2],))
+            conn.commit()
+        finally:
+            conn.close()
+
+        results, _ = store.search_memories("sqlite wal journal", limit=4, embedding_model=fake_model)
+        assert ids[2] not in [r.memory.id for r in results]
+        assert store.get_stats().vector_index["current"] is False
+
+        assert store.sync_vector_index() == {
+            "enabled": True, "engine": "flat", "size": 3, "added": 0, "removed": 1
+        }
+        assert store.get_stats().vector_index["current"] is True
+        store.close()
+
+    def test_rejects_unknown_engine(self, tmp_path):
+        with pytest.raises(ValueError, match="vector_index must be one of"):
+            _open(tmp_path, "ivf")
+
+
+class TestMmapIndex:
+    """Tests for the memory-mapped sidecar engine."""
+
+    def test_writes_visible_to_other_instances(self, tmp_path):
+        vectors = _unit_vectors(20)
+        writer = MmapVectorIndex.create(tmp_path / "vector_index")
+        reader = MmapVectorIndex.load(tmp_path / "vector_index")
+        assert len(reader) == 0
+
+        writer.add(list(range(1, 11)), vectors[:10])
+        writer.version = (10, 10)
+        assert reader.search(vectors[3], 1)[0] == [4]
+        assert reader.version == (10, 10)
+
+        writer.remove([4])
+        writer.add([4], vectors[15:16])  # replaced vector
+        assert reader.search(vectors[15], 1)[0] == [4]
+        assert reader.search(vectors[3], 1)[0] != [4]
+        assert len(reader) == 10
+
+    def test_compacts_dead_rows(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Config, "VECTOR_INDEX_COMPACT_RATIO", 0.25)
+        vectors = _unit_vectors(8)
+        index = MmapVectorIndex.create(tmp_path / "vector_index")
+        index.add(list(range(1, 9)), vectors)
+        index.remove([1, 2])
+        assert (tmp_path / "vector_index.0.vec").exists()
+
+        index.remove([3])
+        assert not (tmp_path / "vector_index.0.vec").exists()
+        assert (tmp_path / "vector_index.1.ids").stat().st_size == 5 * 8
+        assert sorted(index.ids().tolist()) == [4, 5, 6, 7, 8]
+        assert MmapVectorIndex.load(tmp_path / "vector_index").search(vectors[6], 1)[0] == [7]
+
+    def test_repairs_torn_append(self, tmp_path):
+        vectors = _unit_vectors(3)
+        index = MmapVectorIndex.create(tmp_path / "vector_index")
+        index.add([1], vectors[:1])
+        with open(tmp_path / "vector_index.0.vec", "ab") as f:
+            f.write(vectors[1].tobytes()[:100])  # crash mid-append
+
+        index.add([3], vectors[2:])
+        assert sorted(index.ids().tolist()) == [1, 3]
+        assert index.search(vectors[2], 1)[0] == [3]
+
+    def test_stores_share_index_without_sync(self, tmp_path, fake_model, monkeypatch):
+        first = _open(tmp_path, "mmap")
+        second = _open(tmp_path, "mmap")
+        monkeypatch.setattr(VectorMemoryStore, "_schedule_vector_index_sync", lambda self: None)
+
+        ids = _populate(first, fake_model)
+        assert second.get_stats().vector_index == {"engine": "mmap", "size": 4, "current": True}
+        results, _ = second.search_memories("sqlite wal journal", limit=1, embedding_model=fake_model)
+        assert results[0].memory.id == ids[2]
+
+        second.delete_memory(ids[2])
+        results, _ = first.search_memories("sqlite wal journal", limit=4, embedding_model=fake_model)
+        assert ids[2] not in [r.memory.id for r in results]
+        assert first.get_stats().vector_index["current"] is True
+        first.close()
+        second.close()
+
+    def test_stale_index_synced_on_open(self, tmp_path, fake_model, monkeypatch):
+        store = _open(tmp_path, "mmap")
+        _populate(store, fake_model)
+        store.close()
+
+        store = _open(tmp_path, "")
+        store.store_memory("written without the index", "other", [], embedding_model=fake_model)
+        store.close()
+
+        monkeypatch.setattr(MmapVectorIndex, "create", lambda *a: pytest.fail("index rebuilt"))
+        store = _open(tmp_path, "mmap")
+        assert store.get_stats().vector_index == {"engine": "mmap", "size": 5, "current": True}
+        store.close()
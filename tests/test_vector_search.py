@@ -0,0 +1,153 @@
+"""
+Tests for vector search paths
+=============================
+
+Validates that:
+1. KNN search (vec0 MATCH) returns the same ranking as the exact scan
+2. Category and tag filters are applied inside the KNN query
+3. Legacy vector tables (no cosine metric / no category partition key)
+   are migrated in place
+"""
+
+import sqlite3
+
+import sqlite_vec
+
+
+CONTENTS = [
+    ("python asyncio event loop blocking", "code-solution", ["python", "asyncio"]),
+    ("sqlite vector index knn query", "performance", ["sqlite"]),
+    ("fix null pointer in parser", "bug-fix", ["parser"]),
+    ("python packaging with setuptools", "tool-usage", ["python"]),
+    ("sqlite wal journal mode tuning", "performance", ["sqlite", "wal"]),
+]
+
+
+def _populate(store, model):
+    for content, category, tags in CONTENTS:
+        result = store.store_memory(content, category, tags, embedding_model=model)
+        assert result["success"] is True
+
+
+class TestKnnSearch:
+    """Tests for the vec0 KNN search path."""
+
+    def test_knn_matches_exact_scan(self, store, fake_model):
+        _populate(store, fake_model)
+        query_blob = sqlite_vec.serialize_float32(fake_model.encode_single("sqlite knn"))
+
+        conn = store._get_connection()
+        try:
+            knn = store._search_knn(conn, query_blob, 5, 0)
+            exact = store._search_exact(conn, query_blob, 5, 0)
+        finally:
+            conn.close()
+
+        # Compare (distance, id) pairs: equal distances may tie in any order
+        assert sorted((round(r[-1], 5), r[0]) for r in knn) == \
+            sorted((round(r[-1], 5), r[0]) for r in exact)
+
+    def test_search_returns_best_match_first(self, store, fake_model):
+        _populate(store, fake_model)
+        results, total = store.search_memories(
+            "sqlite vector index knn query", limit=3, embedding_model=fake_model
+        )
+        assert total == len(CONTENTS)
+        assert results[0].memory.content == "sqlite vector index knn query"
+        assert results[0].similarity > 0.99
+
+    def test_category_filter_inside_knn(self, store, fake_model):
+        _populate(store, fake_model)
+        results, total = store.search_memories(
+            "python", limit=10, category="performance", embedding_model=fake_model
+        )
+        assert total == 2
+        assert {r.memory.category for r in results} == {"performance"}
+
+    def test_tag_filter_inside_knn(self, store, fake_model):
+        _populate(store, fake_model)
+        results, _ = store.search_memories(
+            "sqlite", limit=10, tags=["python"], embedding_model=fake_model
+        )
+        assert len(results) == 2
+        assert all("python" in r.memory.tags for r in results)
+
+    def test_offset_paginates_knn_results(self, store, fake_model):
+        _populate(store, fake_model)
+        first, _ = store.search_memories("sqlite", limit=2, embedding_model=fake_model)
+        second, _ = store.search_memories("sqlite", limit=2, offset=2, embedding_model=fake_model)
+        assert not {r.memory.id for r in first} & {r.memory.id for r in second}
+
+
+class TestVectorTableMigration:
+    """Tests for rebuilding legacy memory_vectors tables."""
+
+    def test_legacy_l2_table_is_rebuilt_with_cosine(self, tmp_path, fake_model):
+        from src.memory_store import VectorMemoryStore
+
+        db_path = tmp_path / "memory" / "vector_memory.db"
+        db_path.parent.mkdir(parents=True)
+
+        # Legacy schema: vec0 table without distance_metric
+        conn = sqlite3.connect(str(db_path))
+        conn.enable_load_extension(True)
+        sqlite_vec.load(conn)
+        conn.execute("CREATE VIRTUAL TABLE memory_vectors USING vec0(embedding float[384])")
+        conn.execute(
+            "INSERT INTO memory_vectors (rowid, embedding) VALUES (7, ?)",
+            (sqlite_vec.serialize_float32(fake_model.encode_single("legacy")),)
+        )
+        conn.commit()
+        conn.close()
+
+        store = VectorMemoryStore(db_path, memory_limit=1000)
+        store._ensure_db_initialized_sync()
+
+        conn = store._get_connection()
+        try:
+            sql = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE name = 'memory_vectors'"
+            ).fetchone()[0]
+            rows = conn.execute("SELECT rowid FROM memory_vectors").fetchall()
+        finally:
+            conn.close()
+
+        assert "distance_metric=cosine" in sql
+        assert "partition key" in sql
+        assert rows == [(7,)]
+
+    def test_unpartitioned_table_gets_category_from_metadata(self, tmp_path, fake_model):
+        from src.memory_store import VectorMemoryStore
+
+        db_path = tmp_path / "memory" / "vector_memory.db"
+        db_path.parent.mkdir(parents=True)
+
+        store = VectorMemoryStore(db_path, memory_limit=1000)
+        store._ensure_db_initialized_sync()
+        store.store_memory("sqlite wal tuning", "performance", [], embedding_model=fake_model)
+
+        # Downgrade vector table to the unpartitioned cosine schema
+        conn = store._get_connection()
+        blob = conn.execute("SELECT embedding FROM memory_vectors WHERE rowid = 1").fetchone()[0]
+        conn.execute("DROP TABLE memory_vectors")
+        conn.execute(
+            "CREATE VIRTUAL TABLE memory_vectors USING vec0("
+            "embedding float[384] distance_metric=cosine)"
+        )
+        conn.execute("INSERT INTO memory_vectors (rowid, embedding) VALUES (1, ?)", (blob,))
+        conn.commit()
+        conn.close()
+
+        store._init_database()
+
+        conn = store._get_connection()
+        try:
+            rows = conn.execute("SELECT rowid, category FROM memory_vectors").fetchall()
+        finally:
+            conn.close()
+        assert rows == [(1, "performance")]
+
+        results, _ = store.search_memories(
+            "sqlite", category="performance", embedding_model=fake_model
+        )
+        assert [r.memory.id for r in results] == [1]
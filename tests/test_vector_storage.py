@@ -0,0 +1,114 @@
+"""
+Tests for quantized vector storage
+==================================
+
+Validates that:
+1. int8/bit stores search through a quantized KNN pass with float rerank
+2. The storage mode is persisted per database
+3. Existing databases migrate between modes without losing vectors
+"""
+
+import pytest
+
+from src.memory_store import VectorMemoryStore
+from src.models import Config
+
+CONTENTS = [
+    ("python asyncio event loop blocking", "code-solution", ["python"]),
+    ("sqlite vector index knn query", "performance", ["sqlite"]),
+    ("sqlite wal journal mode tuning", "performance", ["sqlite", "wal"]),
+    ("token refresh race in auth middleware", "security", ["auth"]),
+]
+
+
+def _open(tmp_path, vector_storage=None):
+    db_path = tmp_path / "memory" / "vector_memory.db"
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    store = VectorMemoryStore(db_path, memory_limit=1000, vector_storage=vector_storage)
+    store._ensure_db_initialized_sync()
+    return store
+
+
+def _populate(store, model):
+    return [
+        store.store_memory(content, category, tags, embedding_model=model)["memory_id"]
+        for content, category, tags in CONTENTS
+    ]
+
+
+def _table_counts(store):
+    conn = store._get_connection()
+    try:
+        return (
+            conn.execute("SELECT COUNT(*) FROM memory_vectors").fetchone()[0],
+            conn.execute("SELECT COUNT(*) FROM memory_vectors_float").fetchone()[0],
+        )
+    finally:
+        conn.close()
+
+
+class TestQuantizedSearch:
+    """Tests for search on int8 and bit storage."""
+
+    @pytest.mark.parametrize("storage", ["int8", "bit"])
+    def test_search_reranks_with_float_distance(self, tmp_path, fake_model, storage):
+        store = _open(tmp_path, storage)
+        ids = _populate(store, fake_model)
+        assert _table_counts(store) == (4, 4)
+
+        results, _ = store.search_memories("sqlite wal journal mode tuning", limit=2, embedding_model=fake_model)
+        assert results[0].memory.id == ids[2]
+        assert results[0].distance == pytest.approx(0.0, abs=1e-6)
+
+        results, _ = store.search_memories(
+            "sqlite", category="performance", tags=["wal"], embedding_model=fake_model, mode="hybrid"
+        )
+        assert [r.memory.id for r in results] == [ids[2]]
+
+        store.delete_memory(ids[2])
+        assert _table_counts(store) == (3, 3)
+        store.close()
+
+    def test_exact_path_reads_float_table(self, tmp_path, fake_model, monkeypatch):
+        store = _open(tmp_path, "int8")
+        ids = _populate(store, fake_model)
+        monkeypatch.setattr(Config, "KNN_MAX_K", 2)
+
+        results, _ = store.search_memories("token refresh race", limit=3, embedding_model=fake_model)
+        assert results[0].memory.id == ids[3]
+        assert len(results) == 3
+        store.close()
+
+    def test_rejects_unknown_storage(self, tmp_path):
+        with pytest.raises(ValueError, match="vector_storage must be one of"):
+            _open(tmp_path, "float16")
+
+
+class TestStorageMigration:
+    """Tests for the per-database setting and migrations."""
+
+    def test_migrates_and_keeps_stored_mode(self, tmp_path, fake_model):
+        store = _open(tmp_path)
+        ids = _populate(store, fake_model)
+        assert store.vector_storage == "float"
+        assert _table_counts(store) == (4, 0)
+        store.close()
+
+        store = _open(tmp_path, "int8")
+        assert _table_counts(store) == (4, 4)
+        store.close()
+
+        # No explicit mode: the stored one is kept
+        store = _open(tmp_path)
+        assert store.vector_storage == "int8"
+        assert store.get_stats().vector_storage == "int8"
+        results, _ = store.search_memories("python asyncio event loop", limit=1, embedding_model=fake_model)
+        assert results[0].memory.id == ids[0]
+        store.close()
+
+        store = _open(tmp_path, "float")
+        assert _table_counts(store) == (4, 0)
+        results, _ = store.search_memories("token refresh race", limit=1, embedding_model=fake_model)
+        assert results[0].memory.id == ids[3]
+        assert results[0].memory.category == "security"
+        store.close()